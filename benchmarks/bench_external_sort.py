@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+外部マージソートのベンチマーク
+
+ページ単位で取得したユーザーを並べ替えてDMブックマークのエントリを作成するまでの
+時間とピークメモリ（tracemalloc）を、全件をリストに保持してソートする従来の方法と、
+ExternalSorter（メモリ上の保持件数の上限あり）とで比較します。
+
+使い方:
+    python benchmarks/bench_external_sort.py [ユーザー数] [メモリ上の保持件数の上限]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bookmark_generator import BookmarkGenerator
+from src.external_sort import ExternalSorter, user_sort_key
+
+PAGE_SIZE = 1000
+
+
+def fetch_pages(count: int):
+    """users.list のページを模倣してユーザーを順に生成"""
+    rng = random.Random(0)
+    for start in range(0, count, PAGE_SIZE):
+        yield [
+            {
+                "id": f"U{i:09d}",
+                "name": f"user{i}",
+                "deleted": False,
+                "is_bot": False,
+                "profile": {
+                    "real_name": f"User {rng.randrange(count):09d}",
+                    "display_name": f"user{rng.randrange(count):09d}",
+                },
+            }
+            for i in range(start, min(start + PAGE_SIZE, count))
+        ]
+
+
+def in_memory(generator: BookmarkGenerator, count: int):
+    """従来の方法: 全件をリストに保持してソート"""
+    users = []
+    for page in fetch_pages(count):
+        users.extend(page)
+    users.sort(key=user_sort_key)
+    return generator.build_user_entries(users)
+
+
+def external(generator: BookmarkGenerator, count: int, budget: int):
+    """ExternalSorter: 上限を超えた分はランとして一時ファイルへ"""
+    with ExternalSorter(user_sort_key, budget) as sorter:
+        for page in fetch_pages(count):
+            sorter.add(page)
+        return generator.build_user_entries(sorter)
+
+
+def measure(func, *args):
+    """(経過秒数, ピークメモリMB, 結果) を返す"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    generator = BookmarkGenerator("benchmark", "T00000000")
+
+    baseline = measure(in_memory, generator, count)
+    sorted_ext = measure(external, generator, count, budget)
+    assert baseline[2] == sorted_ext[2]
+
+    print(f"{count}ユーザー、メモリ上の保持件数の上限 {budget}件")
+    print(f"  リスト全体をソート   {baseline[0]:6.2f}秒  ピーク {baseline[1]:7.1f}MB")
+    print(
+        f"  ExternalSorter       {sorted_ext[0]:6.2f}秒  ピーク {sorted_ext[1]:7.1f}MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
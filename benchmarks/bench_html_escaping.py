@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+HTMLエスケープのベンチマーク
+
+ユーザーDMブックマークの出力時間（エントリ作成、HTMLレンダリング、ファイル書き込み）を、
+一括エスケープありの現在の実装と、エスケープを行わない参照実装とで比較します。
+エスケープのオーバーヘッドが5%未満に収まっていることを確認するために使用します。
+レンダリング単体の時間も参考値として表示します。
+
+使い方:
+    python benchmarks/bench_html_escaping.py [エントリ数]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bookmark_generator import BookmarkGenerator
+
+
+def make_users(count: int, special_every: int = 0):
+    """ベンチマーク用のユーザー情報を作成"""
+    users = []
+    for i in range(count):
+        real_name = f"山田 太郎{i}"
+        if special_every and i % special_every == 0:
+            real_name = f"R&D <Team> {i}"
+        users.append(
+            {
+                "id": f"U{i:09d}",
+                "profile": {"real_name": real_name, "display_name": f"taro{i}"},
+            }
+        )
+    return users
+
+
+def render_unescaped(generator: BookmarkGenerator, entries) -> str:
+    """エスケープを行わない参照実装（レンダリング方法は現在の実装と同じ）"""
+    timestamp = generator.timestamp
+    parts = ["<DL><p>\n"]
+    parts.extend(
+        [
+            f'            <DT><A HREF="{url}" ADD_DATE="{timestamp}">{name}</A>\n'
+            for name, url in entries
+        ]
+    )
+    parts.append("</DL><p>\n")
+    return "".join(parts)
+
+
+def render_escaped(generator: BookmarkGenerator, entries) -> str:
+    """現在の実装（一括エスケープあり）"""
+    parts = ["<DL><p>\n"]
+    generator._render_items(entries, 8, parts)
+    parts.append("</DL><p>\n")
+    return "".join(parts)
+
+
+def bench(users, render, output_file: str, repeat: int = 25):
+    """出力全体とレンダリング単体の時間（それぞれ最小値）を計測"""
+    generator = BookmarkGenerator("bench", "T00000000")
+
+    def generate() -> None:
+        html = render(generator, generator.build_user_entries(users))
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(html)
+
+    entries = generator.build_user_entries(users)
+    total = min(timeit.repeat(generate, number=1, repeat=repeat))
+    render_only = min(
+        timeit.repeat(lambda: render(generator, entries), number=1, repeat=repeat)
+    )
+    return total, render_only
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_file = os.path.join(tmp_dir, "slack_user_dms.html")
+        for label, special_every in [("特殊文字なし", 0), ("1%に特殊文字", 100)]:
+            users = make_users(count, special_every)
+            baseline, baseline_render = bench(users, render_unescaped, output_file)
+            escaped, escaped_render = bench(users, render_escaped, output_file)
+            overhead = (escaped - baseline) / baseline * 100
+            print(
+                f"{label}: {count}件 出力全体 エスケープなし={baseline * 1000:.1f}ms "
+                f"エスケープあり={escaped * 1000:.1f}ms オーバーヘッド={overhead:+.1f}% "
+                f"(レンダリング単体: {baseline_render * 1000:.1f}ms -> "
+                f"{escaped_render * 1000:.1f}ms)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+JSONデコードのベンチマーク
+
+プロフィール全体を含む limit=1000 の users.list ページ相当のJSONについて、
+slack_sdk 標準のデコード（バイト列を文字列に変換してから json.loads）と、
+ResponseDecoder（標準ライブラリの json / orjson、射影あり）のデコード時間を
+比較します。
+
+使い方:
+    python benchmarks/bench_json_decoding.py [1ページのユーザー数]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.response_decoder import HAS_ORJSON, ResponseDecoder, loads
+
+
+def make_page(count: int) -> bytes:
+    """プロフィール全体を含むユーザー一覧ページを作成"""
+    members = []
+    for i in range(count):
+        profile = {
+            "title": "ソフトウェアエンジニア",
+            "phone": "",
+            "skype": "",
+            "real_name": f"山田 太郎{i}",
+            "real_name_normalized": f"山田 太郎{i}",
+            "display_name": f"taro{i}",
+            "display_name_normalized": f"taro{i}",
+            "fields": {"Xf01": {"value": "東京", "alt": ""}},
+            "status_text": "会議中",
+            "status_emoji": ":calendar:",
+            "status_emoji_display_info": [],
+            "status_expiration": 0,
+            "avatar_hash": f"g{i:011x}",
+            "email": f"taro{i}@example.com",
+            "first_name": "太郎",
+            "last_name": "山田",
+            "team": "T00000000",
+        }
+        for size in (24, 32, 48, 72, 192, 512, 1024):
+            profile[f"image_{size}"] = (
+                f"https://avatars.slack-edge.com/2024-01-01/{i}_{size}.png"
+            )
+        members.append(
+            {
+                "id": f"U{i:09d}",
+                "team_id": "T00000000",
+                "name": f"taro{i}",
+                "deleted": False,
+                "color": "9f69e7",
+                "real_name": f"山田 太郎{i}",
+                "tz": "Asia/Tokyo",
+                "tz_label": "Japan Standard Time",
+                "tz_offset": 32400,
+                "profile": profile,
+                "is_admin": False,
+                "is_owner": False,
+                "is_primary_owner": False,
+                "is_restricted": False,
+                "is_ultra_restricted": False,
+                "is_bot": False,
+                "is_app_user": False,
+                "updated": 1700000000 + i,
+                "is_email_confirmed": True,
+                "who_can_share_contact_card": "EVERYONE",
+            }
+        )
+    page = {
+        "ok": True,
+        "members": members,
+        "cache_ts": 1700000000,
+        "response_metadata": {"next_cursor": "dXNlcjpVMDEyMzQ1Njc4"},
+    }
+    return json.dumps(page, ensure_ascii=False).encode("utf-8")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    body = make_page(count)
+    print(f"ページサイズ: {len(body) / 1024 / 1024:.2f}MB（{count}ユーザー）")
+
+    cases = {
+        "json.loads（slack_sdk標準）": lambda: json.loads(body.decode("utf-8")),
+        "ResponseDecoder（json、射影あり）": lambda: ResponseDecoder(
+            loads_func=json.loads
+        ).decode("users.list", body),
+    }
+    if HAS_ORJSON:
+        cases["orjson.loads（射影なし）"] = lambda: loads(body)
+        cases["ResponseDecoder（orjson、射影あり）"] = lambda: ResponseDecoder().decode(
+            "users.list", body
+        )
+    else:
+        print("orjson がインストールされていないため、orjson の計測は省略します")
+
+    baseline = None
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=1, repeat=15))
+        baseline = baseline or seconds
+        print(f"{name:36s} {seconds * 1000:8.2f}ms  （{baseline / seconds:4.1f}倍）")
+
+
+if __name__ == "__main__":
+    main()
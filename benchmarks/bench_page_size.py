@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+ページサイズ自動調整のベンチマーク
+
+ローカルのモックSlackサーバーにレイテンシのプロファイルを設定し、
+全チャンネルの取得にかかる時間とスループット（件/秒）を、固定の
+ページサイズと自動調整（PageSizeController）とで比較します。
+
+プロファイル:
+    steady     リクエストごとの遅延が大きく、件数による遅延は小さい
+    slow-items 件数に比例する遅延が大きく、大きなページは目標レイテンシを超える
+    overloaded limit が300件を超えるとサーバーエラーを返す（高負荷時のタイムアウト）
+
+使い方:
+    python benchmarks/bench_page_size.py [--channels N] [--target-latency 秒]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.mock_slack_server import MockSlackServer
+from src.http_transport import PooledTransport
+from src.slack_client import SlackClient
+
+# プロファイル名: MockSlackServer に渡す設定
+PROFILES = {
+    "steady": {"request_latency": 0.05, "item_latency": 0.00002},
+    "slow-items": {"request_latency": 0.02, "item_latency": 0.0008},
+    "overloaded": {
+        "request_latency": 0.02,
+        "item_latency": 0.0001,
+        "fail_above": 300,
+        "fail_latency": 0.2,
+    },
+}
+
+# 比較するページサイズの範囲: (下限, 上限)
+STRATEGIES = {
+    "固定 1000": (1000, 1000),
+    "固定 200": (200, 200),
+    "自動調整 100-1000": (100, 1000),
+}
+
+
+def crawl(server: MockSlackServer, page_size_range, target_latency: float):
+    """全チャンネルを取得し、(経過秒数, 件数, メトリクス) を返す"""
+    client = SlackClient(
+        "xoxp-benchmark",
+        "benchmark",
+        "T00000000",
+        PooledTransport(),
+        page_size_range=page_size_range,
+        target_page_latency=target_latency,
+    )
+    client.client.base_url = server.base_url
+    start = time.perf_counter()
+    channels = client.get_all_channels()
+    return time.perf_counter() - start, len(channels), client.metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--channels", type=int, default=10000)
+    parser.add_argument("--target-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    logging.getLogger("slack_to_bookmark").setLevel(logging.CRITICAL)
+
+    for profile, settings in PROFILES.items():
+        print(f"[{profile}]")
+        with MockSlackServer(
+            users=0, channels=args.channels, page_limit=1000, **settings
+        ) as server:
+            for name, page_size_range in STRATEGIES.items():
+                elapsed, count, metrics = crawl(
+                    server, page_size_range, args.target_latency
+                )
+                summary = metrics.get("conversations.list", {})
+                limits = summary.get("limits", {})
+                print(
+                    f"  {name:18s} {elapsed:6.2f}秒  {count:6d}件  "
+                    f"{count / elapsed:8.0f}件/秒  ページ {summary.get('pages', 0):3d}  "
+                    f"エラー {summary.get('errors', 0):2d}  "
+                    f"ページサイズ {limits.get('min')}-{limits.get('max')} (最終 {limits.get('last')})"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+HTTPトランスポートのベンチマーク
+
+ローカルのモックSlackサーバーに対して、ユーザーと全チャンネルの取得にかかる
+時間を、slack_sdk 標準の urllib（リクエストごとに新しい接続）と
+PooledTransport（keep-alive 接続の再利用）とで比較します。
+モックサーバーは新しい接続ごとに --connect-latency 秒待機し、
+実際のTCP/TLSハンドシェイクのコストを模倣します。
+
+使い方:
+    python benchmarks/bench_transport.py [--users N] [--channels N] [--page-limit N]
+        [--connect-latency 秒] [--request-latency 秒]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.mock_slack_server import MockSlackServer
+from src.http_transport import PooledTransport
+from src.slack_client import SlackClient
+
+
+def crawl(server: MockSlackServer, transport=None):
+    """ユーザーと全チャンネルを取得し、(経過秒数, ページ数, 接続数) を返す"""
+    client = SlackClient("xoxp-benchmark", "benchmark", "T00000000", transport)
+    client.client.base_url = server.base_url
+    requests_before = server.requests
+    connections_before = server.connections
+
+    start = time.perf_counter()
+    client.get_all_users()
+    client.get_all_channels()
+    elapsed = time.perf_counter() - start
+
+    return (
+        elapsed,
+        server.requests - requests_before,
+        server.connections - connections_before,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--channels", type=int, default=5000)
+    parser.add_argument("--page-limit", type=int, default=50)
+    parser.add_argument("--connect-latency", type=float, default=0.02)
+    parser.add_argument("--request-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.getLogger("slack_to_bookmark").setLevel(logging.WARNING)
+
+    with MockSlackServer(
+        users=args.users,
+        channels=args.channels,
+        page_limit=args.page_limit,
+        connect_latency=args.connect_latency,
+        request_latency=args.request_latency,
+    ) as server:
+        results = {
+            "urllib (接続の再利用なし)": crawl(server),
+            "PooledTransport": crawl(server, PooledTransport(pool_size=4)),
+        }
+
+    baseline = None
+    for name, (elapsed, pages, connections) in results.items():
+        per_page = elapsed / pages * 1000
+        if baseline is None:
+            baseline = per_page
+        print(
+            f"{name:28s} {elapsed:7.3f}秒  {pages:4d}ページ  接続数 {connections:4d}  "
+            f"1ページあたり {per_page:6.2f}ms"
+        )
+    print(f"1ページあたりの削減: {baseline - per_page:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+ベンチマーク・テスト用のモックSlack APIサーバー
+
+users.list、conversations.list、users.conversations をカーソルによるページネーション付きで返す
+ローカルHTTPサーバーです。HTTP/1.1 の keep-alive と gzip 圧縮に対応し、
+新しい接続ごとの遅延（TCP/TLSハンドシェイクの代わり）、リクエストごとの
+遅延、1件あたりの遅延、および一定件数を超えるページでのサーバーエラー
+（高負荷時のタイムアウトの代わり）を設定できます。
+
+使い方:
+    with MockSlackServer(users=5000, channels=2000, page_limit=100) as server:
+        client = SlackClient("xoxp-dummy", "test", "T00000000")
+        client.client.base_url = server.base_url
+"""
+
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Any, Dict, List
+from urllib.parse import parse_qsl
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """リクエストを接続ごとのスレッドで処理するHTTPサーバー"""
+
+    daemon_threads = True
+
+
+def make_members(count: int) -> List[Dict[str, Any]]:
+    """モック用のユーザー一覧を作成"""
+    return [
+        {
+            "id": f"U{i:09d}",
+            "name": f"user{i}",
+            "deleted": i % 50 == 0,
+            "is_bot": i % 40 == 0,
+            "profile": {
+                "real_name": f"User {i}",
+                "display_name": f"user{i}",
+                "title": "Engineer",
+                "image_72": f"https://avatars.example.com/{i}.png",
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def make_channels(count: int) -> List[Dict[str, Any]]:
+    """モック用のチャンネル一覧を作成"""
+    return [
+        {
+            "id": f"C{i:09d}",
+            "name": f"proj-{i % 97}-channel-{i}",
+            "is_private": i % 3 == 0,
+            "is_archived": i % 20 == 0,
+            "is_member": i % 4 == 0,
+            "num_members": i % 200,
+            "topic": {"value": f"topic {i}"},
+            "purpose": {"value": f"purpose of channel {i}"},
+        }
+        for i in range(count)
+    ]
+
+
+class MockSlackServer:
+    """ページネーション付きのSlack APIを模倣するローカルサーバー"""
+
+    def __init__(
+        self,
+        users: int = 1000,
+        channels: int = 1000,
+        page_limit: int = 100,
+        connect_latency: float = 0.0,
+        request_latency: float = 0.0,
+        item_latency: float = 0.0,
+        fail_above: int = 0,
+        fail_latency: float = 0.0,
+    ):
+        """
+        MockSlackServerの初期化
+
+        Args:
+            users: ユーザー数
+            channels: チャンネル数
+            page_limit: 1ページの最大件数（クライアントの limit より小さい場合はこちらを使う）
+            connect_latency: 新しい接続ごとの遅延（秒）
+            request_latency: リクエストごとの遅延（秒）
+            item_latency: ページ内の1件あたりの遅延（秒）
+            fail_above: 0より大きい場合、limit がこの件数を超えるリクエストに
+                HTTP 500（internal_error）を返す
+            fail_latency: サーバーエラーを返すまでの遅延（秒）
+        """
+        self.members = make_members(users)
+        self.channels = make_channels(channels)
+        self.page_limit = page_limit
+        self.connect_latency = connect_latency
+        self.request_latency = request_latency
+        self.item_latency = item_latency
+        self.fail_above = fail_above
+        self.fail_latency = fail_latency
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """WebClient の base_url に指定するURL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def start(self) -> "MockSlackServer":
+        """サーバーをバックグラウンドスレッドで起動"""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """サーバーを停止"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockSlackServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def page(self, method: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """APIメソッドとパラメーターに対応するレスポンスを作成"""
+        if method == "users.list":
+            key, items = "members", self.members
+        elif method in ("conversations.list", "users.conversations"):
+            key = "channels"
+            types = params.get("types", "public_channel").split(",")
+            items = [
+                c
+                for c in self.channels
+                if ("private_channel" if c["is_private"] else "public_channel") in types
+            ]
+            if method == "users.conversations":
+                items = [c for c in items if c["is_member"]]
+            if params.get("exclude_archived") in ("1", "true"):
+                items = [c for c in items if not c["is_archived"]]
+        elif method == "auth.test":
+            return {"ok": True, "user": "mock", "team": "mock", "team_id": "T00000000"}
+        else:
+            return {"ok": False, "error": "unknown_method"}
+
+        start = int(params.get("cursor") or 0)
+        limit = min(int(params.get("limit") or 100), self.page_limit)
+        if self.item_latency:
+            time.sleep(self.item_latency * len(items[start : start + limit]))
+        end = start + limit
+        next_cursor = str(end) if end < len(items) else ""
+        return {
+            "ok": True,
+            key: items[start:end],
+            "response_metadata": {"next_cursor": next_cursor},
+        }
+
+    def _handler_class(self):
+        """このサーバーのデータを参照するリクエストハンドラーを作成"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # ヘッダーとボディを別々に送信するため、Nagleアルゴリズムによる遅延を避ける
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+                if server.connect_latency:
+                    time.sleep(server.connect_latency)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8")
+                params = dict(parse_qsl(body))
+                if "?" in self.path:
+                    params.update(parse_qsl(self.path.split("?", 1)[1]))
+                method = self.path.split("?", 1)[0].rsplit("/", 1)[-1]
+                with server._lock:
+                    server.requests += 1
+                if server.request_latency:
+                    time.sleep(server.request_latency)
+
+                status = 200
+                if (
+                    server.fail_above
+                    and int(params.get("limit") or 0) > server.fail_above
+                ):
+                    if server.fail_latency:
+                        time.sleep(server.fail_latency)
+                    status, page = 500, {"ok": False, "error": "internal_error"}
+                else:
+                    page = server.page(method, params)
+
+                payload = json.dumps(page).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                    payload = gzip.compress(payload, compresslevel=1)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
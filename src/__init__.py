@@ -8,4 +8,6 @@ Slack to Bookmark - SlackチャンネルとDMリンクをChromeブックマー
 from .slack_client import SlackClient
 from .bookmark_generator import BookmarkGenerator
 from .guide_generator import GuideGenerator
+from .chrome_bookmarks import ChromeBookmarkWriter
+from .bookmark_renderer import BookmarkRenderer, RenderedArtifact
 from .slack_to_bookmark import SlackToBookmark, create_parser, main, __version__
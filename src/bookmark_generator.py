@@ -8,12 +8,62 @@ Bookmark Generator Module - ブックマークファイル生成を担当する
 """
 
 import datetime
+import html
+import json
 import logging
-from typing import List, Dict, Any
+import os
+import string
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple, Optional, Set, Iterable, Sequence
+from urllib.parse import quote
+
+from .export_manifest import ExportManifest, content_digest
+from .output_writer import get_output_writer
+from .search_page import SearchIndex
+from .bookmark_sinks import sink_path, write_sinks
+from .channel_grouping import group_channels_by_prefix
+from .external_sort import channel_sort_key
 
 # ロギング設定
 logger = logging.getLogger("slack_to_bookmark")
 
+# シャード分割の方式
+SHARD_MODES = ("count", "letter")
+
+# 文字別シャードで個別のファイルにする先頭文字
+SHARD_LETTERS = string.ascii_lowercase + string.digits
+
+# HTMLのテキストとして特別な意味を持つ文字
+HTML_SPECIAL_CHARS = "&<>\"'"
+
+# 一括エスケープで文字列を連結する際の区切り文字
+BATCH_SEPARATOR = "\0"
+
+
+def escape_html_batch(values: List[str]) -> List[str]:
+    """
+    表示名などのテキストのリストをまとめてHTMLエスケープ
+
+    すべての値を1つの文字列に連結し、特殊文字ごとに1回の部分文字列検索
+    （C実装の高速な走査）で有無を判定します。特殊文字がなければ元のリストを
+    そのまま返し、あれば連結した文字列に対して1回だけ html.escape を適用して
+    から分割し直します。値ごとに html.escape を呼ぶよりも大幅に高速です。
+
+    Args:
+        values: エスケープ対象の文字列のリスト
+
+    Returns:
+        List[str]: エスケープ済みの文字列のリスト
+    """
+    joined = BATCH_SEPARATOR.join(values)
+    if not any(char in joined for char in HTML_SPECIAL_CHARS):
+        return values
+    # 値自体に区切り文字が含まれる場合は1件ずつ処理する
+    if joined.count(BATCH_SEPARATOR) != len(values) - 1:
+        return [html.escape(value) for value in values]
+    return html.escape(joined).split(BATCH_SEPARATOR)
+
 
 class BookmarkGenerator:
     """ブックマークファイル生成を担当するクラス
@@ -37,73 +87,443 @@ class BookmarkGenerator:
         self.workspace_name = workspace_name
         self.workspace_id = workspace_id
         self.timestamp = str(int(datetime.datetime.now().timestamp()))
+        self.manifest: Optional[ExportManifest] = None
+        self.skipped_files: Set[str] = set()
+        # 設定した場合、生成したエントリを検索ページ用のインデックスにも追加する
+        self.search_index: Optional[SearchIndex] = None
+        # HTML以外の形式（formats で指定）で書き出したファイル
+        self.extra_files: List[str] = []
         logger.info("BookmarkGenerator initialized")
 
-    def generate_channel_bookmarks(
-        self, channels: List[Dict[str, Any]], output_file: str
-    ) -> str:
+    @property
+    def workspace_id(self) -> str:
+        """SlackワークスペースID"""
+        return self._workspace_id
+
+    @workspace_id.setter
+    def workspace_id(self, value: str) -> None:
+        # URLの共通部分はワークスペースIDの設定時に一度だけ組み立てる
+        # （percent-encodeしておくことで、HREF属性に出力する際のエスケープを不要にする）
+        self._workspace_id = value
+        team = quote(value, safe="")
+        self.channel_url_prefix = f"slack://channel?team={team}&id="
+        self.user_url_prefix = f"slack://user?team={team}&id="
+
+    def use_manifest(self, manifest_file: str) -> ExportManifest:
         """
-        チャンネル用のHTML形式ブックマークファイルを生成
+        前回エクスポートのマニフェストを読み込み、差分出力を有効にする
+
+        マニフェストを使用すると、内容が前回から変わっていないブックマーク
+        ファイルの再書き込みを省略し、generate_delta_bookmarks で差分だけを
+        出力できるようになります。
+
+        Args:
+            manifest_file: マニフェストファイルのパス
+
+        Returns:
+            ExportManifest: 読み込んだマニフェスト
+        """
+        self.manifest = ExportManifest(manifest_file)
+        return self.manifest
+
+    def save_manifest(self) -> None:
+        """
+        マニフェストを使用している場合はファイルに保存
+        """
+        if self.manifest is not None:
+            self.manifest.save()
+
+    def _index_entries(self, kind: str, entries: List[Tuple[str, str]]) -> None:
+        """
+        検索インデックスを設定している場合はエントリを追加
+        """
+        if self.search_index is not None:
+            self.search_index.add(kind, entries)
+
+    def _channel_entry(self, channel: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        チャンネル1件分の (表示名, URL) を作成
+
+        Args:
+            channel: Slack APIから取得したチャンネル情報
+
+        Returns:
+            Tuple[str, str]: (表示名, URL)
+        """
+        channel_name = channel["name"]
+        channel_id = channel["id"]
+        is_private = channel.get("is_private", False)
+
+        # Slackアプリが直接開くURL形式
+        url = self.channel_url_prefix + channel_id
+
+        # プライベートチャンネルには 🔒 マークを付ける
+        display_name = f"🔒 #{channel_name}" if is_private else f"#{channel_name}"
+
+        return display_name, url
+
+    def _user_entry(self, user: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        ユーザー1件分の (表示名, URL) を作成
+
+        Args:
+            user: Slack APIから取得したユーザー情報
+
+        Returns:
+            Tuple[str, str]: (表示名, URL)
+        """
+        user_id = user["id"]
+        real_name = user.get("profile", {}).get("real_name", "")
+        display_name = user.get("profile", {}).get("display_name", "")
+
+        # 表示名がない場合は実名を使用
+        if not display_name:
+            display_name = real_name
+
+        # 表示形式: 実名 (@表示名)
+        bookmark_name = (
+            f"{real_name} (@{display_name})" if display_name != real_name else real_name
+        )
+
+        # Slackアプリが直接開くURL形式
+        url = self.user_url_prefix + user_id
+
+        return bookmark_name, url
+
+    def build_channel_entries(
+        self, channels: List[Dict[str, Any]]
+    ) -> List[Tuple[str, str]]:
+        """
+        チャンネル情報から (表示名, URL) のブックマークエントリを作成
 
-        チャンネル情報のリストを受け取り、Chrome/Edgeでインポート可能な
-        HTML形式のブックマークファイルを生成します。
         チャンネルはアルファベット順にソートされ、プライベートチャンネルには
-        🔒 マークが付きます。
+        🔒 マークが付きます。HTML形式以外の出力先（Chromeの Bookmarks ファイルなど）
+        でも同じ表示名とURLを使うため、エントリの組み立てはここに集約しています。
 
         Args:
             channels: Slack APIから取得したチャンネル情報のリスト
-            output_file: 出力ファイル名（例: 'slack_bookmarks.html'）
 
         Returns:
-            str: 生成されたファイルのパス、エラー時は空文字列
+            List[Tuple[str, str]]: (表示名, URL) のリスト
+        """
+        return [
+            self._channel_entry(channel) for channel in self.sort_channels(channels)
+        ]
 
-        Raises:
-            IOError: ファイル書き込みに失敗した場合
+    @staticmethod
+    def sort_channels(channels: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        チャンネルをアルファベット順に並べ替えた新しいリストを作成
+
+        呼び出し元のリストは変更しません。
+
+        Args:
+            channels: Slack APIから取得したチャンネル情報のリスト
+
+        Returns:
+            List[Dict[str, Any]]: 並べ替え済みのチャンネル情報のリスト
+        """
+        return sorted(channels, key=channel_sort_key)
+
+    def build_user_entries(
+        self, users: Iterable[Dict[str, Any]]
+    ) -> List[Tuple[str, str]]:
+        """
+        ユーザー情報から (表示名, URL) のDMブックマークエントリを作成
+
+        各ユーザーの表示形式は「実名 (@表示名)」となります。
+        表示名が実名と同じ場合は、実名のみが表示されます。
+        users には ExternalSorter などの反復可能オブジェクトも指定でき、
+        並べ替え済みのユーザーを順に読みながらエントリを作成します。
+
+        Args:
+            users: Slack APIから取得したユーザー情報のリスト（または反復可能オブジェクト）
+
+        Returns:
+            List[Tuple[str, str]]: (表示名, URL) のリスト
+        """
+        return [self._user_entry(user) for user in users]
+
+    def _render_document(self, folders: List[Tuple[str, List[Tuple[str, Any]]]]) -> str:
+        """
+        フォルダとエントリからNetscape Bookmark File Format形式のHTMLを作成
+
+        Args:
+            folders: (フォルダ名, 中身) のリスト。中身の各要素は (表示名, URL)、
+                またはサブフォルダを表す (フォルダ名, 中身) です
+
+        Returns:
+            str: ブックマークファイルのHTML
         """
         # 標準的なNetscape Bookmark File Format
-        html = f"""<!DOCTYPE NETSCAPE-Bookmark-file-1>
+        parts = ["""<!DOCTYPE NETSCAPE-Bookmark-file-1>
 <META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
 <TITLE>Bookmarks</TITLE>
 <H1>Bookmarks</H1>
 <DL><p>
-    <DT><H3 ADD_DATE="{self.timestamp}" LAST_MODIFIED="{self.timestamp}">Slack</H3>
-    <DL><p>
+"""]
+        self._render_items(folders, 0, parts)
+        parts.append("""</DL><p>
+""")
+        return "".join(parts)
+
+    def _render_items(
+        self, items: List[Tuple[str, Any]], indent: int, parts: List[str]
+    ) -> None:
+        """
+        フォルダの中身をHTML断片として parts に追加
+
+        フォルダの中身は (表示名, URL) のエントリ、サブフォルダ (フォルダ名, 中身)
+        の順に並んでいる必要があります。表示名はフォルダ単位でまとめて
+        エスケープします。URLは percent-encode 済みの共通接頭辞とSlackのID
+        （英数字のみ）から組み立てているため、エスケープは不要です。
+
+        Args:
+            items: (表示名, URL) またはサブフォルダ (フォルダ名, 中身) のリスト
+            indent: 親フォルダのインデント幅
+            parts: HTML断片の出力先
+        """
+        folder_pad = " " * (indent + 4)
+        entry_pad = " " * (indent + 12)
+        timestamp = self.timestamp
+
+        # 末尾のサブフォルダと、それより前のエントリに分ける
+        split = len(items)
+        while split and isinstance(items[split - 1][1], list):
+            split -= 1
+        entries = items[:split] if split < len(items) else items
+
+        # ブックマークエントリを追加
+        names = escape_html_batch(list(map(itemgetter(0), entries)))
+        parts.extend(
+            [
+                f'{entry_pad}<DT><A HREF="{url}" ADD_DATE="{timestamp}">{name}</A>\n'
+                for name, url in zip(names, map(itemgetter(1), entries))
+            ]
+        )
+
+        # サブフォルダを追加
+        folders = items[split:]
+        folder_names = escape_html_batch([name for name, _ in folders])
+        for name, (_, children) in zip(folder_names, folders):
+            parts.append(
+                f"""{folder_pad}<DT><H3 ADD_DATE="{timestamp}" LAST_MODIFIED="{timestamp}">{name}</H3>
+{folder_pad}<DL><p>
 """
+            )
+            self._render_items(children, indent + 4, parts)
+            parts.append(f"{folder_pad}</DL><p>\n")
+
+    def _write_bookmark_file(
+        self,
+        output_file: str,
+        folder_name: str,
+        entries: List[Tuple[str, str]],
+        layout: Optional[List[Tuple[str, Any]]] = None,
+        layout_key: str = "",
+    ) -> None:
+        """
+        ブックマークファイルを書き込む（内容が前回から変わっていなければ省略）
+
+        Args:
+            output_file: 出力ファイル名
+            folder_name: ブックマークフォルダ名
+            entries: (表示名, URL) のリスト
+            layout: フォルダの中身（省略時は entries をそのまま並べる）
+            layout_key: layout の生成条件を表す文字列（内容ハッシュに含める）
 
-        # チャンネルをアルファベット順に並べ替え
-        channels.sort(key=lambda x: x["name"].lower())
+        Raises:
+            IOError: ファイル書き込みに失敗した場合
+        """
+        digest = ""
+        if self.manifest is not None:
+            digest = content_digest([(folder_name, layout_key)] + entries)
+            if self.manifest.is_file_unchanged(output_file, digest):
+                logger.info(
+                    f"内容に変更がないため書き込みを省略しました: {output_file}"
+                )
+                self.skipped_files.add(output_file)
+                return
+
+        html = self._render_document(
+            [(folder_name, layout if layout is not None else entries)]
+        )
+        get_output_writer().write_text(output_file, html)
+
+        self.skipped_files.discard(output_file)
+        if self.manifest is not None:
+            self.manifest.record_file(output_file, digest)
+
+    def _write_extra_formats(
+        self,
+        output_file: str,
+        folder_name: str,
+        ids: List[str],
+        entries: List[Tuple[str, str]],
+        formats: Sequence[str],
+    ) -> None:
+        """
+        HTML以外の形式のファイルを、エントリを1回走査して同時に書き込む
 
-        # すべてのチャンネルを追加
-        for channel in channels:
-            channel_name = channel["name"]
-            channel_id = channel["id"]
-            is_private = channel.get("is_private", False)
+        内容が前回から変わっていない形式は書き込みを省略します。
+        書き込んだ（または省略した）ファイルは extra_files に追加されます。
 
-            # Slackアプリが直接開くURL形式
-            url = f"slack://channel?team={self.workspace_id}&id={channel_id}"
+        Args:
+            output_file: HTMLの出力ファイル名（拡張子を形式ごとに置き換える）
+            folder_name: ブックマークフォルダ名
+            ids: エントリに対応するチャンネルIDまたはユーザーID
+            entries: (表示名, URL) のリスト
+            formats: 出力形式のリスト（'html' は無視する）
+        """
+        pending = []
+        digests = {}
+        for format_name in formats:
+            if format_name == "html":
+                continue
+            path = sink_path(output_file, format_name)
+            self.extra_files.append(path)
+            if self.manifest is not None:
+                digests[path] = content_digest([(folder_name, format_name)] + entries)
+                if self.manifest.is_file_unchanged(path, digests[path]):
+                    logger.info(f"内容に変更がないため書き込みを省略しました: {path}")
+                    self.skipped_files.add(path)
+                    continue
+            pending.append(format_name)
+        if not pending:
+            return
+
+        rows = (
+            (record_id, title, url) for record_id, (title, url) in zip(ids, entries)
+        )
+        paths = write_sinks(output_file, folder_name, rows, pending, self.timestamp)
+        for path in paths.values():
+            self.skipped_files.discard(path)
+            if self.manifest is not None:
+                self.manifest.record_file(path, digests[path])
+        logger.info(
+            f"ブックマークを他の形式でも出力しました: {', '.join(paths.values())}"
+        )
 
-            # プライベートチャンネルには 🔒 マークを付ける
-            display_name = f"🔒 #{channel_name}" if is_private else f"#{channel_name}"
+    def generate_channel_bookmarks(
+        self,
+        channels: List[Dict[str, Any]],
+        output_file: str,
+        group_by_prefix: bool = False,
+        max_folder_size: int = 50,
+        max_depth: int = 3,
+        formats: Sequence[str] = ("html",),
+    ) -> str:
+        """
+        チャンネル用のHTML形式ブックマークファイルを生成
 
-            # ブックマークエントリを追加
-            html += f'            <DT><A HREF="{url}" ADD_DATE="{self.timestamp}">{display_name}</A>\n'
+        チャンネル情報のリストを受け取り、Chrome/Edgeでインポート可能な
+        HTML形式のブックマークファイルを生成します。
+        チャンネルはアルファベット順にソートされ、プライベートチャンネルには
+        🔒 マークが付きます。
+        group_by_prefix を指定すると、チャンネル名のプレフィックス
+        （"-" や "_" 区切り）ごとの階層フォルダに振り分けます。
 
-        html += """    </DL><p>
-</DL><p>
-"""
+        Args:
+            channels: Slack APIから取得したチャンネル情報のリスト
+            output_file: 出力ファイル名（例: 'slack_bookmarks.html'）
+            group_by_prefix: Trueの場合、プレフィックスごとのフォルダに分ける
+            max_folder_size: フォルダ分け時に1フォルダへ直接置くエントリ数の目安
+            max_depth: フォルダ分け時の最大の階層数
+            formats: 出力形式のリスト（'html' 以外の形式は、拡張子を置き換えた
+                ファイルにフォルダ分けせずに出力し、extra_files に追加する）
 
+        Returns:
+            str: 生成されたファイルのパス、エラー時は空文字列
+
+        Raises:
+            IOError: ファイル書き込みに失敗した場合
+        """
         # ファイルに保存
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(html)
+            channels = self.sort_channels(channels)
+            entries, layout, layout_key = self._channel_layout(
+                channels, group_by_prefix, max_folder_size, max_depth
+            )
+            self._index_entries("channel", entries)
+            self._write_bookmark_file(output_file, "Slack", entries, layout, layout_key)
+            self._write_extra_formats(
+                output_file,
+                "Slack",
+                [channel["id"] for channel in channels],
+                entries,
+                formats,
+            )
             logger.info(f"ブックマークファイルを生成しました: {output_file}")
             return output_file
         except Exception as e:
             logger.error(f"ブックマークファイル生成エラー: {e}")
             return ""
 
+    def _channel_layout(
+        self,
+        channels: List[Dict[str, Any]],
+        group_by_prefix: bool = False,
+        max_folder_size: int = 50,
+        max_depth: int = 3,
+    ) -> Tuple[List[Tuple[str, str]], Optional[List[Tuple[str, Any]]], str]:
+        """
+        並べ替え済みのチャンネルのエントリとフォルダ構成を作成
+
+        Returns:
+            Tuple: (エントリのリスト, フォルダの中身（フォルダ分けしない場合はNone）,
+            フォルダ構成の生成条件を表す文字列)
+        """
+        entries = [self._channel_entry(channel) for channel in channels]
+        if not group_by_prefix:
+            return entries, None, ""
+        layout = group_channels_by_prefix(channels, entries, max_folder_size, max_depth)
+        return entries, layout, f"prefix:{max_folder_size}:{max_depth}"
+
+    def render_channel_bookmarks(
+        self,
+        channels: List[Dict[str, Any]],
+        group_by_prefix: bool = False,
+        max_folder_size: int = 50,
+        max_depth: int = 3,
+    ) -> str:
+        """
+        チャンネル用のブックマークファイルの内容（HTML）を作成
+
+        generate_channel_bookmarks と同じ内容を、ファイルに書き込まずに返します。
+
+        Args:
+            channels: Slack APIから取得したチャンネル情報のリスト
+            group_by_prefix: Trueの場合、プレフィックスごとのフォルダに分ける
+            max_folder_size: フォルダ分け時に1フォルダへ直接置くエントリ数の目安
+            max_depth: フォルダ分け時の最大の階層数
+
+        Returns:
+            str: ブックマークファイルのHTML
+        """
+        entries, layout, _ = self._channel_layout(
+            self.sort_channels(channels), group_by_prefix, max_folder_size, max_depth
+        )
+        return self._render_document(
+            [("Slack", layout if layout is not None else entries)]
+        )
+
+    def render_user_dm_bookmarks(self, users: Iterable[Dict[str, Any]]) -> str:
+        """
+        ユーザーDM用のブックマークファイルの内容（HTML）を作成
+
+        Args:
+            users: Slack APIから取得したユーザー情報のリスト
+
+        Returns:
+            str: ブックマークファイルのHTML
+        """
+        return self._render_document([("Slack Users", self.build_user_entries(users))])
+
     def generate_user_dm_bookmarks(
-        self, users: List[Dict[str, Any]], output_file: str
+        self,
+        users: Iterable[Dict[str, Any]],
+        output_file: str,
+        formats: Sequence[str] = ("html",),
     ) -> str:
         """
         ユーザーDM用のHTML形式ブックマークファイルを生成
@@ -114,8 +534,9 @@ class BookmarkGenerator:
         表示名が実名と同じ場合は、実名のみが表示されます。
 
         Args:
-            users: Slack APIから取得したユーザー情報のリスト
+            users: Slack APIから取得したユーザー情報のリスト（ExternalSorter なども可）
             output_file: 出力ファイル名（例: 'slack_user_dms.html'）
+            formats: 出力形式のリスト（'html' 以外の形式は extra_files に追加する）
 
         Returns:
             str: 生成されたファイルのパス、エラー時は空文字列
@@ -123,51 +544,315 @@ class BookmarkGenerator:
         Raises:
             IOError: ファイル書き込みに失敗した場合
         """
-        # 標準的なNetscape Bookmark File Format
-        html = f"""<!DOCTYPE NETSCAPE-Bookmark-file-1>
-<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
-<TITLE>Bookmarks</TITLE>
-<H1>Bookmarks</H1>
-<DL><p>
-    <DT><H3 ADD_DATE="{self.timestamp}" LAST_MODIFIED="{self.timestamp}">Slack Users</H3>
-    <DL><p>
-"""
+        # ファイルに保存
+        try:
+            # ExternalSorter を何度も読まないよう、IDもエントリと同じ走査で集める
+            ids = []
+            entries = []
+            for user in users:
+                ids.append(user["id"])
+                entries.append(self._user_entry(user))
+            self._index_entries("user", entries)
+            self._write_bookmark_file(output_file, "Slack Users", entries)
+            self._write_extra_formats(output_file, "Slack Users", ids, entries, formats)
+            logger.info(
+                f"ユーザーDMのブックマークファイルを生成しました: {output_file}"
+            )
+            return output_file
+        except Exception as e:
+            logger.error(f"ユーザーDMブックマークファイル生成エラー: {e}")
+            return ""
+
+    @staticmethod
+    def _shard_letter(title: str) -> str:
+        """
+        表示名から文字別シャードのキー（先頭の英数字）を求める
 
-        # ユーザーのDMリンクを追加
-        for user in users:
-            user_id = user["id"]
-            real_name = user.get("profile", {}).get("real_name", "")
-            display_name = user.get("profile", {}).get("display_name", "")
-
-            # 表示名がない場合は実名を使用
-            if not display_name:
-                display_name = real_name
-
-            # 表示形式: 実名 (@表示名)
-            bookmark_name = (
-                f"{real_name} (@{display_name})"
-                if display_name != real_name
-                else real_name
+        Args:
+            title: ブックマークの表示名（例: '🔒 #random'）
+
+        Returns:
+            str: 先頭の英数字（小文字）、英数字以外で始まる場合は 'other'
+        """
+        name = title.replace("🔒 ", "", 1).lstrip("#")
+        first = name[:1].lower()
+        return first if first and first in SHARD_LETTERS else "other"
+
+    def _shard(
+        self,
+        pairs: List[Tuple[Dict[str, Any], Tuple[str, str]]],
+        shard_size: int,
+        shard_by: str,
+    ) -> List[Tuple[str, List[Tuple[Dict[str, Any], Tuple[str, str]]]]]:
+        """
+        (レコード, エントリ) の並びをシャードに分割
+
+        Args:
+            pairs: (レコード, (表示名, URL)) のリスト（表示順）
+            shard_size: 1シャードあたりの最大エントリ数
+            shard_by: "count"（件数で分割）または "letter"（先頭文字で分割）
+
+        Returns:
+            List[Tuple[str, List]]: (シャード名, シャードの中身) のリスト
+
+        Raises:
+            ValueError: 不正な分割方式やシャードサイズが指定された場合
+        """
+        if shard_by not in SHARD_MODES:
+            raise ValueError("shard_by は 'count' または 'letter' である必要があります")
+        if shard_size < 1:
+            raise ValueError("shard_size は1以上である必要があります")
+
+        groups: List[Tuple[str, List[Tuple[Dict[str, Any], Tuple[str, str]]]]] = []
+        if shard_by == "count":
+            groups.append(("", pairs))
+        else:
+            by_letter: Dict[str, List[Tuple[Dict[str, Any], Tuple[str, str]]]] = {}
+            for pair in pairs:
+                by_letter.setdefault(self._shard_letter(pair[1][0]), []).append(pair)
+            groups.extend(sorted(by_letter.items()))
+
+        shards = []
+        for key, group in groups:
+            chunks = [
+                group[start : start + shard_size]
+                for start in range(0, len(group), shard_size)
+            ]
+            for number, chunk in enumerate(chunks, 1):
+                if not key:
+                    name = f"{number:03d}"
+                elif len(chunks) == 1:
+                    name = key
+                else:
+                    name = f"{key}_{number:03d}"
+                shards.append((name, chunk))
+        return shards
+
+    def _generate_sharded(
+        self,
+        pairs: List[Tuple[Dict[str, Any], Tuple[str, str]]],
+        output_file: str,
+        folder_name: str,
+        shard_size: int,
+        shard_by: str,
+        group_by_prefix: bool,
+        max_folder_size: int,
+        max_depth: int,
+        max_workers: int,
+    ) -> List[str]:
+        """
+        シャードごとのブックマークファイルを並列に書き込む（シャード出力の共通処理）
+
+        Returns:
+            List[str]: 生成されたファイルのパスのリスト（シャード順）
+        """
+        base, ext = os.path.splitext(output_file)
+        shards = self._shard(pairs, shard_size, shard_by)
+
+        def write_shard(
+            shard: Tuple[str, List[Tuple[Dict[str, Any], Tuple[str, str]]]],
+        ) -> str:
+            name, chunk = shard
+            shard_file = f"{base}_{name}{ext or '.html'}"
+            entries = [entry for _, entry in chunk]
+            layout = None
+            layout_key = ""
+            if group_by_prefix:
+                layout = group_channels_by_prefix(
+                    [record for record, _ in chunk], entries, max_folder_size, max_depth
+                )
+                layout_key = f"prefix:{max_folder_size}:{max_depth}"
+            self._write_bookmark_file(
+                shard_file, f"{folder_name} ({name})", entries, layout, layout_key
             )
+            return shard_file
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            files = list(executor.map(write_shard, shards))
+
+        logger.info(f"{len(files)}個のシャードファイルを生成しました: {base}_*{ext}")
+        return files
+
+    def generate_sharded_channel_bookmarks(
+        self,
+        channels: List[Dict[str, Any]],
+        output_file: str,
+        shard_size: int,
+        shard_by: str = "count",
+        group_by_prefix: bool = False,
+        max_folder_size: int = 50,
+        max_depth: int = 3,
+        max_workers: int = 4,
+        formats: Sequence[str] = ("html",),
+    ) -> List[str]:
+        """
+        チャンネル用のブックマークを複数のファイル（シャード）に分割して生成
 
-            # Slackアプリが直接開くURL形式
-            url = f"slack://user?team={self.workspace_id}&id={user_id}"
+        大規模なワークスペースでは1ファイルのエントリ数が多すぎると
+        ブラウザのインポートが極端に遅くなるため、shard_size 件ごと、
+        または先頭文字ごとに番号付きのファイルへ分割し、並列に書き込みます。
+        出力ファイル名は 'slack_all_channels_001.html' や
+        'slack_all_channels_a.html' のようになります。
 
-            # ブックマークエントリを追加
-            html += f'            <DT><A HREF="{url}" ADD_DATE="{self.timestamp}">{bookmark_name}</A>\n'
+        Args:
+            channels: Slack APIから取得したチャンネル情報のリスト
+            output_file: 出力ファイル名の基準（例: 'slack_all_channels.html'）
+            shard_size: 1ファイルあたりの最大エントリ数
+            shard_by: "count"（件数で分割）または "letter"（先頭文字で分割）
+            group_by_prefix: Trueの場合、シャード内をプレフィックスごとのフォルダに分ける
+            max_folder_size: フォルダ分け時に1フォルダへ直接置くエントリ数の目安
+            max_depth: フォルダ分け時の最大の階層数
+            max_workers: 並列に書き込むスレッド数
+            formats: 出力形式のリスト（'html' 以外の形式は、シャードに分割せず
+                output_file の拡張子を置き換えたファイルに出力し、extra_files に追加する）
 
-        html += """    </DL><p>
-</DL><p>
-"""
+        Returns:
+            List[str]: 生成されたファイルのパスのリスト、エラー時は空リスト
+        """
+        try:
+            channels = self.sort_channels(channels)
+            entries = [self._channel_entry(channel) for channel in channels]
+            self._index_entries("channel", entries)
+            self._write_extra_formats(
+                output_file,
+                "Slack",
+                [channel["id"] for channel in channels],
+                entries,
+                formats,
+            )
+            return self._generate_sharded(
+                list(zip(channels, entries)),
+                output_file,
+                "Slack",
+                shard_size,
+                shard_by,
+                group_by_prefix,
+                max_folder_size,
+                max_depth,
+                max_workers,
+            )
+        except Exception as e:
+            logger.error(f"ブックマークファイル生成エラー: {e}")
+            return []
+
+    def generate_sharded_user_dm_bookmarks(
+        self,
+        users: Iterable[Dict[str, Any]],
+        output_file: str,
+        shard_size: int,
+        shard_by: str = "count",
+        max_workers: int = 4,
+        formats: Sequence[str] = ("html",),
+    ) -> List[str]:
+        """
+        ユーザーDM用のブックマークを複数のファイル（シャード）に分割して生成
 
-        # ファイルに保存
+        Args:
+            users: Slack APIから取得したユーザー情報のリスト
+            output_file: 出力ファイル名の基準（例: 'slack_user_dms.html'）
+            shard_size: 1ファイルあたりの最大エントリ数
+            shard_by: "count"（件数で分割）または "letter"（先頭文字で分割）
+            max_workers: 並列に書き込むスレッド数
+            formats: 出力形式のリスト（'html' 以外の形式は extra_files に追加する）
+
+        Returns:
+            List[str]: 生成されたファイルのパスのリスト、エラー時は空リスト
+        """
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(html)
+            users = list(users)
+            entries = self.build_user_entries(users)
+            self._index_entries("user", entries)
+            self._write_extra_formats(
+                output_file,
+                "Slack Users",
+                [user["id"] for user in users],
+                entries,
+                formats,
+            )
+            return self._generate_sharded(
+                list(zip(users, entries)),
+                output_file,
+                "Slack Users",
+                shard_size,
+                shard_by,
+                False,
+                0,
+                0,
+                max_workers,
+            )
+        except Exception as e:
+            logger.error(f"ユーザーDMブックマークファイル生成エラー: {e}")
+            return []
+
+    def generate_delta_bookmarks(
+        self,
+        channels: List[Dict[str, Any]],
+        users: Optional[Iterable[Dict[str, Any]]],
+        output_file: str,
+        report_file: str,
+    ) -> str:
+        """
+        前回のエクスポートからの差分ブックマークファイルと変更レポートを生成
+
+        マニフェストと比較して、追加・名前変更されたチャンネル/ユーザーだけを
+        含むブックマークファイルと、追加・名前変更・アーカイブの一覧を記載した
+        JSON形式の変更レポートを出力します。実行後、マニフェストは今回の
+        内容に更新されます（保存は save_manifest で行います）。
+
+        Args:
+            channels: Slack APIから取得したチャンネル情報のリスト
+            users: ユーザー情報のリスト（Noneの場合はユーザーの差分を検出しない）
+            output_file: 差分ブックマークの出力ファイル名（例: 'slack_delta.html'）
+            report_file: 変更レポートの出力ファイル名（例: 'slack_changes.json'）
+
+        Returns:
+            str: 生成された差分ブックマークファイルのパス、エラー時は空文字列
+        """
+        if self.manifest is None:
+            logger.error(
+                "差分出力にはマニフェストが必要です（use_manifestを先に呼び出してください）"
+            )
+            return ""
+
+        sources = [
+            ("channels", "Slack", self.sort_channels(channels), self._channel_entry)
+        ]
+        if users is not None:
+            sources.append(("users", "Slack Users", users, self._user_entry))
+
+        report: Dict[str, Any] = {"generated_at": self.timestamp}
+        folders = []
+        for kind, folder_name, records, make_entry in sources:
+            keyed = []
+            for record in records:
+                title, url = make_entry(record)
+                is_archived = record.get("is_archived", False) or record.get(
+                    "deleted", False
+                )
+                keyed.append((record["id"], title, url, is_archived))
+
+            changes = self.manifest.diff(kind, keyed)
+            report[kind] = changes
+            delta = [
+                (change["name"], change["url"])
+                for change in changes["added"] + changes["renamed"]
+            ]
+            if delta:
+                folders.append((folder_name, delta))
             logger.info(
-                f"ユーザーDMのブックマークファイルを生成しました: {output_file}"
+                f"{kind}の変更: 追加={len(changes['added'])}, "
+                f"名前変更={len(changes['renamed'])}, アーカイブ={len(changes['archived'])}"
+            )
+
+        try:
+            writer = get_output_writer()
+            writer.write_text(output_file, self._render_document(folders))
+            writer.write_text(
+                report_file, json.dumps(report, ensure_ascii=False, indent=2)
             )
+            logger.info(f"差分ブックマークファイルを生成しました: {output_file}")
+            logger.info(f"変更レポートを生成しました: {report_file}")
             return output_file
         except Exception as e:
-            logger.error(f"ユーザーDMブックマークファイル生成エラー: {e}")
+            logger.error(f"差分ブックマークファイル生成エラー: {e}")
             return ""
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Bookmark Renderer Module - ブックマーク一式をメモリ上で作成するライブラリAPIを担当するモジュール
+
+SlackToBookmark.run は、Slack APIからの取得、決まった名前のファイルへの書き込み、
+ブラウザでのガイドページの表示までを1つの処理として行います。
+このモジュールは、呼び出し元が持っているチャンネル・ユーザーの情報から、
+ブックマークファイル・他の形式のファイル・ガイドページ・検索ページを
+ファイルに書き込まずにバイト列（memoryview）として返します。
+Webサービスなどに組み込む場合は、リクエストごとにディスクを読み書きせずに
+結果をそのままレスポンスやストリームに書き込めます::
+
+    renderer = BookmarkRenderer("my-workspace", "T12345678")
+    artifacts = renderer.render(channels, users, formats=("html", "json"))
+    artifacts["slack_all_channels.html"].write_to(response_stream)
+
+ファイルへの保存（save_artifacts）とブラウザでの表示（open_in_browser）は、
+この結果の上に重ねる任意の処理として提供します。
+"""
+
+import io
+import logging
+import os
+import webbrowser
+from typing import Any, BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from .bookmark_generator import BookmarkGenerator
+from .bookmark_sinks import SINK_TYPES, BookmarkSink, fill_sinks, sink_path
+from .external_sort import user_sort_key
+from .guide_generator import GuideGenerator
+from .output_writer import get_output_writer
+from .search_page import SearchIndex, SearchPageGenerator
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# HTMLのメディアタイプ
+HTML_CONTENT_TYPE = "text/html; charset=utf-8"
+
+
+class RenderedArtifact(NamedTuple):
+    """メモリ上で作成した出力ファイル1つ分の内容"""
+
+    # 出力ファイル名（SlackToBookmark.run が書き込むファイル名と同じ）
+    name: str
+    # メディアタイプ
+    content_type: str
+    # UTF-8でエンコードされた内容（コピーせずに参照できる memoryview）
+    data: memoryview
+
+    def write_to(self, stream: BinaryIO) -> int:
+        """
+        内容をバイナリストリームに書き込む
+
+        Args:
+            stream: 書き込み先（ファイル、ソケット、HTTPレスポンスなど）
+
+        Returns:
+            int: 書き込んだバイト数
+        """
+        stream.write(self.data)
+        return self.data.nbytes
+
+
+class BookmarkRenderer:
+    """チャンネル・ユーザーの情報からブックマーク一式をメモリ上で作成するクラス
+
+    1回の render で、SlackToBookmark.run（シャード分割なし）が出力するのと
+    同じ内容を作成します。Slack APIへのアクセスやファイルの読み書きは行いません。
+    """
+
+    def __init__(self, workspace_name: str, workspace_id: str):
+        """
+        BookmarkRendererの初期化
+
+        Args:
+            workspace_name: Slackワークスペース名
+            workspace_id: SlackワークスペースID（T12345678 の形式）
+        """
+        self.workspace_name = workspace_name
+        self.bookmark_generator = BookmarkGenerator(workspace_name, workspace_id)
+        self.guide_generator = GuideGenerator()
+        self.search_page_generator = SearchPageGenerator()
+
+    def render(
+        self,
+        channels: List[Dict[str, Any]],
+        users: Optional[Iterable[Dict[str, Any]]] = None,
+        public_only: bool = False,
+        formats: Sequence[str] = ("html",),
+        guides: bool = True,
+        search_page: bool = True,
+        group_by_prefix: bool = False,
+        max_folder_size: int = 50,
+        max_folder_depth: int = 3,
+    ) -> Dict[str, RenderedArtifact]:
+        """
+        ブックマーク一式を作成
+
+        Args:
+            channels: チャンネル情報のリスト（Slack APIの conversations.list と同じ形式）
+            users: ユーザー情報の並び（users.list と同じ形式。Noneの場合はDMを作成しない。
+                ボットと削除済みのユーザーは除外し、表示名順に並べ替える）
+            public_only: Trueの場合、プライベートチャンネルを除外する
+            formats: 出力形式のリスト（'html' 以外は同じ走査で作成する）
+            guides: Trueの場合、インポート手順のガイドページも作成する
+            search_page: Trueの場合、検索ページも作成する
+            group_by_prefix: Trueの場合、チャンネルを名前のプレフィックスごとのフォルダに分ける
+            max_folder_size: フォルダ分け時に1フォルダへ直接置くチャンネル数の目安
+            max_folder_depth: フォルダ分け時の最大の階層数
+
+        Returns:
+            Dict[str, RenderedArtifact]: 出力ファイル名と内容（作成した順）
+
+        Raises:
+            KeyError: 未登録の出力形式が指定された場合
+        """
+        generator = self.bookmark_generator
+        artifacts: Dict[str, RenderedArtifact] = {}
+        index = SearchIndex() if search_page else None
+
+        if public_only:
+            channels = [c for c in channels if not c.get("is_private", False)]
+            channel_file = "slack_public_channels.html"
+            channel_guide = "public_channel_guide.html"
+        else:
+            channel_file = "slack_all_channels.html"
+            channel_guide = "all_channel_guide.html"
+
+        if channels:
+            channels = generator.sort_channels(channels)
+            entries, layout, _ = generator._channel_layout(
+                channels, group_by_prefix, max_folder_size, max_folder_depth
+            )
+            self._add_html(
+                artifacts,
+                channel_file,
+                generator._render_document(
+                    [("Slack", layout if layout is not None else entries)]
+                ),
+            )
+            self._add_formats(
+                artifacts,
+                channel_file,
+                "Slack",
+                [channel["id"] for channel in channels],
+                entries,
+                formats,
+            )
+            if guides:
+                self._add_html(
+                    artifacts,
+                    channel_guide,
+                    self.guide_generator.render_guide(
+                        channel_file, is_public_only=public_only
+                    ),
+                )
+            if index is not None:
+                index.add("channel", entries)
+
+        if users is not None:
+            users = sorted(
+                (
+                    user
+                    for user in users
+                    if not user.get("is_bot", False) and not user.get("deleted", False)
+                ),
+                key=user_sort_key,
+            )
+            if users:
+                user_file = "slack_user_dms.html"
+                entries = generator.build_user_entries(users)
+                self._add_html(
+                    artifacts,
+                    user_file,
+                    generator._render_document([("Slack Users", entries)]),
+                )
+                self._add_formats(
+                    artifacts,
+                    user_file,
+                    "Slack Users",
+                    [user["id"] for user in users],
+                    entries,
+                    formats,
+                )
+                if guides:
+                    self._add_html(
+                        artifacts,
+                        "user_dm_guide.html",
+                        self.guide_generator.render_guide(user_file, is_user_dm=True),
+                    )
+                if index is not None:
+                    index.add("user", entries)
+
+        if index:
+            self._add_html(
+                artifacts,
+                "slack_search.html",
+                self.search_page_generator.render(index, self.workspace_name),
+            )
+        return artifacts
+
+    @staticmethod
+    def _add_html(artifacts: Dict[str, RenderedArtifact], name: str, html: str) -> None:
+        """
+        HTMLの出力ファイルを追加
+        """
+        artifacts[name] = RenderedArtifact(
+            name, HTML_CONTENT_TYPE, memoryview(html.encode("utf-8"))
+        )
+
+    def _add_formats(
+        self,
+        artifacts: Dict[str, RenderedArtifact],
+        html_file: str,
+        folder_name: str,
+        ids: List[str],
+        entries: List[Any],
+        formats: Sequence[str],
+    ) -> None:
+        """
+        HTML以外の形式の出力ファイルを、エントリを1回走査して同時に作成
+        """
+        buffers = []
+        sinks: List[BookmarkSink] = []
+        for format_name in formats:
+            if format_name == "html":
+                continue
+            buffer = io.BytesIO()
+            stream = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+            path = sink_path(html_file, format_name)
+            buffers.append((buffer, stream))
+            sinks.append(
+                SINK_TYPES[format_name](
+                    stream, path, folder_name, self.bookmark_generator.timestamp
+                )
+            )
+        if not sinks:
+            return
+
+        fill_sinks(
+            sinks,
+            ((record_id, title, url) for record_id, (title, url) in zip(ids, entries)),
+        )
+        for sink, (buffer, stream) in zip(sinks, buffers):
+            stream.flush()
+            stream.detach()
+            artifacts[sink.path] = RenderedArtifact(
+                sink.path, sink.content_type, buffer.getbuffer()
+            )
+
+
+def save_artifacts(artifacts: Iterable[RenderedArtifact]) -> List[str]:
+    """
+    作成した出力ファイルを共有の出力レイヤー（OutputWriter）で保存
+
+    Args:
+        artifacts: 保存する出力ファイル（BookmarkRenderer.render の戻り値の values()）
+
+    Returns:
+        List[str]: 保存したファイルの実際のパス
+
+    Raises:
+        IOError: ファイル書き込みに失敗した場合
+    """
+    writer = get_output_writer()
+    paths = [writer.write_bytes(a.name, a.data) for a in artifacts]
+    writer.sync()
+    return paths
+
+
+def open_in_browser(path: str) -> bool:
+    """
+    ファイルを既定のブラウザで開く
+
+    Args:
+        path: 開くファイルのパス
+
+    Returns:
+        bool: 開けた場合はTrue
+    """
+    try:
+        webbrowser.open(f"file://{os.path.abspath(path)}")
+        return True
+    except Exception as e:
+        logger.error(f"ブラウザでファイルを開く際にエラーが発生しました: {e}")
+        return False
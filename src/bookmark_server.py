@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Bookmark Server Module - ブックマークファイルをHTTPで配信するローカルサーバーを担当するモジュール
+
+生成したHTMLファイルを手渡しする代わりに、ブラウザやスクリプトから
+最新のブックマークファイルを取得できるようにします。
+チャンネルとユーザーの一覧（ディレクトリ）はメモリ上に保持し、
+ブックマークファイルは BookmarkGenerator で (ワークスペース, フィルター, 形式)
+ごとに一度だけ作成してキャッシュします。キャッシュしたレスポンスには
+内容のハッシュによる強いETagを付け、If-None-Match による 304 応答と
+gzip 圧縮に対応します。同時に多数のクライアントからリクエストがあっても、
+キャッシュ済みの内容を返すだけで、再作成やSlack APIの呼び出しは行いません。
+
+エンドポイント:
+    /channels.html, /channels.json  チャンネルのブックマーク（?filter=proj-*,re:^team- で絞り込み）
+    /dms.html, /dms.json            ユーザーDMのブックマーク
+    /guide/channels.html            チャンネルブックマークのインポート手順
+    /guide/dms.html                 ユーザーDMブックマークのインポート手順
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .bookmark_generator import BookmarkGenerator
+from .channel_filter import ChannelFilter
+from .export_manifest import content_digest
+from .guide_generator import GuideGenerator
+from .slack_client import SlackClient
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# レスポンスの形式と Content-Type
+CONTENT_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+}
+
+# これより小さいレスポンスは圧縮しない
+MIN_GZIP_SIZE = 512
+
+# キャッシュするレスポンスの最大数（フィルターの組み合わせごとに増えるため上限を設ける）
+MAX_CACHED_RESPONSES = 256
+
+
+class CachedResponse(NamedTuple):
+    """キャッシュしたレスポンス"""
+
+    body: bytes
+    gzip_body: Optional[bytes]
+    etag: str
+    content_type: str
+
+
+def make_response(text: str, content_type: str) -> CachedResponse:
+    """
+    レスポンスの本文からキャッシュ用のレスポンスを作成
+
+    Args:
+        text: 本文
+        content_type: Content-Type
+
+    Returns:
+        CachedResponse: 本文、gzip圧縮した本文、ETag、Content-Type
+    """
+    body = text.encode("utf-8")
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    gzip_body = gzip.compress(body, mtime=0) if len(body) >= MIN_GZIP_SIZE else None
+    return CachedResponse(body, gzip_body, etag, content_type)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match ヘッダーが ETag に一致するかを判定
+
+    Args:
+        if_none_match: If-None-Match ヘッダーの値
+        etag: レスポンスの ETag
+
+    Returns:
+        bool: 一致する場合（'*' を含む）はTrue
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag == etag or tag == "W/" + etag:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Accept-Encoding ヘッダーが gzip を受け入れるかを判定
+    """
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """リクエストを接続ごとのスレッドで処理するHTTPサーバー"""
+
+    daemon_threads = True
+
+
+class BookmarkServer:
+    """ブックマークファイルをHTTPで配信するサーバー
+
+    refresh でSlack APIからディレクトリを取得し直します。取得した内容が
+    前回と同じ場合はキャッシュ（とETag）をそのまま使い、変わった場合だけ
+    キャッシュを破棄します。ディレクトリを取得するまでは 503 を返します。
+    """
+
+    def __init__(
+        self,
+        slack_client: SlackClient,
+        bookmark_generator: BookmarkGenerator,
+        guide_generator: GuideGenerator,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        public_only: bool = False,
+        include_dm: bool = True,
+    ):
+        """
+        BookmarkServerの初期化
+
+        Args:
+            slack_client: ディレクトリの取得に使うSlackClient
+            bookmark_generator: ブックマークの作成に使うBookmarkGenerator
+            guide_generator: ガイドページの作成に使うGuideGenerator
+            host: 待ち受けるホスト名
+            port: 待ち受けるポート番号（0の場合は空いているポート）
+            public_only: Trueの場合、公開チャンネルのみを配信する
+            include_dm: Trueの場合、ユーザーDMのブックマークも配信する
+        """
+        self.slack_client = slack_client
+        self.bookmark_generator = bookmark_generator
+        self.guide_generator = guide_generator
+        self.public_only = public_only
+        self.include_dm = include_dm
+
+        self.channels: Optional[List[Dict[str, Any]]] = None
+        self.users: List[Dict[str, Any]] = []
+        self.directory_digest = ""
+        self.cache: Dict[Tuple, CachedResponse] = {}
+        self.renders = 0
+        self._render_lock = threading.Lock()
+
+        self._server = _ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """サーバーのURL（例: 'http://127.0.0.1:8000'）"""
+        host, port = self._server.server_address[:2]
+        if host in ("0.0.0.0", "::"):
+            host = socket.getfqdn()
+        return f"http://{host}:{port}"
+
+    def start(self) -> "BookmarkServer":
+        """
+        バックグラウンドのスレッドでリクエストの受け付けを開始
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"ブックマークの配信を開始しました: {self.url}/guide/channels.html")
+        return self
+
+    def stop(self) -> None:
+        """
+        リクエストの受け付けを終了
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "BookmarkServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def refresh(self) -> bool:
+        """
+        Slack APIからディレクトリを取得し直す
+
+        Returns:
+            bool: 取得に成功した場合はTrue
+        """
+        try:
+            if self.public_only:
+                channels = self.slack_client.get_public_channels()
+            else:
+                channels = self.slack_client.get_all_channels()
+            users = self.slack_client.get_all_users() if self.include_dm else []
+        except Exception as e:
+            logger.error(f"ディレクトリの取得中にエラーが発生しました: {e}")
+            return False
+
+        generator = self.bookmark_generator
+        digest = content_digest(
+            generator.build_channel_entries(channels)
+            + generator.build_user_entries(users)
+        )
+        with self._render_lock:
+            if digest != self.directory_digest:
+                self.cache = {}
+                self.directory_digest = digest
+            self.channels = channels
+            self.users = users
+        logger.info(
+            f"ディレクトリを更新しました: {len(channels)}チャンネル, {len(users)}ユーザー"
+        )
+        return True
+
+    def get(
+        self, kind: str, fmt: str, patterns: Tuple[str, ...] = ()
+    ) -> Optional[CachedResponse]:
+        """
+        レスポンスをキャッシュから取得（なければ作成してキャッシュ）
+
+        Args:
+            kind: 'channels'、'dms'、'guide-channels'、'guide-dms' のいずれか
+            fmt: 'html' または 'json'
+            patterns: チャンネルのフィルター（ChannelFilter のパターン）
+
+        Returns:
+            Optional[CachedResponse]: レスポンス（ディレクトリ未取得の場合はNone）
+
+        Raises:
+            ValueError: フィルターが不正な場合
+        """
+        key = (self.bookmark_generator.workspace_id, kind, patterns, fmt)
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+        with self._render_lock:
+            # 他のスレッドが作成済みであればそれを使う
+            response = self.cache.get(key)
+            if response is None and self.channels is not None:
+                response = self._render(kind, fmt, patterns)
+                if len(self.cache) >= MAX_CACHED_RESPONSES:
+                    # 最も古く作成したレスポンスを破棄する
+                    del self.cache[next(iter(self.cache))]
+                self.cache[key] = response
+                self.renders += 1
+        return response
+
+    def _render(self, kind: str, fmt: str, patterns: Tuple[str, ...]) -> CachedResponse:
+        """
+        レスポンスを作成
+        """
+        generator = self.bookmark_generator
+        if kind in ("guide-channels", "guide-dms"):
+            is_user_dm = kind == "guide-dms"
+            path = "/dms.html" if is_user_dm else "/channels.html"
+            html = self.guide_generator.render_guide(
+                self.url + path, is_public_only=self.public_only, is_user_dm=is_user_dm
+            )
+            return make_response(html, CONTENT_TYPES["html"])
+
+        channels = self.channels or []
+        if kind == "channels" and patterns:
+            channels = ChannelFilter(list(patterns)).apply(channels)
+        if fmt == "json":
+            entries = (
+                generator.build_channel_entries(channels)
+                if kind == "channels"
+                else generator.build_user_entries(self.users)
+            )
+            text = json.dumps(
+                [{"title": title, "url": url} for title, url in entries],
+                ensure_ascii=False,
+            )
+        elif kind == "channels":
+            text = generator.render_channel_bookmarks(channels)
+        else:
+            text = generator.render_user_dm_bookmarks(self.users)
+        return make_response(text, CONTENT_TYPES[fmt])
+
+    def resolve(self, path: str) -> Optional[Tuple[str, str]]:
+        """
+        リクエストのパスを (種類, 形式) に変換
+
+        Returns:
+            Optional[Tuple[str, str]]: 対応するエンドポイントがない場合はNone
+        """
+        name, _, fmt = path.rpartition(".")
+        if fmt not in CONTENT_TYPES:
+            return None
+        if name == "/channels":
+            return "channels", fmt
+        if name == "/dms" and self.include_dm:
+            return "dms", fmt
+        if fmt == "html" and name == "/guide/channels":
+            return "guide-channels", fmt
+        if fmt == "html" and name == "/guide/dms" and self.include_dm:
+            return "guide-dms", fmt
+        return None
+
+    def _handler_class(self):
+        """リクエストハンドラーのクラスを作成"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            server_version = "SlackToBookmark"
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            def do_HEAD(self):
+                self._respond(send_body=False)
+
+            def _respond(self, send_body: bool):
+                url = urlsplit(self.path)
+                target = server.resolve(url.path)
+                if target is None:
+                    self._send_error(404, "Not Found")
+                    return
+                query = parse_qs(url.query)
+                patterns = tuple(
+                    sorted(
+                        {
+                            pattern.strip()
+                            for value in query.get("filter", [])
+                            for pattern in value.split(",")
+                            if pattern.strip()
+                        }
+                    )
+                )
+                try:
+                    response = server.get(target[0], target[1], patterns)
+                except ValueError as e:
+                    self._send_error(400, str(e))
+                    return
+                if response is None:
+                    self._send_error(503, "Directory is loading", retry_after=True)
+                    return
+
+                headers = {
+                    "ETag": response.etag,
+                    "Cache-Control": "no-cache",
+                    "Vary": "Accept-Encoding",
+                }
+                if etag_matches(self.headers.get("If-None-Match"), response.etag):
+                    self.send_response(304)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    return
+
+                body = response.body
+                if response.gzip_body is not None and accepts_gzip(
+                    self.headers.get("Accept-Encoding")
+                ):
+                    body = response.gzip_body
+                    headers["Content-Encoding"] = "gzip"
+                self.send_response(200)
+                self.send_header("Content-Type", response.content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def _send_error(self, status: int, message: str, retry_after=False):
+                body = message.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if retry_after:
+                    self.send_header("Retry-After", "5")
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("%s - " + format, self.address_string(), *args)
+
+        return Handler
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Bookmark Sinks Module - ブックマークを複数の形式で書き出す出力先（シンク）を担当するモジュール
+
+同じチャンネル・ユーザーの一覧を、ブラウザ用のブックマークファイルだけでなく
+ランチャーアプリ用のJSONや監査用のCSVとしても出力できるようにします。
+各形式はシンク（BookmarkSink のサブクラス）として登録され、
+write_sinks でレコードを1回走査するだけで、指定したすべてのシンクに
+同時にエントリを書き込みます。各シンクは出力レイヤー（OutputWriter）が
+開いたファイルへバッファ付きで逐次書き込むため、形式を増やしても
+取得・並べ替え・走査の回数は増えません。
+
+新しい形式は register_sink で追加できます::
+
+    class TsvSink(BookmarkSink):
+        extension = ".tsv"
+        def write_entry(self, record_id, title, url): ...
+
+    register_sink("tsv", TsvSink)
+"""
+
+import csv
+import html
+import json
+import logging
+from contextlib import ExitStack
+from typing import Dict, Iterable, List, Sequence, TextIO, Tuple, Type
+
+from .output_writer import get_output_writer
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+
+class BookmarkSink:
+    """ブックマークの出力先（シンク）の基底クラス
+
+    サブクラスは extension を定義し、write_entry（必要に応じて
+    write_header / write_footer）を実装します。
+    """
+
+    # 出力ファイルの拡張子
+    extension = ""
+
+    # HTTPなどで返すときのメディアタイプ
+    content_type = "text/plain; charset=utf-8"
+
+    def __init__(self, file: TextIO, path: str, folder_name: str, timestamp: str):
+        """
+        BookmarkSinkの初期化
+
+        Args:
+            file: 書き込み先（OutputWriter.open で開いたファイルやメモリ上のストリーム）
+            path: 出力ファイル名
+            folder_name: ブックマークフォルダ名
+            timestamp: 作成日時（UNIX時間の文字列）
+        """
+        self.file = file
+        self.path = path
+        self.folder_name = folder_name
+        self.timestamp = timestamp
+
+    def write_header(self) -> None:
+        """
+        最初のエントリの前に書き込む内容
+        """
+
+    def write_entry(self, record_id: str, title: str, url: str) -> None:
+        """
+        エントリを1件書き込む
+
+        Args:
+            record_id: チャンネルIDまたはユーザーID
+            title: 表示名
+            url: URL
+        """
+        raise NotImplementedError
+
+    def write_footer(self) -> None:
+        """
+        最後のエントリの後に書き込む内容
+        """
+
+
+class NetscapeHtmlSink(BookmarkSink):
+    """Netscape Bookmark File Format（HTML）のシンク"""
+
+    extension = ".html"
+    content_type = "text/html; charset=utf-8"
+
+    def write_header(self) -> None:
+        self.file.write(f"""<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+    <DT><H3 ADD_DATE="{self.timestamp}" LAST_MODIFIED="{self.timestamp}">{html.escape(self.folder_name)}</H3>
+    <DL><p>
+""")
+
+    def write_entry(self, record_id: str, title: str, url: str) -> None:
+        # URLは BookmarkGenerator が percent-encode 済みの値から組み立てているため、
+        # 属性値を閉じる '"' だけを置き換える（BookmarkGenerator の出力と同じ形式）
+        href = url.replace('"', "%22")
+        self.file.write(
+            f'            <DT><A HREF="{href}" ADD_DATE="{self.timestamp}">'
+            f"{html.escape(title)}</A>\n"
+        )
+
+    def write_footer(self) -> None:
+        self.file.write("    </DL><p>\n</DL><p>\n")
+
+
+class JsonSink(BookmarkSink):
+    """ランチャーアプリ向けのJSONのシンク
+
+    出力形式::
+
+        {"folder": "Slack", "generated_at": "...", "items": [
+        {"id": "C123", "title": "#general", "url": "slack://channel?..."}
+        ]}
+    """
+
+    extension = ".json"
+    content_type = "application/json; charset=utf-8"
+
+    def write_header(self) -> None:
+        self.separator = "\n"
+        self.file.write(
+            '{"folder":%s,"generated_at":%s,"items":['
+            % (
+                json.dumps(self.folder_name, ensure_ascii=False),
+                json.dumps(self.timestamp),
+            )
+        )
+
+    def write_entry(self, record_id: str, title: str, url: str) -> None:
+        self.file.write(
+            self.separator
+            + json.dumps(
+                {"id": record_id, "title": title, "url": url}, ensure_ascii=False
+            )
+        )
+        self.separator = ",\n"
+
+    def write_footer(self) -> None:
+        self.file.write("\n]}\n")
+
+
+class CsvSink(BookmarkSink):
+    """監査向けのCSVのシンク（列: folder, id, title, url）"""
+
+    extension = ".csv"
+    content_type = "text/csv; charset=utf-8"
+
+    def write_header(self) -> None:
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["folder", "id", "title", "url"])
+
+    def write_entry(self, record_id: str, title: str, url: str) -> None:
+        self.writer.writerow([self.folder_name, record_id, title, url])
+
+
+class MarkdownSink(BookmarkSink):
+    """Markdownのリストのシンク"""
+
+    extension = ".md"
+    content_type = "text/markdown; charset=utf-8"
+
+    # リンクテキストでエスケープが必要な文字
+    _ESCAPE = str.maketrans({c: "\\" + c for c in "\\[]*_`<>"})
+
+    def write_header(self) -> None:
+        self.file.write(f"# {self.folder_name.translate(self._ESCAPE)}\n\n")
+
+    def write_entry(self, record_id: str, title: str, url: str) -> None:
+        self.file.write(f"- [{title.translate(self._ESCAPE)}](<{url}>)\n")
+
+
+# 形式名とシンクのクラス
+SINK_TYPES: Dict[str, Type[BookmarkSink]] = {
+    "html": NetscapeHtmlSink,
+    "json": JsonSink,
+    "csv": CsvSink,
+    "md": MarkdownSink,
+}
+
+
+def register_sink(format_name: str, sink_class: Type[BookmarkSink]) -> None:
+    """
+    出力形式を登録
+
+    Args:
+        format_name: 形式名（--formats で指定する名前）
+        sink_class: BookmarkSink のサブクラス
+    """
+    SINK_TYPES[format_name] = sink_class
+
+
+def parse_formats(value: str) -> List[str]:
+    """
+    カンマ区切りの出力形式を検証してリストに変換
+
+    Args:
+        value: 形式名のカンマ区切り（例: 'html,json,csv'）
+
+    Returns:
+        List[str]: 重複を除いた形式名のリスト（指定順）
+
+    Raises:
+        ValueError: 未登録の形式が含まれる場合、または形式が空の場合
+    """
+    formats = list(
+        dict.fromkeys(f.strip().lower() for f in value.split(",") if f.strip())
+    )
+    unknown = [f for f in formats if f not in SINK_TYPES]
+    if unknown:
+        raise ValueError(
+            f"未対応の出力形式です: {', '.join(unknown)}"
+            f"（指定可能: {', '.join(SINK_TYPES)}）"
+        )
+    if not formats:
+        raise ValueError("出力形式が指定されていません")
+    return formats
+
+
+def sink_path(base_file: str, format_name: str) -> str:
+    """
+    出力形式ごとのファイル名を作成（例: 'slack_all_channels.html' -> 'slack_all_channels.csv'）
+    """
+    base = base_file.rsplit(".", 1)[0] if "." in base_file else base_file
+    return base + SINK_TYPES[format_name].extension
+
+
+def fill_sinks(
+    sinks: Sequence[BookmarkSink], rows: Iterable[Tuple[str, str, str]]
+) -> None:
+    """
+    レコードを1回走査して、すべてのシンクにヘッダー・エントリ・フッターを書き込む
+
+    Args:
+        sinks: 書き込み先のシンク
+        rows: (ID, 表示名, URL) の並び
+    """
+    for sink in sinks:
+        sink.write_header()
+    write_entries = [sink.write_entry for sink in sinks]
+    for record_id, title, url in rows:
+        for write_entry in write_entries:
+            write_entry(record_id, title, url)
+    for sink in sinks:
+        sink.write_footer()
+
+
+def write_sinks(
+    base_file: str,
+    folder_name: str,
+    rows: Iterable[Tuple[str, str, str]],
+    formats: Sequence[str],
+    timestamp: str,
+) -> Dict[str, str]:
+    """
+    レコードを1回走査して、指定したすべての形式のファイルに書き込む
+
+    Args:
+        base_file: 出力ファイル名の基準（拡張子は形式ごとに置き換える）
+        folder_name: ブックマークフォルダ名
+        rows: (ID, 表示名, URL) の並び
+        formats: 出力形式のリスト
+        timestamp: 作成日時（UNIX時間の文字列）
+
+    Returns:
+        Dict[str, str]: 形式名と出力ファイル名
+
+    Raises:
+        IOError: ファイル書き込みに失敗した場合（どの形式のファイルも置き換えられない）
+    """
+    writer = get_output_writer()
+    sinks: List[BookmarkSink] = []
+    with ExitStack() as stack:
+        for format_name in formats:
+            path = sink_path(base_file, format_name)
+            sinks.append(
+                SINK_TYPES[format_name](
+                    stack.enter_context(writer.open(path)), path, folder_name, timestamp
+                )
+            )
+        fill_sinks(sinks, rows)
+    return {format_name: sink.path for format_name, sink in zip(formats, sinks)}
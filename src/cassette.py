@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Cassette Module - Slack APIレスポンスの記録と再生を担当するモジュール
+
+Slack APIのレスポンスは実行のたびに内容も応答時間も変わるため、
+遅いクロールを調査しても同じ状況を再現できません。
+このモジュールは、PooledTransport が送受信したレスポンスの生バイト列
+（auth.test、users.list、conversations.list など）を応答時間とともに
+gzip圧縮したカセットファイルに記録し、後からネットワークに接続せずに再生します。
+
+- 記録と再生はトランスポート（PooledTransport のサブクラス）で行うため、
+  WebClient のリトライ処理、ResponseDecoder のデコードと射影、
+  PageSizeController によるページサイズの調整は実際の通信と同じように動作します。
+- 再生時は記録した応答時間どおりに待つか、待たずに返すかを選べます。
+- カセットは1行1レスポンスのJSON Lines形式です。トークンは記録しませんが、
+  レスポンスにはワークスペースのチャンネル名やユーザー名がそのまま含まれます。
+"""
+
+import gzip
+import http.client
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .http_transport import PooledTransport
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# カセットファイルの形式のバージョン
+CASSETTE_VERSION = 1
+
+# 再生時の待ち時間（記録した応答時間に掛ける係数）
+REPLAY_LATENCIES: Dict[str, float] = {"original": 1.0, "zero": 0.0}
+
+# リクエストの照合に使わないパラメーター（limit は PageSizeController が
+# 応答時間に応じて決めるため、記録時と再生時で異なることがある）
+IGNORED_PARAMS = frozenset(["limit", "token"])
+
+# 記録しないレスポンスヘッダー
+IGNORED_HEADERS = frozenset(["set-cookie"])
+
+RequestKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def request_key(method: str, url: str, body: Optional[bytes]) -> RequestKey:
+    """
+    記録したレスポンスを探すためのリクエストのキーを作成
+
+    Args:
+        method: HTTPメソッド
+        url: リクエスト先のURL
+        body: リクエストボディ（フォーム形式）
+
+    Returns:
+        RequestKey: (HTTPメソッド, パス, 照合に使うパラメーター)
+    """
+    parts = urlsplit(url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    if body:
+        params += parse_qsl(body.decode("utf-8", "replace"), keep_blank_values=True)
+    return (
+        method.upper(),
+        parts.path,
+        tuple(sorted((k, v) for k, v in params if k not in IGNORED_PARAMS)),
+    )
+
+
+def _make_headers(items: List[List[str]]) -> http.client.HTTPMessage:
+    """
+    記録したヘッダーから HTTPMessage を作成
+    """
+    headers = http.client.HTTPMessage()
+    for name, value in items:
+        headers[name] = value
+    return headers
+
+
+class RecordingTransport(PooledTransport):
+    """実際に通信し、レスポンスをカセットファイルに記録するトランスポート"""
+
+    def __init__(self, cassette_file: str, **kwargs: Any):
+        """
+        RecordingTransportの初期化（カセットファイルを作成する）
+
+        Args:
+            cassette_file: 記録先のカセットファイルのパス（gzip圧縮のJSON Lines）
+            **kwargs: PooledTransport に渡す引数
+        """
+        super().__init__(**kwargs)
+        self.cassette_file = cassette_file
+        self.recorded = 0
+        self._write_lock = threading.Lock()
+        self._stream: Optional[Any] = gzip.open(cassette_file, "wt", encoding="utf-8")
+        self._stream.write(json.dumps({"cassette": CASSETTE_VERSION}) + "\n")
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """
+        HTTPリクエストを送信し、レスポンスと応答時間を記録
+        """
+        started = time.perf_counter()
+        status, response_headers, data = super().request(method, url, body, headers)
+        elapsed = time.perf_counter() - started
+
+        record = {
+            "method": method.upper(),
+            "path": urlsplit(url).path,
+            "params": request_key(method, url, body)[2],
+            "status": status,
+            "headers": [
+                [name, value]
+                for name, value in response_headers.items()
+                if name.lower() not in IGNORED_HEADERS
+            ],
+            "body": data.decode("utf-8", "surrogateescape"),
+            "elapsed": round(elapsed, 6),
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._write_lock:
+            if self._stream is not None:
+                self._stream.write(line)
+                self.recorded += 1
+        return status, response_headers, data
+
+    def close(self) -> None:
+        """
+        カセットファイルを閉じ、プール内のすべての接続を閉じる
+        """
+        with self._write_lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.close()
+            logger.info(
+                f"Slack APIのレスポンスを記録しました: {self.cassette_file}"
+                f"（{self.recorded}件）"
+            )
+        super().close()
+
+
+class ReplayTransport(PooledTransport):
+    """カセットファイルに記録したレスポンスを返すトランスポート（通信しない）
+
+    リクエストはHTTPメソッド、パス、パラメーター（limit を除く）で照合し、
+    同じリクエストが複数回記録されている場合は記録した順に返します。
+    記録した回数より多く呼ばれた場合は、最後のレスポンスを繰り返し返します。
+    """
+
+    def __init__(self, cassette_file: str, latency: str = "original", **kwargs: Any):
+        """
+        ReplayTransportの初期化（カセットファイルを読み込む）
+
+        Args:
+            cassette_file: 再生するカセットファイルのパス
+            latency: 'original'（記録した応答時間どおりに待つ）または 'zero'（待たない）
+            **kwargs: PooledTransport に渡す引数
+
+        Raises:
+            FileNotFoundError: カセットファイルが存在しない場合
+            ValueError: latency が不正な場合、またはカセットファイルの形式が異なる場合
+        """
+        if latency not in REPLAY_LATENCIES:
+            raise ValueError(
+                f"未対応の再生方法です: {latency}"
+                f"（指定可能: {', '.join(REPLAY_LATENCIES)}）"
+            )
+        super().__init__(**kwargs)
+        self.cassette_file = cassette_file
+        self.latency_scale = REPLAY_LATENCIES[latency]
+        self._records: Dict[RequestKey, Deque[Dict[str, Any]]] = {}
+        self._replay_lock = threading.Lock()
+        self.replayed = 0
+        count = self._load(cassette_file)
+        logger.info(
+            f"Slack APIのレスポンスを再生します: {cassette_file}（{count}件、"
+            f"待ち時間: {latency}）"
+        )
+
+    def _load(self, cassette_file: str) -> int:
+        """
+        カセットファイルを読み込み、リクエストのキーごとにレスポンスを並べる
+        """
+        count = 0
+        with gzip.open(cassette_file, "rt", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline() or "{}")
+                if header.get("cassette") != CASSETTE_VERSION:
+                    raise ValueError(
+                        f"カセットファイルの形式が異なります: {cassette_file}"
+                    )
+                for line in f:
+                    record = json.loads(line)
+                    key: RequestKey = (
+                        record["method"],
+                        record["path"],
+                        tuple(tuple(param) for param in record["params"]),
+                    )
+                    self._records.setdefault(key, deque()).append(record)
+                    count += 1
+            except (EOFError, json.JSONDecodeError):
+                # 記録中に異常終了したカセットは、読み込めたところまでを使う
+                logger.warning(
+                    f"カセットファイルの末尾が壊れています（{count}件まで使用します）: "
+                    f"{cassette_file}"
+                )
+        return count
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """
+        リクエストに対応する記録済みのレスポンスを返す
+
+        Raises:
+            LookupError: リクエストに対応するレスポンスが記録されていない場合
+        """
+        key = request_key(method, url, body)
+        with self._replay_lock:
+            records = self._records.get(key)
+            if not records:
+                raise LookupError(
+                    f"カセットにレスポンスが記録されていません: {key[0]} {key[1]} "
+                    f"{dict(key[2])}"
+                )
+            record = records.popleft() if len(records) > 1 else records[0]
+            self.replayed += 1
+            self.stats["requests"] += 1
+        if self.latency_scale:
+            time.sleep(record["elapsed"] * self.latency_scale)
+        return (
+            record["status"],
+            _make_headers(record["headers"]),
+            record["body"].encode("utf-8", "surrogateescape"),
+        )
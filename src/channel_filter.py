@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Channel Filter Module - チャンネル名によるフィルタリングを担当するモジュール
+
+--channels で指定されたチャンネル名を、完全一致の名前・globパターン
+（例: 'proj-*'）・正規表現（例: 're:^team-(dev|ops)$'）に分類し、
+完全一致は集合、パターンは1つの正規表現にまとめてコンパイルします。
+チャンネルごとの判定は集合の参照と正規表現の照合1回で済むため、
+数万チャンネル規模でもリストの線形探索を繰り返すことはありません。
+"""
+
+import fnmatch
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Pattern
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# 正規表現として扱うパターンの接頭辞
+REGEX_PREFIX = "re:"
+# globパターンとして扱う文字
+GLOB_CHARS = frozenset("*?[")
+
+
+class ChannelFilter:
+    """チャンネル名のフィルター
+
+    完全一致の名前、globパターン、正規表現（'re:' で始まるもの）を
+    組み合わせて指定できます。いずれか1つに一致したチャンネルを残します。
+    正規表現は re.match と同じくチャンネル名の先頭から照合します。
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        ChannelFilterの初期化
+
+        Args:
+            patterns: チャンネル名・globパターン・正規表現（'re:' で始まる）のリスト
+
+        Raises:
+            ValueError: 正規表現が不正な場合
+        """
+        self.patterns = [p for p in patterns if p]
+        self.names = set()
+        expressions = []
+        for pattern in self.patterns:
+            if pattern.startswith(REGEX_PREFIX):
+                expression = pattern[len(REGEX_PREFIX) :]
+                try:
+                    re.compile(expression)
+                except re.error as e:
+                    raise ValueError(f"不正な正規表現です: {expression} ({e})")
+                expressions.append(f"(?:{expression})")
+            elif GLOB_CHARS.intersection(pattern):
+                expressions.append(fnmatch.translate(pattern))
+            else:
+                self.names.add(pattern)
+
+        # パターンはまとめて1つの正規表現にコンパイルする
+        self.regex: Optional[Pattern[str]] = (
+            re.compile("|".join(expressions)) if expressions else None
+        )
+
+    def matches(self, channel_name: str) -> bool:
+        """
+        チャンネル名がフィルターに一致するかを判定
+
+        Args:
+            channel_name: チャンネル名
+
+        Returns:
+            bool: 一致する場合はTrue
+        """
+        if channel_name in self.names:
+            return True
+        return self.regex is not None and self.regex.match(channel_name) is not None
+
+    def apply(self, channels: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        チャンネル一覧からフィルターに一致するものだけを残す
+
+        Args:
+            channels: チャンネル情報のリスト
+
+        Returns:
+            List[Dict[str, Any]]: 一致したチャンネル情報のリスト
+        """
+        names = self.names
+        regex_match = self.regex.match if self.regex is not None else None
+        if regex_match is None:
+            return [ch for ch in channels if ch["name"] in names]
+        return [
+            ch
+            for ch in channels
+            if ch["name"] in names or regex_match(ch["name"]) is not None
+        ]
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Channel Grouping Module - チャンネル名のプレフィックスによるフォルダ分けを担当するモジュール
+
+このモジュールは、チャンネル名を "-" や "_" で区切ったトークン列から
+プレフィックス木（トライ）を構築し、ブックマークを階層フォルダに
+振り分けます。トライの構築はチャンネル名の総文字数に比例する O(L) で
+行われるため、数万チャンネル規模のワークスペースでも高速に動作します。
+"""
+
+import logging
+import re
+from typing import List, Dict, Tuple, Any
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# チャンネル名の区切り文字
+SEPARATOR_PATTERN = re.compile(r"[-_]+")
+
+
+class _TrieNode:
+    """トライの1ノード（チャンネル名トークン1つに対応）"""
+
+    __slots__ = ("children", "entries", "count")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entries: List[Tuple[str, str]] = []
+        # このノード以下に含まれるエントリ数
+        self.count = 0
+
+
+class ChannelTrie:
+    """チャンネル名のトークン列からなるプレフィックス木
+
+    エントリを insert で追加した後、build_folders で
+    フォルダサイズと階層の上限を満たすフォルダ構造に変換します。
+    フォルダ構造は (名前, 値) のリストで表され、値が文字列ならURL
+    （ブックマーク）、リストならサブフォルダの中身を表します。
+    """
+
+    def __init__(self):
+        """
+        ChannelTrieの初期化
+        """
+        self.root = _TrieNode()
+
+    def insert(self, channel_name: str, entry: Tuple[str, str]) -> None:
+        """
+        チャンネル名に対応するエントリを追加
+
+        Args:
+            channel_name: チャンネル名（例: 'proj-alpha-dev'）
+            entry: ブックマークの (表示名, URL)
+        """
+        node = self.root
+        node.count += 1
+        for token in SEPARATOR_PATTERN.split(channel_name.lower()):
+            if not token:
+                continue
+            child = node.children.get(token)
+            if child is None:
+                child = node.children[token] = _TrieNode()
+            node = child
+            node.count += 1
+        node.entries.append(entry)
+
+    def build_folders(
+        self, max_folder_size: int = 50, max_depth: int = 3
+    ) -> List[Tuple[str, Any]]:
+        """
+        トライをフォルダ構造に変換
+
+        エントリ数が max_folder_size を超えるノードだけをプレフィックスごとの
+        サブフォルダに分割します。エントリが1件しかないプレフィックスは
+        フォルダを作らず親フォルダに直接置き、子が1つだけの中間ノードは
+        名前を連結して1つのフォルダにまとめます。各階層ではエントリを先に、
+        サブフォルダを後に並べます。
+
+        Args:
+            max_folder_size: 1フォルダに直接置くエントリ数の目安
+            max_depth: フォルダ階層の最大の深さ
+
+        Returns:
+            List[Tuple[str, Any]]: フォルダ構造（(表示名, URL) または (フォルダ名, 中身)）
+
+        Raises:
+            ValueError: 上限値が1未満の場合
+        """
+        if max_folder_size < 1 or max_depth < 1:
+            raise ValueError("max_folder_size と max_depth は1以上である必要があります")
+        return self._build(self.root, "", 0, max_folder_size, max_depth)
+
+    def _build(
+        self,
+        node: _TrieNode,
+        prefix: str,
+        depth: int,
+        max_folder_size: int,
+        max_depth: int,
+    ) -> List[Tuple[str, Any]]:
+        """
+        ノード以下をフォルダ構造に変換（build_foldersの内部処理）
+        """
+        if node.count <= max_folder_size or depth >= max_depth:
+            return list(self._flatten(node))
+
+        # エントリを先に、サブフォルダを後に並べる
+        items: List[Tuple[str, Any]] = list(node.entries)
+        folders: List[Tuple[str, Any]] = []
+        for token in sorted(node.children):
+            child = node.children[token]
+            name = f"{prefix}-{token}" if prefix else token
+
+            if child.count == 1:
+                items.extend(self._flatten(child))
+                continue
+
+            # 子が1つだけの中間ノードは名前を連結して1つのフォルダにまとめる
+            while len(child.children) == 1 and not child.entries:
+                ((next_token, next_child),) = child.children.items()
+                name = f"{name}-{next_token}"
+                child = next_child
+
+            folders.append(
+                (
+                    name,
+                    self._build(child, name, depth + 1, max_folder_size, max_depth),
+                )
+            )
+        return items + folders
+
+    @staticmethod
+    def _flatten(node: _TrieNode):
+        """
+        ノード以下のすべてのエントリをトークン順に列挙
+
+        Args:
+            node: 起点となるノード
+
+        Yields:
+            Tuple[str, str]: (表示名, URL)
+        """
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield from current.entries
+            stack.extend(
+                current.children[token]
+                for token in sorted(current.children, reverse=True)
+            )
+
+
+def group_channels_by_prefix(
+    channels: List[Dict[str, Any]],
+    entries: List[Tuple[str, str]],
+    max_folder_size: int = 50,
+    max_depth: int = 3,
+) -> List[Tuple[str, Any]]:
+    """
+    チャンネルとエントリの組からプレフィックスごとのフォルダ構造を作成
+
+    Args:
+        channels: チャンネル情報のリスト（entriesと同じ順序）
+        entries: BookmarkGenerator.build_channel_entries で作成した (表示名, URL) のリスト
+        max_folder_size: 1フォルダに直接置くエントリ数の目安
+        max_depth: フォルダ階層の最大の深さ
+
+    Returns:
+        List[Tuple[str, Any]]: フォルダ構造
+    """
+    trie = ChannelTrie()
+    for channel, entry in zip(channels, entries):
+        trie.insert(channel["name"], entry)
+    folders = trie.build_folders(max_folder_size, max_depth)
+    logger.info(
+        f"チャンネルをプレフィックスでグループ化しました: {len(entries)}件 -> 最上位 {len(folders)}項目"
+    )
+    return folders
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Chrome Bookmarks Module - Chromiumプロファイルの Bookmarks ファイルへの直接書き込みを担当するモジュール
+
+このモジュールは、Chrome/EdgeなどChromium系ブラウザのプロファイルにある
+``Bookmarks`` ファイル（JSON形式）に、Slackのチャンネル・DMブックマークを
+直接マージします。HTMLファイルのインポートと異なり、既存のブックマークを
+URLで索引化して差分（追加・名前変更・削除）だけを反映するため、
+何度同期してもフォルダが重複しません。
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import platform
+import tempfile
+import uuid
+from typing import List, Dict, Any, Tuple, Optional
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# Chromeのタイムスタンプは 1601-01-01 からのマイクロ秒
+CHROME_EPOCH_OFFSET_SECONDS = 11644473600
+
+# チェックサム計算の対象となるルートフォルダ（Chromiumと同じ順序）
+CHECKSUM_ROOTS = ("bookmark_bar", "other", "synced")
+
+ROOT_NAMES = {
+    "bookmark_bar": "ブックマーク バー",
+    "other": "その他のブックマーク",
+    "synced": "モバイルのブックマーク",
+}
+
+
+def chrome_timestamp(now: Optional[datetime.datetime] = None) -> str:
+    """
+    Chrome形式のタイムスタンプ文字列を生成
+
+    Args:
+        now: 変換する日時（省略時は現在時刻）
+
+    Returns:
+        str: 1601-01-01 からのマイクロ秒を表す文字列
+    """
+    if now is None:
+        now = datetime.datetime.now()
+    return str(int((now.timestamp() + CHROME_EPOCH_OFFSET_SECONDS) * 1000000))
+
+
+def compute_checksum(roots: Dict[str, Any]) -> str:
+    """
+    Bookmarks ファイルのチェックサムを計算
+
+    Chromiumの BookmarkCodec と同じ規則で、各ノードのID・名前（UTF-16LE）・
+    種別・URLを順にMD5へ投入します。チェックサムが一致しない場合、
+    Chromeはファイルを破損とみなしてバックアップから復元するため、
+    書き込み時には必ず再計算する必要があります。
+
+    Args:
+        roots: Bookmarks ファイルの "roots" オブジェクト
+
+    Returns:
+        str: 16進数表記のMD5チェックサム
+    """
+    digest = hashlib.md5()
+
+    # 深いフォルダ階層でも再帰上限に達しないよう明示的なスタックで走査する
+    stack = [roots[name] for name in reversed(CHECKSUM_ROOTS) if name in roots]
+    while stack:
+        node = stack.pop()
+        digest.update(node.get("id", "").encode("utf-8"))
+        digest.update(node.get("name", "").encode("utf-16-le"))
+        if node.get("type") == "url":
+            digest.update(b"url")
+            digest.update(node.get("url", "").encode("utf-8"))
+        else:
+            digest.update(b"folder")
+            stack.extend(reversed(node.get("children", [])))
+
+    return digest.hexdigest()
+
+
+def default_bookmarks_path() -> str:
+    """
+    実行環境に応じたChromeの既定プロファイルの Bookmarks ファイルパスを返す
+
+    Returns:
+        str: Bookmarks ファイルのパス
+    """
+    system = platform.system()
+    home = os.path.expanduser("~")
+    if system == "Darwin":
+        base = os.path.join(home, "Library", "Application Support", "Google", "Chrome")
+    elif system == "Windows":
+        local_app_data = os.getenv(
+            "LOCALAPPDATA", os.path.join(home, "AppData", "Local")
+        )
+        base = os.path.join(local_app_data, "Google", "Chrome", "User Data")
+    else:
+        base = os.path.join(home, ".config", "google-chrome")
+    return os.path.join(base, "Default", "Bookmarks")
+
+
+class ChromeBookmarkWriter:
+    """Chromiumプロファイルの Bookmarks ファイルへブックマークをマージするクラス
+
+    指定されたルートフォルダ（既定はブックマークバー）の直下に
+    「Slack」「Slack Users」フォルダを作成・更新します。既存ノードはURLで
+    索引化されるため、同期は O(n) の差分処理になります。
+    書き込みは一時ファイルへの出力とリネームによってアトミックに行われます。
+
+    Note:
+        Chromeの起動中に書き込むと、Chrome終了時に上書きされる場合があります。
+        同期はChromeを終了した状態で実行してください。
+    """
+
+    def __init__(self, bookmarks_file: str, parent_root: str = "bookmark_bar"):
+        """
+        ChromeBookmarkWriterの初期化
+
+        Args:
+            bookmarks_file: Chromeプロファイル内の Bookmarks ファイルのパス
+            parent_root: フォルダを作成するルート（"bookmark_bar" / "other" / "synced"）
+
+        Raises:
+            ValueError: 不正なルート名が指定された場合
+        """
+        if parent_root not in CHECKSUM_ROOTS:
+            raise ValueError(
+                "parent_root は 'bookmark_bar'、'other'、'synced' のいずれかである必要があります"
+            )
+        self.bookmarks_file = bookmarks_file
+        self.parent_root = parent_root
+        self._next_id = 1
+        logger.info(f"ChromeBookmarkWriter initialized: {bookmarks_file}")
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Bookmarks ファイルを読み込む（存在しない場合は空の構造を返す）
+
+        Returns:
+            Dict[str, Any]: Bookmarks ファイルの内容
+        """
+        if not os.path.exists(self.bookmarks_file):
+            logger.info("Bookmarks ファイルが存在しないため新規作成します")
+            now = chrome_timestamp()
+            return {
+                "checksum": "",
+                "roots": {
+                    name: self._new_folder(str(index + 1), title, now)
+                    for index, (name, title) in enumerate(ROOT_NAMES.items())
+                },
+                "version": 1,
+            }
+
+        with open(self.bookmarks_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def sync(
+        self,
+        channel_entries: List[Tuple[str, str]],
+        user_entries: Optional[List[Tuple[str, str]]] = None,
+        channel_folder: str = "Slack",
+        user_folder: str = "Slack Users",
+    ) -> Dict[str, int]:
+        """
+        チャンネルとDMのブックマークを Bookmarks ファイルにマージして保存
+
+        Args:
+            channel_entries: BookmarkGenerator.build_channel_entries で作成した (表示名, URL) のリスト
+            user_entries: BookmarkGenerator.build_user_entries で作成した (表示名, URL) のリスト
+            channel_folder: チャンネル用フォルダ名
+            user_folder: ユーザーDM用フォルダ名
+
+        Returns:
+            Dict[str, int]: 追加・名前変更・削除したブックマーク数
+        """
+        data = self.load()
+        self._next_id = self._max_id(data["roots"]) + 1
+
+        stats = {"added": 0, "renamed": 0, "removed": 0}
+        folders = [(channel_folder, channel_entries)]
+        if user_entries is not None:
+            folders.append((user_folder, user_entries))
+
+        for folder_name, entries in folders:
+            folder_stats = self.merge_folder(data, folder_name, entries)
+            for key, value in folder_stats.items():
+                stats[key] += value
+
+        # 変更がなければ書き込まない（ウォッチモードで毎回ファイルを置き換えないため）
+        if not any(stats.values()) and os.path.exists(self.bookmarks_file):
+            logger.info(f"Chromeブックマークに変更はありません: {self.bookmarks_file}")
+            return stats
+
+        data["checksum"] = compute_checksum(data["roots"])
+        self._write_atomic(data)
+
+        logger.info(
+            f"Chromeブックマークを同期しました: 追加={stats['added']}, "
+            f"名前変更={stats['renamed']}, 削除={stats['removed']}"
+        )
+        return stats
+
+    def merge_folder(
+        self, data: Dict[str, Any], folder_name: str, entries: List[Tuple[str, str]]
+    ) -> Dict[str, int]:
+        """
+        1つのフォルダの内容を、指定されたエントリと一致するように更新
+
+        既存のURLノードはURLで索引化し、一致するものは（必要なら名前を変えて）
+        再利用します。エントリに含まれないURLノードは削除されますが、
+        ユーザーが手動で作成したサブフォルダはそのまま残します。
+
+        Args:
+            data: Bookmarks ファイルの内容（直接更新されます）
+            folder_name: 更新するフォルダ名
+            entries: (表示名, URL) のリスト
+
+        Returns:
+            Dict[str, int]: 追加・名前変更・削除したブックマーク数
+        """
+        now = chrome_timestamp()
+        folder = self._find_or_create_folder(
+            data["roots"][self.parent_root], folder_name, now
+        )
+
+        # 既存ノードをURLで索引化（重複ノードは削除対象にする）
+        index: Dict[str, Dict[str, Any]] = {}
+        subfolders = []
+        removed = 0
+        for child in folder.get("children", []):
+            if child.get("type") != "url":
+                subfolders.append(child)
+            elif child.get("url") in index:
+                removed += 1
+            else:
+                index[child["url"]] = child
+
+        children = []
+        added = 0
+        renamed = 0
+        for title, url in entries:
+            node = index.pop(url, None)
+            if node is None:
+                node = {
+                    "date_added": now,
+                    "guid": str(uuid.uuid4()),
+                    "id": self._allocate_id(),
+                    "name": title,
+                    "type": "url",
+                    "url": url,
+                }
+                added += 1
+            elif node.get("name") != title:
+                node["name"] = title
+                renamed += 1
+            children.append(node)
+
+        removed += len(index)
+        folder["children"] = children + subfolders
+        if added or renamed or removed:
+            folder["date_modified"] = now
+
+        return {"added": added, "renamed": renamed, "removed": removed}
+
+    def _find_or_create_folder(
+        self, parent: Dict[str, Any], folder_name: str, now: str
+    ) -> Dict[str, Any]:
+        """
+        親フォルダ直下から指定名のフォルダを探し、なければ作成する
+
+        Args:
+            parent: 親フォルダのノード
+            folder_name: フォルダ名
+            now: 作成日時（Chrome形式）
+
+        Returns:
+            Dict[str, Any]: フォルダのノード
+        """
+        children = parent.setdefault("children", [])
+        for child in children:
+            if child.get("type") == "folder" and child.get("name") == folder_name:
+                return child
+
+        folder = self._new_folder(self._allocate_id(), folder_name, now)
+        children.append(folder)
+        return folder
+
+    @staticmethod
+    def _new_folder(node_id: str, name: str, now: str) -> Dict[str, Any]:
+        """
+        空のフォルダノードを作成
+
+        Args:
+            node_id: ノードID
+            name: フォルダ名
+            now: 作成日時（Chrome形式）
+
+        Returns:
+            Dict[str, Any]: フォルダのノード
+        """
+        return {
+            "children": [],
+            "date_added": now,
+            "date_modified": now,
+            "guid": str(uuid.uuid4()),
+            "id": node_id,
+            "name": name,
+            "type": "folder",
+        }
+
+    def _allocate_id(self) -> str:
+        """
+        新しいノードIDを払い出す
+
+        Returns:
+            str: 未使用のノードID
+        """
+        node_id = str(self._next_id)
+        self._next_id += 1
+        return node_id
+
+    @staticmethod
+    def _max_id(roots: Dict[str, Any]) -> int:
+        """
+        ツリー内で使用されている最大のノードIDを取得
+
+        Args:
+            roots: Bookmarks ファイルの "roots" オブジェクト
+
+        Returns:
+            int: 最大のノードID
+        """
+        max_id = 0
+        stack = [node for node in roots.values() if isinstance(node, dict)]
+        while stack:
+            node = stack.pop()
+            try:
+                max_id = max(max_id, int(node.get("id", 0)))
+            except ValueError:
+                pass
+            stack.extend(node.get("children", []))
+        return max_id
+
+    def _write_atomic(self, data: Dict[str, Any]) -> None:
+        """
+        Bookmarks ファイルを一時ファイル経由でアトミックに書き込む
+
+        Args:
+            data: 書き込む内容
+        """
+        directory = os.path.dirname(os.path.abspath(self.bookmarks_file))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".Bookmarks.", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=3)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.bookmarks_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Collation Module - ユーザー名・チャンネル名の並べ替えキーの作成を担当するモジュール
+
+str.lower() による並べ替えでは、全角・半角の英数字、ひらがなとカタカナ、
+アクセント付きのラテン文字（例: 'Émile'）がばらばらの位置に並びます。
+このモジュールは、NFKC正規化と casefold、カタカナのひらがなへの統一、
+アクセント記号を除いた第1キーによる並べ替えキーを作成します。
+任意で、ローカルの読み仮名辞書（JSON）を使って漢字の名前を読みで並べます。
+
+並べ替えキーの計算は1つの文字列につき1回だけ行い、結果を
+コレーター内のキャッシュに保持します。SlackClient と BookmarkGenerator は
+get_collator() で同じコレーターを共有するため、同じ名前のキーを
+二度計算することはありません。
+"""
+
+import json
+import logging
+import threading
+import unicodedata
+from typing import Dict, Optional
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# カタカナ（ァ〜ヶ）をひらがな（ぁ〜ゖ）に変換する表
+KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+# 第1キーと第2キーの区切り（どの文字よりも小さい）
+KEY_SEPARATOR = "\0"
+
+
+class Collator:
+    """並べ替えキーを作成し、文字列ごとにキャッシュするコレーター
+
+    キーは「第1キー + 区切り + 第2キー」の1つの文字列で、
+    文字列同士の比較だけで次の順序になります。
+
+    - 第1キー: 読み仮名を適用し、NFKC正規化・カタカナのひらがな化・casefold を
+      行った後、アクセント記号などの結合文字を除いたもの
+    - 第2キー: 結合文字を除く前のもの（第1キーが同じ場合の順序を決める）
+
+    キーを1つの文字列にしているのは、ExternalSorter がランを
+    一時ファイルに書き出してもキーの比較結果が変わらないようにするためです。
+    """
+
+    def __init__(self, readings: Optional[Dict[str, str]] = None):
+        """
+        Collatorの初期化
+
+        Args:
+            readings: 読み仮名辞書（例: {'山田': 'やまだ', '太郎': 'たろう'}）
+        """
+        self.readings: Dict[str, str] = {
+            unicodedata.normalize("NFKC", word): reading
+            for word, reading in (readings or {}).items()
+            if word
+        }
+        self._max_word_length = max(map(len, self.readings), default=0)
+        self._cache: Dict[str, str] = {}
+
+    @classmethod
+    def from_file(cls, readings_file: str) -> "Collator":
+        """
+        読み仮名辞書ファイル（JSON）からコレーターを作成
+
+        Args:
+            readings_file: {"表記": "読み"} 形式のJSONファイルのパス
+
+        Returns:
+            Collator: 読み仮名辞書を使うコレーター
+        """
+        with open(readings_file, "r", encoding="utf-8") as f:
+            readings = json.load(f)
+        logger.info(
+            f"読み仮名辞書を読み込みました: {readings_file} ({len(readings)}語)"
+        )
+        return cls(readings)
+
+    def key(self, text: str) -> str:
+        """
+        文字列の並べ替えキーを取得（計算済みの場合はキャッシュから返す）
+
+        Args:
+            text: 名前などの文字列
+
+        Returns:
+            str: 並べ替えキー
+        """
+        cached = self._cache.get(text)
+        if cached is None:
+            cached = self._cache[text] = self._compute(text)
+        return cached
+
+    def _compute(self, text: str) -> str:
+        """
+        並べ替えキーを計算
+        """
+        normalized = unicodedata.normalize("NFKC", text)
+        if self._max_word_length:
+            normalized = self._apply_readings(normalized)
+        secondary = normalized.translate(KATAKANA_TO_HIRAGANA).casefold()
+        primary = "".join(
+            ch
+            for ch in unicodedata.normalize("NFKD", secondary)
+            if not unicodedata.combining(ch)
+        )
+        if primary == secondary:
+            return primary
+        return primary + KEY_SEPARATOR + secondary
+
+    def _apply_readings(self, text: str) -> str:
+        """
+        読み仮名辞書の語を最長一致で読みに置き換える
+        """
+        readings = self.readings
+        parts = []
+        i = 0
+        length = len(text)
+        while i < length:
+            for size in range(min(self._max_word_length, length - i), 0, -1):
+                reading = readings.get(text[i : i + size])
+                if reading is not None:
+                    parts.append(reading)
+                    i += size
+                    break
+            else:
+                parts.append(text[i])
+                i += 1
+        return "".join(parts)
+
+
+_collator: Optional[Collator] = None
+_collator_lock = threading.Lock()
+
+
+def get_collator() -> Collator:
+    """
+    共有のコレーターを取得（未設定の場合は読み仮名辞書なしで作成）
+
+    Returns:
+        Collator: SlackClient と BookmarkGenerator が共有するコレーター
+    """
+    global _collator
+    if _collator is None:
+        with _collator_lock:
+            if _collator is None:
+                _collator = Collator()
+    return _collator
+
+
+def configure_collator(readings_file: Optional[str] = None) -> Collator:
+    """
+    共有のコレーターを設定し直す（キャッシュも破棄される）
+
+    Args:
+        readings_file: 読み仮名辞書ファイル（JSON）のパス（省略時は辞書なし）
+
+    Returns:
+        Collator: 新しい共有のコレーター
+    """
+    global _collator
+    collator = Collator.from_file(readings_file) if readings_file else Collator()
+    with _collator_lock:
+        _collator = collator
+    return collator
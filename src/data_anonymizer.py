@@ -13,13 +13,26 @@ import random
 import string
 import sys
 import logging
-from typing import Dict, List, Tuple, Set, Optional
+from typing import Dict, List, Tuple, Set, Optional, MutableMapping
 from pathlib import Path
-import json
+import sqlite3
+
+from .output_writer import get_output_writer
+from .leak_verifier import LeakHit, LeakVerifier
+from .mapping_store import MappingStore
+from .term_matcher import TermMatcher
 
 # ロギング設定
 logger = logging.getLogger("slack_to_bookmark")
 
+# --verify でディレクトリから検証するファイルのパターン（圧縮ファイルも含む）
+VERIFY_PATTERNS = ["slack_*", "*_guide.html*"]
+
+# 企業名のパターン: 〇〇株式会社、〇〇工業、株式会社〇〇 など（1回の走査で検出する）
+COMPANY_PATTERN = re.compile(
+    r"([^\s<>]+(?:株式会社|興業|工業|商事|産業)|株式会社[^\s<>]+)"
+)
+
 
 class DataAnonymizer:
     """生成ファイル内の機密情報を匿名化するクラス
@@ -35,12 +48,17 @@ class DataAnonymizer:
 
         内部的なマッピングテーブルを初期化し、検出・置換パターンを設定します。
         """
-        # マッピングデータを保持する辞書
-        self.workspace_id_map = {}  # ワークスペースID のマッピング
-        self.user_id_map = {}  # ユーザーID のマッピング
-        self.channel_id_map = {}  # チャンネルID のマッピング
-        self.name_map = {}  # 個人名のマッピング
-        self.company_map = {}  # 企業名のマッピング
+        # マッピングデータを保持する辞書（読み込み後はデータベースのテーブルを参照する）
+        self.workspace_id_map: MutableMapping[str, str] = {}  # ワークスペースID
+        self.user_id_map: MutableMapping[str, str] = {}  # ユーザーID
+        self.channel_id_map: MutableMapping[str, str] = {}  # チャンネルID
+        self.name_map: MutableMapping[str, str] = {}  # 個人名
+        self.company_map: MutableMapping[str, str] = {}  # 企業名
+        self.store: Optional[MappingStore] = None
+
+        # 既知の企業名・個人名を一括置換するオートマトン（マッピングが増えたときだけ作り直す）
+        self._term_matcher: Optional[TermMatcher] = None
+        self._term_matcher_key: Optional[Tuple[int, int, int, int]] = None
 
         # 英語名と日本語名の姓名サンプル（ダミーデータ用）
         self.first_names_en = [
@@ -106,53 +124,88 @@ class DataAnonymizer:
             "テストメディア",
         ]
 
-        # マッピング保存先ファイル
-        self.mapping_file = "anonymizer_mappings.json"
+        # マッピング保存先のデータベースと、初回に取り込む従来のマッピングファイル
+        self.mapping_file = "anonymizer_mappings.db"
+        self.legacy_mapping_file = "anonymizer_mappings.json"
 
-        # 既存のマッピングがあれば読み込む
+        # マッピングのデータベースを開く
         self._load_mappings()
 
         logger.info("DataAnonymizer initialized")
 
     def _load_mappings(self) -> None:
         """
-        既存のマッピングファイルがあれば読み込む
-        """
-        if os.path.exists(self.mapping_file):
-            try:
-                with open(self.mapping_file, "r", encoding="utf-8") as f:
-                    mappings = json.load(f)
-                    self.workspace_id_map = mappings.get("workspace_id_map", {})
-                    self.user_id_map = mappings.get("user_id_map", {})
-                    self.channel_id_map = mappings.get("channel_id_map", {})
-                    self.name_map = mappings.get("name_map", {})
-                    self.company_map = mappings.get("company_map", {})
-                    logger.info(
-                        f"既存のマッピング情報を読み込みました: {len(self.name_map)}個の名前, {len(self.company_map)}個の企業名"
-                    )
-            except Exception as e:
-                logger.error(
-                    f"マッピングファイルの読み込み中にエラーが発生しました: {e}"
-                )
+        マッピングのデータベースを開く（従来のマッピングファイルがあれば初回に取り込む）
+
+        マッピングはすべてを読み込まず、参照した値だけをデータベースから検索します。
+        開けない場合は、この実行の間だけメモリ上のマッピングを使用します。
+        """
+        try:
+            self.store = MappingStore(self.mapping_file, self.legacy_mapping_file)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.error(f"マッピングファイルの読み込み中にエラーが発生しました: {e}")
+            return
+        maps = self.store.maps
+        self.workspace_id_map = maps["workspace_id_map"]
+        self.user_id_map = maps["user_id_map"]
+        self.channel_id_map = maps["channel_id_map"]
+        self.name_map = maps["name_map"]
+        self.company_map = maps["company_map"]
+        logger.info(
+            f"既存のマッピング情報を読み込みました: {len(self.name_map)}個の名前, "
+            f"{len(self.company_map)}個の企業名"
+        )
+
+    def mappings(self) -> Dict[str, MutableMapping[str, str]]:
+        """
+        現在のマッピング（従来のマッピングファイルと同じ形式）を取得
+
+        Returns:
+            Dict[str, MutableMapping[str, str]]: 種類ごとの、元の値からダミーへの辞書
+        """
+        return {
+            "workspace_id_map": self.workspace_id_map,
+            "user_id_map": self.user_id_map,
+            "channel_id_map": self.channel_id_map,
+            "name_map": self.name_map,
+            "company_map": self.company_map,
+        }
+
+    def verify_files(self, file_paths: List[str]) -> List[LeakHit]:
+        """
+        匿名化後のファイルに、マッピングに記録された元の値が残っていないかを検証
+
+        Args:
+            file_paths: 検証するファイルのパス（圧縮ファイルも可）
+
+        Returns:
+            List[LeakHit]: 検出した元の値とその位置（空なら検証成功）
+        """
+        return LeakVerifier.from_mappings(self.mappings()).verify(file_paths)
 
     def _save_mappings(self) -> None:
         """
-        現在のマッピングをファイルに保存
+        前回の保存以降に追加したマッピングをデータベースにまとめて保存
         """
+        if self.store is None:
+            return
         try:
-            mappings = {
-                "workspace_id_map": self.workspace_id_map,
-                "user_id_map": self.user_id_map,
-                "channel_id_map": self.channel_id_map,
-                "name_map": self.name_map,
-                "company_map": self.company_map,
-            }
-            with open(self.mapping_file, "w", encoding="utf-8") as f:
-                json.dump(mappings, f, ensure_ascii=False, indent=2)
-            logger.info(f"マッピング情報を保存しました: {self.mapping_file}")
-        except Exception as e:
+            count = self.store.flush()
+            if count:
+                logger.info(
+                    f"マッピング情報を保存しました: {self.mapping_file}（{count}件追加）"
+                )
+        except sqlite3.Error as e:
             logger.error(f"マッピング情報の保存中にエラーが発生しました: {e}")
 
+    def close(self) -> None:
+        """
+        マッピングのデータベースを閉じる
+        """
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
     def _generate_dummy_workspace_id(self) -> str:
         """
         ダミーのワークスペースIDを生成
@@ -351,27 +404,37 @@ class DataAnonymizer:
         Returns:
             str: 企業名が匿名化された文字列
         """
-        # 企業名のパターン: 〇〇株式会社、〇〇工業、など
-        company_patterns = [
-            r"([^\s<>]+株式会社)",
-            r"([^\s<>]+興業)",
-            r"([^\s<>]+工業)",
-            r"([^\s<>]+商事)",
-            r"([^\s<>]+産業)",
-            r"(株式会社[^\s<>]+)",
-        ]
 
-        for pattern in company_patterns:
+        def replace_company(match):
+            company_name = match.group(1)
+            if company_name not in self.company_map:
+                self.company_map[company_name] = self._generate_dummy_company_name()
+            return self.company_map[company_name]
 
-            def replace_company(match):
-                company_name = match.group(1)
-                if company_name not in self.company_map:
-                    self.company_map[company_name] = self._generate_dummy_company_name()
-                return self.company_map[company_name]
+        # すべてのパターンを1回の走査で置換する（置換後のダミーの企業名が
+        # 別のパターンに一致して再び置換されることもない）
+        return COMPANY_PATTERN.sub(replace_company, content)
 
-            content = re.sub(pattern, replace_company, content)
+    def _sensitive_terms(self) -> TermMatcher:
+        """
+        既知の企業名・個人名を一括置換するオートマトンを取得
 
-        return content
+        マッピングには追加しか行われないため、辞書の件数が変わったときだけ
+        オートマトンを作り直します。同じ語句が両方にある場合は企業名の置換を優先します。
+
+        Returns:
+            TermMatcher: 企業名・個人名とダミーデータのオートマトン
+        """
+        key = (
+            id(self.company_map),
+            len(self.company_map),
+            id(self.name_map),
+            len(self.name_map),
+        )
+        if self._term_matcher is None or self._term_matcher_key != key:
+            self._term_matcher = TermMatcher({**self.name_map, **self.company_map})
+            self._term_matcher_key = key
+        return self._term_matcher
 
     def _anonymize_channel_names(self, content: str) -> str:
         """
@@ -385,16 +448,15 @@ class DataAnonymizer:
         """
         # チャンネル名のパターン: >#project-name や >🔒 #private-channel など
         channel_pattern = r">(\🔒 )?#([^<]+)<"
+        sensitive_terms = self._sensitive_terms()
 
         def replace_channel_name(match):
             lock = match.group(1) if match.group(1) else ""
             channel_name = match.group(2)
 
             # 企業名などが含まれるチャンネル名は特別処理
-            # まず企業名を検出して置換
-            for company, dummy in self.company_map.items():
-                if company in channel_name:
-                    channel_name = channel_name.replace(company, dummy)
+            # まず既知の企業名・個人名を1回の走査で検出して置換
+            channel_name = sensitive_terms.replace(channel_name)
 
             # チャンネル名パターンとして保存
             channel_parts = channel_name.split("-")
@@ -426,7 +488,8 @@ class DataAnonymizer:
             FileNotFoundError: 指定されたファイルが存在しない場合
             IOError: ファイル読み込み/書き込みエラーの場合
         """
-        if not os.path.exists(file_path):
+        writer = get_output_writer()
+        if not writer.exists(file_path):
             err_msg = f"ファイルが見つかりません: {file_path}"
             logger.error(err_msg)
             raise FileNotFoundError(err_msg)
@@ -435,8 +498,7 @@ class DataAnonymizer:
             output_path = file_path
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = writer.read_text(file_path)
 
             # 各種情報を匿名化
             content = self._anonymize_workspace_id(content)
@@ -446,8 +508,7 @@ class DataAnonymizer:
             content = self._anonymize_channel_names(content)
 
             # 結果を保存
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            writer.write_text(output_path, content)
 
             # マッピング情報を保存
             self._save_mappings()
@@ -518,12 +579,37 @@ def main():
         default=".",
         help="処理対象のディレクトリ（デフォルト: カレントディレクトリ）",
     )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="匿名化は行わず、ファイルにマッピングの元の値が残っていないかを検証する"
+        "（残っていれば位置を表示して終了コード1で終了）",
+    )
 
     args = parser.parse_args()
 
     # 匿名化処理の実行
     anonymizer = DataAnonymizer()
 
+    if args.verify:
+        # 匿名化済みのファイルを検証
+        if args.file:
+            file_paths = [args.file]
+        else:
+            file_paths = sorted(
+                str(path)
+                for pattern in VERIFY_PATTERNS
+                for path in Path(args.directory).glob(pattern)
+            )
+        hits = anonymizer.verify_files(file_paths)
+        for hit in hits:
+            print(f"{hit.path}:{hit.offset}: {hit.kind} {hit.term!r}")
+        if hits:
+            print(f"エラー: {len(hits)}件の元の値が残っています")
+            return 1
+        print(f"{len(file_paths)}個のファイルに元の値は含まれていません")
+        return 0
+
     if args.file:
         # 特定のファイルを処理
         try:
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Export Manifest Module - 前回エクスポート内容の記録と差分検出を担当するモジュール
+
+このモジュールは、前回のエクスポートで出力したチャンネル・ユーザーの
+ID・表示名・ハッシュをコンパクトなマニフェストファイルに保存し、
+今回のエクスポートとの差分（追加・名前変更・アーカイブ）を検出します。
+また、出力ファイルごとの内容ハッシュを保持し、内容が変わっていない
+ファイルの再書き込みを省略できるようにします。
+"""
+
+import hashlib
+import json
+import logging
+from typing import List, Dict, Any, Tuple, Iterable
+
+from .output_writer import get_output_writer
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# マニフェストで管理するレコードの種類
+RECORD_KINDS = ("channels", "users")
+
+
+def entry_hash(title: str, url: str) -> str:
+    """
+    ブックマークエントリ1件のハッシュを計算
+
+    Args:
+        title: 表示名
+        url: URL
+
+    Returns:
+        str: 16文字の16進数ハッシュ
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(title.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(url.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def content_digest(parts: Iterable[Tuple[str, str]]) -> str:
+    """
+    出力ファイルの内容を表すハッシュを計算
+
+    生成日時などの実行ごとに変わる値を含めないよう、HTML全体ではなく
+    (表示名, URL) の並びからハッシュを計算します。
+
+    Args:
+        parts: (表示名, URL) の並び
+
+    Returns:
+        str: 16進数ハッシュ
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for title, url in parts:
+        digest.update(title.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(url.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class ExportManifest:
+    """前回エクスポートのマニフェストを管理するクラス
+
+    マニフェストは次の形式のJSONファイルとして保存されます::
+
+        {
+          "channels": {"C123": ["#general", "<hash>"]},
+          "users": {"U123": ["山田 太郎", "<hash>"]},
+          "files": {"slack_all_channels.html": "<digest>"}
+        }
+    """
+
+    def __init__(self, manifest_file: str = "slack_export_manifest.json"):
+        """
+        ExportManifestの初期化
+
+        Args:
+            manifest_file: マニフェストファイルのパス（相対パスは出力先ディレクトリからのパス）
+        """
+        self.manifest_file = manifest_file
+        self.records: Dict[str, Dict[str, List[str]]] = {
+            kind: {} for kind in RECORD_KINDS
+        }
+        self.files: Dict[str, str] = {}
+        self.load()
+
+    def load(self) -> None:
+        """
+        マニフェストファイルがあれば読み込む
+        """
+        writer = get_output_writer()
+        if not writer.exists(self.manifest_file, compress=False):
+            return
+        try:
+            data = json.loads(writer.read_text(self.manifest_file, compress=False))
+            for kind in RECORD_KINDS:
+                self.records[kind] = data.get(kind, {})
+            self.files = data.get("files", {})
+            logger.info(
+                f"前回のエクスポート情報を読み込みました: "
+                f"{len(self.records['channels'])}チャンネル, {len(self.records['users'])}ユーザー"
+            )
+        except Exception as e:
+            logger.error(f"マニフェストファイルの読み込み中にエラーが発生しました: {e}")
+
+    def save(self) -> None:
+        """
+        現在のマニフェストをファイルに保存
+        """
+        try:
+            data: Dict[str, Any] = dict(self.records)
+            data["files"] = self.files
+            get_output_writer().write_text(
+                self.manifest_file,
+                json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+                compress=False,
+            )
+            logger.info(f"マニフェストを保存しました: {self.manifest_file}")
+        except Exception as e:
+            logger.error(f"マニフェストの保存中にエラーが発生しました: {e}")
+
+    def diff(
+        self, kind: str, entries: Iterable[Tuple[str, str, str, bool]]
+    ) -> Dict[str, List[Dict[str, str]]]:
+        """
+        前回のエクスポートとの差分を検出し、マニフェストを今回の内容に更新
+
+        Args:
+            kind: レコードの種類（"channels" または "users"）
+            entries: (ID, 表示名, URL, アーカイブ済みか) の並び
+
+        Returns:
+            Dict[str, List[Dict[str, str]]]: "added"、"renamed"、"archived" ごとの変更一覧
+        """
+        previous = self.records[kind]
+        current: Dict[str, List[str]] = {}
+        changes: Dict[str, List[Dict[str, str]]] = {
+            "added": [],
+            "renamed": [],
+            "archived": [],
+        }
+
+        for record_id, title, url, is_archived in entries:
+            if is_archived:
+                continue
+            digest = entry_hash(title, url)
+            current[record_id] = [title, digest]
+
+            old = previous.get(record_id)
+            if old is None:
+                changes["added"].append({"id": record_id, "name": title, "url": url})
+            elif old[1] != digest:
+                changes["renamed"].append(
+                    {"id": record_id, "old_name": old[0], "name": title, "url": url}
+                )
+
+        # 今回のエクスポートに含まれないものはアーカイブ（または削除）扱い
+        for record_id, (title, _) in previous.items():
+            if record_id not in current:
+                changes["archived"].append({"id": record_id, "name": title})
+
+        self.records[kind] = current
+        return changes
+
+    def is_file_unchanged(self, output_file: str, digest: str) -> bool:
+        """
+        出力ファイルの内容が前回から変わっていないかを判定
+
+        Args:
+            output_file: 出力ファイル名
+            digest: 今回の内容ハッシュ（content_digestで計算）
+
+        Returns:
+            bool: ファイルが存在し、内容ハッシュが前回と同じ場合はTrue
+        """
+        return self.files.get(output_file) == digest and get_output_writer().exists(
+            output_file
+        )
+
+    def record_file(self, output_file: str, digest: str) -> None:
+        """
+        出力ファイルの内容ハッシュを記録
+
+        Args:
+            output_file: 出力ファイルのパス
+            digest: 内容ハッシュ
+        """
+        self.files[output_file] = digest
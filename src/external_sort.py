@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+External Sort Module - メモリ使用量を抑えたユーザー・チャンネルの並べ替えを担当するモジュール
+
+数十万〜数百万件のユーザーを持つワークスペースでは、全件をメモリ上の
+リストに保持して並べ替えると、小さなCIランナーではメモリが不足します。
+このモジュールは、取得したページごとにソートキーを一度だけ計算して
+並べ替え、保持件数が上限を超えたらソート済みの「ラン」を一時ファイルに
+書き出し、最後に heapq.merge でk-wayマージしながら順に取り出す
+外部マージソートを提供します。
+"""
+
+import heapq
+import json
+import logging
+import os
+import tempfile
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson は任意の依存パッケージ
+    orjson = None
+
+from .collation import get_collator
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# メモリ上に保持する件数の上限の既定値
+DEFAULT_MAX_ITEMS_IN_MEMORY = 100000
+
+_first = itemgetter(0)
+_second = itemgetter(1)
+
+# ランの1行をJSONに変換するエンコーダー（呼び出しごとの生成を避けるため使い回す）
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _dump_line(pair: Tuple[Any, Any]) -> bytes:
+    """
+    (キー, 要素) をランの1行（JSON）に変換（orjson があれば orjson を使用）
+    """
+    if orjson is not None:
+        return orjson.dumps(pair) + b"\n"
+    return (_encoder.encode(pair) + "\n").encode("utf-8")
+
+
+def _load_line(line: bytes) -> Tuple[Any, Any]:
+    """
+    ランの1行を (キー, 要素) に戻す
+    """
+    if orjson is not None:
+        return tuple(orjson.loads(line))
+    return tuple(json.loads(line))
+
+
+def user_sort_key(user: Dict[str, Any]) -> str:
+    """
+    ユーザーの並べ替えに使うキー（表示名、なければ実名の照合キー）
+
+    照合キーは共有のコレーターで1つの名前につき1回だけ計算されます。
+
+    Args:
+        user: Slack APIから取得したユーザー情報
+
+    Returns:
+        str: ソートキー
+    """
+    profile = user.get("profile") or {}
+    return get_collator().key(
+        profile.get("display_name") or profile.get("real_name") or ""
+    )
+
+
+def channel_sort_key(channel: Dict[str, Any]) -> str:
+    """
+    チャンネルの並べ替えに使うキー（チャンネル名の照合キー）
+
+    Args:
+        channel: Slack APIから取得したチャンネル情報
+
+    Returns:
+        str: ソートキー
+    """
+    return get_collator().key(channel["name"])
+
+
+class ExternalSorter:
+    """メモリ使用量の上限付きで並べ替えを行うソーター
+
+    add でページ単位に要素を追加し、反復すると並べ替え済みの要素を
+    順に返します。保持件数が max_items_in_memory を超えた時点で、
+    メモリ上の要素をソート済みのランとして一時ファイル（JSON Lines）に
+    書き出します。要素はJSONに変換できる必要があります。
+    キーが等しい要素は追加した順序を保ちます（安定ソート）。
+
+    反復は何度でも行えます。一時ファイルは close を呼ぶか、
+    with ブロックを抜けたときに削除されます。
+    """
+
+    def __init__(
+        self,
+        key: Callable[[Any], Any],
+        max_items_in_memory: int = DEFAULT_MAX_ITEMS_IN_MEMORY,
+        temp_dir: Optional[str] = None,
+    ):
+        """
+        ExternalSorterの初期化
+
+        Args:
+            key: ソートキーを求める関数（キーはJSONに変換できる値）
+            max_items_in_memory: メモリ上に保持する要素数の上限
+            temp_dir: ランを書き出す一時ディレクトリ（省略時はシステムの既定）
+
+        Raises:
+            ValueError: max_items_in_memoryが1未満の場合
+        """
+        if max_items_in_memory < 1:
+            raise ValueError("max_items_in_memory は1以上である必要があります")
+        self.key = key
+        self.max_items_in_memory = max_items_in_memory
+        self.temp_dir = temp_dir
+        self._buffer: List[Tuple[Any, Any]] = []
+        self._buffer_sorted = True
+        self.run_files: List[str] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add(self, items: Iterable[Any]) -> None:
+        """
+        要素（1ページ分など）を追加
+
+        ソートキーは要素ごとに一度だけ計算し、ページ単位で並べ替えてから
+        保持します。保持件数が上限を超えた場合はランを書き出します。
+
+        Args:
+            items: 追加する要素
+        """
+        key = self.key
+        page = [(key(item), item) for item in items]
+        if not page:
+            return
+        page.sort(key=_first)
+        self._buffer.extend(page)
+        self._buffer_sorted = len(self._buffer) == len(page)
+        self._count += len(page)
+        if len(self._buffer) > self.max_items_in_memory:
+            self._spill()
+
+    def _sort_buffer(self) -> None:
+        """
+        メモリ上の要素を並べ替える
+
+        ページ単位でソート済みのため、Timsortはページ同士のマージとして動作します。
+        """
+        if not self._buffer_sorted:
+            self._buffer.sort(key=_first)
+            self._buffer_sorted = True
+
+    def _spill(self) -> None:
+        """
+        メモリ上の要素をソート済みのランとして一時ファイルに書き出す
+        """
+        self._sort_buffer()
+        fd, path = tempfile.mkstemp(
+            prefix="slack_sort_", suffix=".jsonl", dir=self.temp_dir
+        )
+        with os.fdopen(fd, "wb") as f:
+            f.writelines(map(_dump_line, self._buffer))
+        self.run_files.append(path)
+        logger.debug(
+            f"ソート済みのランを書き出しました: {path} ({len(self._buffer)}件)"
+        )
+        self._buffer = []
+        self._buffer_sorted = True
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Tuple[Any, Any]]:
+        """
+        一時ファイルからランを1行ずつ読み込む
+        """
+        with open(path, "rb") as f:
+            yield from map(_load_line, f)
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        並べ替え済みの要素を順に返す
+
+        ランがない場合はメモリ上で並べ替え、ランがある場合は
+        すべてのランとメモリ上の残りを heapq.merge でマージします。
+        """
+        self._sort_buffer()
+        if not self.run_files:
+            return map(_second, self._buffer)
+        runs = [self._read_run(path) for path in self.run_files]
+        runs.append(iter(self._buffer))
+        return map(_second, heapq.merge(*runs, key=_first))
+
+    def close(self) -> None:
+        """
+        一時ファイルを削除し、保持している要素を破棄する
+        """
+        for path in self.run_files:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"一時ファイルの削除に失敗しました: {path} ({e})")
+        self.run_files = []
+        self._buffer = []
+        self._count = 0
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Firefox Bookmarks Module - Firefoxプロファイルの places.sqlite への直接書き込みを担当するモジュール
+
+Firefoxでは Netscape HTML のインポートしかできず、大きなフォルダでは
+インポートが遅いうえ、インポートのたびにブックマークが重複します。
+このモジュールは、Firefoxプロファイルの ``places.sqlite``（またはそのコピー）に
+Slackのチャンネル・DMブックマークを直接マージします。
+
+- 同期全体を1つのトランザクションで実行し、追加・名前変更・削除・並べ替えは
+  それぞれ1つのプリペアドステートメントを executemany で一括実行します。
+- URLは Firefox と同じ url_hash を計算し、一時テーブルと moz_places の
+  url_hash インデックスによる結合で既存の履歴・ブックマークと重複しないようにします。
+- フォルダ内の既存ブックマークはURLで索引化するため、何度同期しても
+  フォルダやブックマークは重複しません。
+"""
+
+import base64
+import glob
+import logging
+import os
+import platform
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# ブックマークの種別（moz_bookmarks.type）
+TYPE_BOOKMARK = 1
+TYPE_FOLDER = 2
+
+# フォルダを作成できるルートフォルダのGUID
+ROOT_GUIDS = {
+    "toolbar": "toolbar_____",
+    "menu": "menu________",
+    "unfiled": "unfiled_____",
+}
+
+# 同期状態（Firefox Sync に新規として扱わせる）
+SYNC_STATUS_NEW = 1
+
+# url_hash の計算に使うURLの最大文字数と、スキームを探す範囲
+MAX_CHARS_TO_HASH = 1500
+MAX_SCHEME_LENGTH = 50
+
+_GOLDEN_RATIO_U32 = 0x9E3779B9
+
+
+def _hash_string(data: bytes) -> int:
+    """
+    mozilla::HashString と同じ32ビットハッシュを計算
+    """
+    hash_value = 0
+    for byte in data:
+        rotated = ((hash_value << 5) | (hash_value >> 27)) & 0xFFFFFFFF
+        hash_value = (_GOLDEN_RATIO_U32 * (rotated ^ byte)) & 0xFFFFFFFF
+    return hash_value
+
+
+def url_hash(url: str) -> int:
+    """
+    Firefox の SQL関数 hash(url) と同じ url_hash を計算
+
+    スキームを含むURLは、上位16ビットにスキームのハッシュ、
+    下位32ビットにURL全体のハッシュを持つ48ビットの値になります。
+
+    Args:
+        url: URL
+
+    Returns:
+        int: moz_places.url_hash の値
+    """
+    data = url.encode("utf-8")[:MAX_CHARS_TO_HASH]
+    scheme_end = data.find(b":", 0, MAX_SCHEME_LENGTH)
+    if scheme_end == -1:
+        return _hash_string(data)
+    return ((_hash_string(data[:scheme_end]) & 0xFFFF) << 32) + _hash_string(data)
+
+
+def reversed_host(url: str) -> str:
+    """
+    moz_places.rev_host の値（ホスト名を逆順にして末尾に '.' を付けたもの）を作成
+    """
+    host = urlsplit(url).hostname or ""
+    return host[::-1] + "."
+
+
+def new_guid() -> str:
+    """
+    Firefox のブックマーク・履歴と同じ形式（12文字のURLセーフBase64）のGUIDを作成
+    """
+    return base64.urlsafe_b64encode(os.urandom(9)).decode("ascii")
+
+
+def prtime() -> int:
+    """
+    Firefox のタイムスタンプ（1970-01-01 からのマイクロ秒）を取得
+    """
+    return int(time.time() * 1000000)
+
+
+def default_places_path() -> str:
+    """
+    実行環境に応じたFirefoxのプロファイルの places.sqlite のパスを返す
+
+    複数のプロファイルがある場合は、最近更新されたものを選びます。
+
+    Returns:
+        str: places.sqlite のパス（見つからない場合は既定のプロファイルを想定したパス）
+    """
+    system = platform.system()
+    home = os.path.expanduser("~")
+    if system == "Darwin":
+        base = os.path.join(
+            home, "Library", "Application Support", "Firefox", "Profiles"
+        )
+    elif system == "Windows":
+        app_data = os.getenv("APPDATA", os.path.join(home, "AppData", "Roaming"))
+        base = os.path.join(app_data, "Mozilla", "Firefox", "Profiles")
+    else:
+        base = os.path.join(home, ".mozilla", "firefox")
+    candidates = glob.glob(os.path.join(base, "*", "places.sqlite"))
+    if not candidates:
+        return os.path.join(base, "default-release", "places.sqlite")
+    return max(candidates, key=os.path.getmtime)
+
+
+class FirefoxPlacesWriter:
+    """Firefoxプロファイルの places.sqlite へブックマークをマージするクラス
+
+    指定されたルートフォルダ（既定はブックマークツールバー）の直下に
+    「Slack」「Slack Users」フォルダを作成・更新します。
+
+    Note:
+        Firefoxの起動中は places.sqlite がロックされているため書き込めません。
+        同期はFirefoxを終了した状態で実行するか、コピーに対して実行してください。
+        フレセンシーなど Firefox が実行時に管理する値は、次回起動時に Firefox が
+        再計算します。
+    """
+
+    def __init__(self, places_file: str, parent_root: str = "toolbar"):
+        """
+        FirefoxPlacesWriterの初期化
+
+        Args:
+            places_file: Firefoxプロファイル内の places.sqlite のパス
+            parent_root: フォルダを作成するルート（"toolbar" / "menu" / "unfiled"）
+
+        Raises:
+            ValueError: 不正なルート名が指定された場合
+        """
+        if parent_root not in ROOT_GUIDS:
+            raise ValueError(
+                "parent_root は 'toolbar'、'menu'、'unfiled' のいずれかである必要があります"
+            )
+        self.places_file = places_file
+        self.parent_root = parent_root
+        logger.info(f"FirefoxPlacesWriter initialized: {places_file}")
+
+    def sync(
+        self,
+        channel_entries: List[Tuple[str, str]],
+        user_entries: Optional[List[Tuple[str, str]]] = None,
+        channel_folder: str = "Slack",
+        user_folder: str = "Slack Users",
+    ) -> Dict[str, int]:
+        """
+        チャンネルとDMのブックマークを places.sqlite に1つのトランザクションでマージ
+
+        Args:
+            channel_entries: BookmarkGenerator.build_channel_entries で作成した (表示名, URL) のリスト
+            user_entries: BookmarkGenerator.build_user_entries で作成した (表示名, URL) のリスト
+            channel_folder: チャンネル用フォルダ名
+            user_folder: ユーザーDM用フォルダ名
+
+        Returns:
+            Dict[str, int]: 追加・名前変更・削除したブックマーク数
+
+        Raises:
+            FileNotFoundError: places.sqlite が存在しない場合
+            sqlite3.Error: 書き込みに失敗した場合（Firefoxの起動中など。変更はロールバックされる）
+        """
+        if not os.path.exists(self.places_file):
+            raise FileNotFoundError(
+                f"places.sqlite が見つかりません: {self.places_file}"
+                "（Firefoxを一度起動してプロファイルを作成してください）"
+            )
+
+        folders = [(channel_folder, channel_entries)]
+        if user_entries is not None:
+            folders.append((user_folder, user_entries))
+
+        stats = {"added": 0, "renamed": 0, "removed": 0}
+        conn = sqlite3.connect(self.places_file, isolation_level=None, timeout=5)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._prepare(conn)
+                for folder_name, entries in folders:
+                    folder_stats = self.merge_folder(conn, folder_name, entries)
+                    for key, value in folder_stats.items():
+                        stats[key] += value
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+        logger.info(
+            f"Firefoxブックマークを同期しました: 追加={stats['added']}, "
+            f"名前変更={stats['renamed']}, 削除={stats['removed']}"
+        )
+        return stats
+
+    def _prepare(self, conn: sqlite3.Connection) -> None:
+        """
+        同期に使う一時テーブルを作成し、任意の列・テーブルの有無を確認
+        """
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS slack_entries "
+            "(url TEXT NOT NULL, url_hash INTEGER NOT NULL, title TEXT, "
+            "rev_host TEXT, guid TEXT)"
+        )
+        tables = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        self._has_deleted_table = "moz_bookmarks_deleted" in tables
+        places_columns = {
+            row[1] for row in conn.execute("PRAGMA table_info(moz_places)")
+        }
+        self._has_recalc_frecency = "recalc_frecency" in places_columns
+
+    def merge_folder(
+        self, conn: sqlite3.Connection, folder_name: str, entries: List[Tuple[str, str]]
+    ) -> Dict[str, int]:
+        """
+        1つのフォルダの内容を、指定されたエントリと一致するように更新
+
+        既存のブックマークはURLで索引化し、一致するものは（必要なら名前を変えて）
+        再利用します。エントリに含まれないブックマークは削除されますが、
+        ユーザーが手動で作成したサブフォルダはそのまま残し、エントリの後ろに並べます。
+
+        Args:
+            conn: トランザクション中の接続
+            folder_name: 更新するフォルダ名
+            entries: (表示名, URL) のリスト
+
+        Returns:
+            Dict[str, int]: 追加・名前変更・削除したブックマーク数
+        """
+        now = prtime()
+        folder_id = self._find_or_create_folder(conn, folder_name, now)
+
+        # 既存のブックマークをURLで索引化（重複は削除対象にする）
+        index: Dict[str, Tuple[int, str, int]] = {}
+        duplicates: List[Tuple[int, int]] = []
+        others: List[int] = []
+        for bookmark_id, bookmark_type, title, place_id, url in conn.execute(
+            "SELECT b.id, b.type, b.title, b.fk, p.url FROM moz_bookmarks b "
+            "LEFT JOIN moz_places p ON p.id = b.fk "
+            "WHERE b.parent = ? ORDER BY b.position",
+            (folder_id,),
+        ):
+            if bookmark_type != TYPE_BOOKMARK:
+                others.append(bookmark_id)
+            elif url in index:
+                duplicates.append((bookmark_id, place_id))
+            else:
+                index[url] = (bookmark_id, title, place_id)
+
+        new_entries = []
+        renames = []
+        positions = []
+        for position, (title, url) in enumerate(entries):
+            existing = index.pop(url, None)
+            if existing is None:
+                new_entries.append((position, title, url))
+                continue
+            bookmark_id, old_title, _ = existing
+            if old_title != title:
+                renames.append((title, now, bookmark_id))
+            positions.append((position, bookmark_id))
+
+        removals = duplicates + [
+            (bookmark_id, place_id) for bookmark_id, _, place_id in index.values()
+        ]
+        self._remove_bookmarks(conn, removals, now)
+        self._add_bookmarks(conn, folder_id, new_entries, now)
+        conn.executemany(
+            "UPDATE moz_bookmarks SET title = ?, lastModified = ?, "
+            "syncChangeCounter = syncChangeCounter + 1 WHERE id = ?",
+            renames,
+        )
+        # 残したブックマークとサブフォルダの並び順を更新
+        positions.extend(
+            (len(entries) + offset, bookmark_id)
+            for offset, bookmark_id in enumerate(others)
+        )
+        conn.executemany(
+            "UPDATE moz_bookmarks SET position = ? WHERE id = ? AND position != ?",
+            [(position, bookmark_id, position) for position, bookmark_id in positions],
+        )
+        if new_entries or renames or removals:
+            conn.execute(
+                "UPDATE moz_bookmarks SET lastModified = ?, "
+                "syncChangeCounter = syncChangeCounter + 1 WHERE id = ?",
+                (now, folder_id),
+            )
+
+        return {
+            "added": len(new_entries),
+            "renamed": len(renames),
+            "removed": len(removals),
+        }
+
+    def _find_or_create_folder(
+        self, conn: sqlite3.Connection, folder_name: str, now: int
+    ) -> int:
+        """
+        ルートフォルダ直下から指定名のフォルダを探し、なければ作成する
+
+        Returns:
+            int: フォルダの moz_bookmarks.id
+
+        Raises:
+            ValueError: ルートフォルダが見つからない場合（places.sqlite ではないファイルなど）
+        """
+        row = conn.execute(
+            "SELECT id FROM moz_bookmarks WHERE guid = ?",
+            (ROOT_GUIDS[self.parent_root],),
+        ).fetchone()
+        if row is None:
+            raise ValueError(
+                f"ルートフォルダ '{self.parent_root}' が見つかりません: {self.places_file}"
+            )
+        parent_id = row[0]
+
+        row = conn.execute(
+            "SELECT id FROM moz_bookmarks WHERE parent = ? AND type = ? AND title = ? "
+            "ORDER BY position LIMIT 1",
+            (parent_id, TYPE_FOLDER, folder_name),
+        ).fetchone()
+        if row is not None:
+            return row[0]
+
+        cursor = conn.execute(
+            "INSERT INTO moz_bookmarks (type, parent, position, title, dateAdded, "
+            "lastModified, guid, syncStatus, syncChangeCounter) "
+            "VALUES (?, ?, (SELECT COALESCE(MAX(position) + 1, 0) FROM moz_bookmarks "
+            "WHERE parent = ?), ?, ?, ?, ?, ?, 1)",
+            (
+                TYPE_FOLDER,
+                parent_id,
+                parent_id,
+                folder_name,
+                now,
+                now,
+                new_guid(),
+                SYNC_STATUS_NEW,
+            ),
+        )
+        return cursor.lastrowid
+
+    def _add_bookmarks(
+        self,
+        conn: sqlite3.Connection,
+        folder_id: int,
+        new_entries: List[Tuple[int, str, str]],
+        now: int,
+    ) -> None:
+        """
+        ブックマークを一括で追加（moz_places にないURLは url_hash で重複を除いて追加）
+
+        Args:
+            conn: トランザクション中の接続
+            folder_id: 追加先フォルダの moz_bookmarks.id
+            new_entries: (位置, 表示名, URL) のリスト
+            now: 追加日時
+        """
+        if not new_entries:
+            return
+
+        conn.execute("DELETE FROM temp.slack_entries")
+        conn.executemany(
+            "INSERT INTO temp.slack_entries (url, url_hash, title, rev_host, guid) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (url, url_hash(url), title, reversed_host(url), new_guid())
+                for _, title, url in new_entries
+            ],
+        )
+        recalc_column = ", recalc_frecency" if self._has_recalc_frecency else ""
+        recalc_value = ", 1" if self._has_recalc_frecency else ""
+        conn.execute(
+            f"INSERT INTO moz_places (url, url_hash, title, rev_host, guid, hidden"
+            f"{recalc_column}) "
+            f"SELECT e.url, e.url_hash, e.title, e.rev_host, e.guid, 0{recalc_value} "
+            "FROM temp.slack_entries e WHERE NOT EXISTS ("
+            "SELECT 1 FROM moz_places p WHERE p.url_hash = e.url_hash AND p.url = e.url)"
+        )
+        place_ids = dict(
+            conn.execute(
+                "SELECT e.url, p.id FROM temp.slack_entries e "
+                "JOIN moz_places p ON p.url_hash = e.url_hash AND p.url = e.url"
+            )
+        )
+
+        conn.executemany(
+            "INSERT INTO moz_bookmarks (type, fk, parent, position, title, dateAdded, "
+            "lastModified, guid, syncStatus, syncChangeCounter) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
+            [
+                (
+                    TYPE_BOOKMARK,
+                    place_ids[url],
+                    folder_id,
+                    position,
+                    title,
+                    now,
+                    now,
+                    new_guid(),
+                    SYNC_STATUS_NEW,
+                )
+                for position, title, url in new_entries
+            ],
+        )
+        # ブックマークからの参照数（Firefoxの実行時トリガーが管理する値）を更新
+        conn.executemany(
+            "UPDATE moz_places SET foreign_count = foreign_count + 1 WHERE id = ?",
+            [(place_ids[url],) for _, _, url in new_entries],
+        )
+
+    def _remove_bookmarks(
+        self, conn: sqlite3.Connection, removals: List[Tuple[int, int]], now: int
+    ) -> None:
+        """
+        ブックマークを一括で削除
+
+        Args:
+            conn: トランザクション中の接続
+            removals: (moz_bookmarks.id, moz_places.id) のリスト
+            now: 削除日時
+        """
+        if not removals:
+            return
+        if self._has_deleted_table:
+            # Firefox Sync が他の端末からも削除できるよう記録する
+            conn.executemany(
+                "INSERT OR REPLACE INTO moz_bookmarks_deleted (guid, dateRemoved) "
+                "SELECT guid, ? FROM moz_bookmarks WHERE id = ?",
+                [(now, bookmark_id) for bookmark_id, _ in removals],
+            )
+        conn.executemany(
+            "DELETE FROM moz_bookmarks WHERE id = ?",
+            [(bookmark_id,) for bookmark_id, _ in removals],
+        )
+        conn.executemany(
+            "UPDATE moz_places SET foreign_count = MAX(foreign_count - 1, 0) WHERE id = ?",
+            [(place_id,) for _, place_id in removals],
+        )
@@ -10,6 +10,9 @@ Guide Generator Module - ブックマークインポート手順のガイドペ
 
 import platform
 import logging
+from typing import List, Union
+
+from .output_writer import get_output_writer
 
 # ロギング設定
 logger = logging.getLogger("slack_to_bookmark")
@@ -35,31 +38,22 @@ class GuideGenerator:
         self.is_windows = platform.system() == "Windows"
         logger.info(f"GuideGenerator initialized for {platform.system()}")
 
-    def create_guide(
+    def render_guide(
         self,
-        html_file_path: str,
-        output_file: str,
+        html_file_path: Union[str, List[str]],
         is_public_only: bool = False,
         is_user_dm: bool = False,
     ) -> str:
         """
-        ブックマークインポート手順ページを生成
-
-        生成されたブックマークファイルをChromeブラウザにインポートする手順を
-        説明するHTMLガイドページを生成します。ブックマークの種類（全チャンネル、
-        公開チャンネルのみ、ユーザーDM）に応じて内容を調整します。
+        ブックマークインポート手順ページの内容（HTML）を作成
 
         Args:
-            html_file_path: 参照するHTMLファイルのパス
-            output_file: 出力ファイル名（例: 'bookmark_guide.html'）
-            is_public_only: Trueの場合、公開チャンネルのみのガイドを生成
-            is_user_dm: Trueの場合、ユーザーDM用のガイドを生成
+            html_file_path: 参照するHTMLファイルのパスまたはURL（シャード出力の場合はリスト）
+            is_public_only: Trueの場合、公開チャンネルのみのガイドを作成
+            is_user_dm: Trueの場合、ユーザーDM用のガイドを作成
 
         Returns:
-            str: 生成されたガイドファイルのパス、エラー時は空文字列
-
-        Raises:
-            IOError: ファイル書き込みに失敗した場合
+            str: ガイドページのHTML
         """
         # タイトル設定
         if is_user_dm:
@@ -79,6 +73,18 @@ class GuideGenerator:
                 "インポート後、「Slack」フォルダに全チャンネルが追加されます。"
             )
 
+        # インポートするファイル（シャード出力の場合は複数）
+        html_files = (
+            [html_file_path] if isinstance(html_file_path, str) else html_file_path
+        )
+        if len(html_files) > 1:
+            file_step = f"4. 以下の{len(html_files)}個のファイルを1つずつ選択し、手順2〜5を繰り返す:"
+        else:
+            file_step = "4. 以下のファイルを選択:"
+        file_paths = "\n".join(
+            f'        <div class="file-path">{path}</div>' for path in html_files
+        )
+
         # キーボードショートカット（OS別）
         shortcut = "Ctrl+Shift+O" if self.is_windows else "Cmd+Option+B"
 
@@ -93,7 +99,7 @@ class GuideGenerator:
         h1 {{ color: #1264A3; }}
         .steps {{ background: #f5f5f5; padding: 15px; border-radius: 5px; }}
         .step {{ margin: 10px 0; }}
-        .file-path {{ background: #eee; padding: 5px; font-family: monospace; word-break: break-all; border-radius: 3px; }}
+        .file-path {{ background: #eee; padding: 5px; margin: 2px 0; font-family: monospace; word-break: break-all; border-radius: 3px; }}
         .note {{ background: #fffde7; padding: 10px; margin-top: 20px; border-radius: 5px; }}
         button {{ background: #1264A3; color: white; border: none; padding: 8px 16px; 
                  margin-top: 20px; border-radius: 4px; cursor: pointer; }}
@@ -107,8 +113,8 @@ class GuideGenerator:
         <div class="step">1. Chromeでブックマークマネージャーを開く: <strong>{shortcut}</strong></div>
         <div class="step">2. 右上の「...」をクリックし、「ブックマークをインポート」を選択</div>
         <div class="step">3. 「HTMLファイルから」を選択し、ファイルを選択する</div>
-        <div class="step">4. 以下のファイルを選択:</div>
-        <div class="file-path">{html_file_path}</div>
+        <div class="step">{file_step}</div>
+{file_paths}
         <div class="step">5. 「開く」をクリックしてインポート</div>
     </div>
     
@@ -121,11 +127,41 @@ class GuideGenerator:
 </body>
 </html>
 """
+        return html
+
+    def create_guide(
+        self,
+        html_file_path: Union[str, List[str]],
+        output_file: str,
+        is_public_only: bool = False,
+        is_user_dm: bool = False,
+    ) -> str:
+        """
+        ブックマークインポート手順ページを生成
+
+        生成されたブックマークファイルをChromeブラウザにインポートする手順を
+        説明するHTMLガイドページを生成します。ブックマークの種類（全チャンネル、
+        公開チャンネルのみ、ユーザーDM）に応じて内容を調整します。
+        ブックマークが複数のファイル（シャード）に分割されている場合は、
+        すべてのファイルを一覧表示します。
+
+        Args:
+            html_file_path: 参照するHTMLファイルのパス（シャード出力の場合はパスのリスト）
+            output_file: 出力ファイル名（例: 'bookmark_guide.html'）
+            is_public_only: Trueの場合、公開チャンネルのみのガイドを生成
+            is_user_dm: Trueの場合、ユーザーDM用のガイドを生成
+
+        Returns:
+            str: 生成されたガイドファイルのパス、エラー時は空文字列
+
+        Raises:
+            IOError: ファイル書き込みに失敗した場合
+        """
+        html = self.render_guide(html_file_path, is_public_only, is_user_dm)
 
         # ファイルに保存
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(html)
+            get_output_writer().write_text(output_file, html)
             logger.info(f"ガイドページを生成しました: {output_file}")
             return output_file
         except Exception as e:
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+HTTP Transport Module - Slack APIとの通信に使うHTTP接続プールを担当するモジュール
+
+slack_sdk の WebClient は標準では urllib でリクエストごとに新しい接続を
+開くため、数百ページに及ぶ users.list / conversations.list の取得では
+ページごとにTCP（およびTLS）のハンドシェイクが発生します。
+このモジュールは、ホストごとに keep-alive 接続を再利用する接続プールと、
+それを使う WebClient のサブクラスを提供します。
+"""
+
+import gzip
+import http.client
+import io
+import logging
+import queue
+import ssl
+import threading
+import zlib
+from typing import Dict, Optional, Tuple, Union
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import Request
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackRequestError
+from slack_sdk.web.slack_response import SlackResponse
+
+from .response_decoder import ResponseDecoder
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# 再利用した接続が既にサーバー側で閉じられていた場合に発生する例外
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+PoolKey = Tuple[str, str, Optional[int]]
+Connection = Union[http.client.HTTPConnection, http.client.HTTPSConnection]
+
+
+class PooledTransport:
+    """keep-alive 接続を再利用するHTTPトランスポート
+
+    接続は (スキーム, ホスト, ポート) ごとにプールされ、1回の実行の中で
+    すべてのAPI呼び出しから共有されます。リクエストには
+    ``Accept-Encoding: gzip`` を付与し、圧縮されたレスポンスは展開して返します。
+    スレッドセーフで、同時に使用中の接続がプールサイズを超えた場合は
+    一時的な接続を作成し、使用後に閉じます。
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 4,
+        timeout: float = 30,
+        gzip_enabled: bool = True,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        """
+        PooledTransportの初期化
+
+        Args:
+            pool_size: ホストごとに保持するアイドル接続の最大数
+            timeout: 接続と読み込みのタイムアウト（秒）
+            gzip_enabled: gzip圧縮されたレスポンスを要求するかどうか
+            ssl_context: HTTPS接続に使うSSLコンテキスト（省略時は既定のコンテキスト）
+
+        Raises:
+            ValueError: pool_sizeが1未満の場合
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size は1以上である必要があります")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.gzip_enabled = gzip_enabled
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._pools: Dict[PoolKey, "queue.LifoQueue[Connection]"] = {}
+        self._lock = threading.Lock()
+        # 統計情報（ベンチマークとログ用）
+        self.stats = {"requests": 0, "connections": 0, "reused": 0}
+
+    def _pool(self, key: PoolKey) -> "queue.LifoQueue[Connection]":
+        """
+        接続先ごとのアイドル接続プールを取得（なければ作成）
+        """
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = queue.LifoQueue(maxsize=self.pool_size)
+            return pool
+
+    def _connect(self, key: PoolKey) -> Connection:
+        """
+        新しい接続を作成
+        """
+        scheme, host, port = key
+        with self._lock:
+            self.stats["connections"] += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=self.timeout, context=self.ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _acquire(self, key: PoolKey) -> Tuple[Connection, bool]:
+        """
+        アイドル接続を取り出す（なければ新しく作成）
+
+        Returns:
+            Tuple[Connection, bool]: 接続と、それが再利用された接続かどうか
+        """
+        try:
+            return self._pool(key).get_nowait(), True
+        except queue.Empty:
+            return self._connect(key), False
+
+    def _release(self, key: PoolKey, conn: Connection) -> None:
+        """
+        接続をプールに戻す（プールが一杯の場合は閉じる）
+        """
+        try:
+            self._pool(key).put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """
+        HTTPリクエストを送信し、レスポンス全体を読み込む
+
+        再利用した接続がサーバー側で閉じられていた場合は、新しい接続で
+        1回だけ再送します。
+
+        Args:
+            method: HTTPメソッド
+            url: リクエスト先のURL（http または https）
+            body: リクエストボディ
+            headers: リクエストヘッダー
+
+        Returns:
+            Tuple[int, HTTPMessage, bytes]: ステータスコード、レスポンスヘッダー、展開済みのボディ
+
+        Raises:
+            ValueError: http/https 以外のURLが指定された場合
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"サポートされていないURLです: {url}")
+        key: PoolKey = (parts.scheme, parts.hostname or "", parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        request_headers = dict(headers or {})
+        request_headers["Connection"] = "keep-alive"
+        if self.gzip_enabled:
+            request_headers["Accept-Encoding"] = "gzip"
+
+        conn, reused = self._acquire(key)
+        try:
+            try:
+                response = self._send(conn, method, path, body, request_headers)
+            except STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                # サーバー側でタイムアウトした接続は作り直して再送する
+                conn.close()
+                conn, reused = self._connect(key), False
+                response = self._send(conn, method, path, body, request_headers)
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+
+        with self._lock:
+            self.stats["requests"] += 1
+            if reused:
+                self.stats["reused"] += 1
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        encoding = (response.getheader("Content-Encoding") or "").lower()
+        if encoding == "gzip":
+            data = gzip.decompress(data)
+        elif encoding == "deflate":
+            data = zlib.decompress(data)
+        return response.status, response.msg, data
+
+    @staticmethod
+    def _send(
+        conn: Connection,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+    ) -> http.client.HTTPResponse:
+        """
+        1つの接続でリクエストを送信し、レスポンスヘッダーまでを受信
+        """
+        conn.request(method, path, body=body, headers=headers)
+        return conn.getresponse()
+
+    def close(self) -> None:
+        """
+        プール内のすべての接続を閉じる
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+class PooledWebClient(WebClient):
+    """PooledTransport を使ってリクエストを送信する WebClient
+
+    slack_sdk の WebClient のうち、実際にHTTP通信を行う部分だけを
+    PooledTransport に置き換えます。リトライハンドラーやレスポンスの
+    検証、ページネーションなどはすべて WebClient の実装をそのまま使います。
+    decoder を指定した場合は、JSONレスポンスを WebClient の json.loads ではなく
+    ResponseDecoder で生バイト列からデコードします。
+    """
+
+    def __init__(
+        self,
+        token: str,
+        transport: PooledTransport,
+        decoder: Optional[ResponseDecoder] = None,
+        **kwargs,
+    ):
+        """
+        PooledWebClientの初期化
+
+        Args:
+            token: Slack API トークン
+            transport: 共有するHTTPトランスポート
+            decoder: JSONレスポンスのデコーダー（省略時は WebClient 標準のデコード）
+            **kwargs: WebClient に渡すその他の引数
+        """
+        super().__init__(token=token, **kwargs)
+        self.transport = transport
+        self.decoder = decoder
+
+    def _urllib_api_call(self, **kwargs) -> SlackResponse:
+        """
+        API呼び出し結果のJSONを ResponseDecoder でデコードして検証する
+        """
+        response = super()._urllib_api_call(**kwargs)
+        if self.decoder is not None and isinstance(response.data, bytes):
+            content_type = response.headers.get("Content-Type") or ""
+            if content_type.startswith("application/json"):
+                api_method = urlsplit(response.api_url).path.rsplit("/", 1)[-1]
+                response.data = self.decoder.decode(api_method, response.data)
+                response.validate()
+        return response
+
+    def _perform_urllib_http_request_internal(self, url: str, req: Request):
+        """
+        WebClientのHTTP送信処理を PooledTransport で置き換える
+        """
+        if self.proxy is not None:
+            # プロキシ経由の場合は標準の urllib 実装を使う
+            return super()._perform_urllib_http_request_internal(url, req)
+        if not url.lower().startswith("http"):
+            raise SlackRequestError(f"Invalid URL detected: {url}")
+
+        status, headers, data = self.transport.request(
+            req.get_method(), url, req.data, dict(req.header_items())
+        )
+        if status >= 400:
+            # urllib と同様に HTTPError として扱い、WebClient のリトライ処理に任せる
+            raise HTTPError(
+                url,
+                status,
+                http.client.responses.get(status, ""),
+                headers,
+                io.BytesIO(data),
+            )
+        content_type = headers.get_content_type()
+        if content_type == "application/gzip" or (
+            self.decoder is not None and content_type == "application/json"
+        ):
+            # バイナリレスポンス（admin.analytics.getFile など）と、
+            # decoder でデコードするJSONは生バイト列のまま返す
+            return {"status": status, "headers": headers, "body": data}
+        charset = headers.get_content_charset() or "utf-8"
+        return {"status": status, "headers": headers, "body": data.decode(charset)}
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Leak Verifier Module - 匿名化後のファイルに元の値が残っていないことの検証を担当するモジュール
+
+DataAnonymizer のマッピングファイルには、匿名化で置き換えた元の値
+（ワークスペースID、ユーザーID、チャンネルID、個人名、企業名）がすべて記録されています。
+このモジュールは、それらの元の値を1つの正規表現にまとめ、匿名化後の
+ファイルを mmap で走査して、元の値が1つでも残っていればその位置を報告します。
+
+正規表現は元の値（UTF-8のバイト列）のトライの形に組み立てるため、
+語句が数千件あっても、各位置で調べるのは先頭のバイトが一致する分岐だけです。
+走査は正規表現エンジン（C実装）の中で行われ、数百MBのファイルも数秒で検証できます。
+"""
+
+import gzip
+import json
+import logging
+import mmap
+import os
+import re
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from .output_writer import COMPRESSION_SUFFIXES
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard は任意の依存パッケージ
+    zstandard = None
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# マッピングファイルのキーと、報告に使う元の値の種類
+MAPPING_KINDS: Dict[str, str] = {
+    "workspace_id_map": "workspace_id",
+    "user_id_map": "user_id",
+    "channel_id_map": "channel_id",
+    "name_map": "name",
+    "company_map": "company",
+}
+
+# 1ファイルあたりに報告する検出件数の上限
+MAX_HITS_PER_FILE = 100
+
+
+class LeakHit(NamedTuple):
+    """匿名化後のファイルに残っていた元の値"""
+
+    # ファイルのパス
+    path: str
+    # 検出位置（ファイル先頭からのバイト数。圧縮ファイルは展開後の位置）
+    offset: int
+    # 元の値
+    term: str
+    # 元の値の種類（'user_id'、'name' など）
+    kind: str
+
+
+def _trie_pattern(node: Dict[Any, Any]) -> bytes:
+    """
+    バイト列のトライから、同じ語句に一致する正規表現を組み立てる
+
+    同じ節点から分かれる分岐は先頭のバイトがすべて異なるため、
+    正規表現エンジンは各位置で1つの分岐だけを調べます。
+    語句の終わりの節点に続きがある場合は、続きを省略可能（最長一致）にします。
+    """
+    branches = []
+    last_bytes = []
+    for byte in sorted(key for key in node if key is not None):
+        child = node[byte]
+        if len(child) == 1 and None in child:
+            last_bytes.append(re.escape(bytes([byte])))
+        else:
+            branches.append(re.escape(bytes([byte])) + _trie_pattern(child))
+    if last_bytes:
+        branches.append(
+            last_bytes[0]
+            if len(last_bytes) == 1
+            else b"[" + b"".join(last_bytes) + b"]"
+        )
+    pattern = branches[0] if len(branches) == 1 else b"(?:" + b"|".join(branches) + b")"
+    if None in node:
+        pattern = b"(?:" + pattern + b")?"
+    return pattern
+
+
+class LeakVerifier:
+    """匿名化後のファイルに元の値が残っていないかを検証するクラス"""
+
+    def __init__(self, terms: Mapping[str, str]):
+        """
+        LeakVerifierの初期化（元の値から正規表現を作成）
+
+        Args:
+            terms: 元の値とその種類（空文字列は無視する）
+        """
+        self.kinds: Dict[bytes, str] = {
+            term.encode("utf-8"): kind for term, kind in terms.items() if term
+        }
+        self.pattern: Optional["re.Pattern[bytes]"] = None
+        if self.kinds:
+            trie: Dict[Any, Any] = {}
+            for term in self.kinds:
+                node = trie
+                for byte in term:
+                    node = node.setdefault(byte, {})
+                node[None] = True
+            self.pattern = re.compile(_trie_pattern(trie))
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @classmethod
+    def from_mappings(cls, mappings: Mapping[str, Mapping[str, str]]) -> "LeakVerifier":
+        """
+        マッピング（DataAnonymizer のマッピングファイルと同じ形式）から作成
+
+        Args:
+            mappings: "user_id_map" などのキーと、元の値からダミーへの辞書
+
+        Returns:
+            LeakVerifier: すべての元の値を検出する検証器
+        """
+        terms: Dict[str, str] = {}
+        for key, kind in MAPPING_KINDS.items():
+            for term in mappings.get(key) or {}:
+                terms.setdefault(term, kind)
+        return cls(terms)
+
+    @classmethod
+    def from_mapping_file(cls, mapping_file: str) -> "LeakVerifier":
+        """
+        DataAnonymizer のマッピングファイルから作成
+
+        Args:
+            mapping_file: マッピングファイルのパス
+
+        Returns:
+            LeakVerifier: すべての元の値を検出する検証器
+
+        Raises:
+            FileNotFoundError: マッピングファイルが存在しない場合
+        """
+        with open(mapping_file, "r", encoding="utf-8") as f:
+            return cls.from_mappings(json.load(f))
+
+    def scan(self, data: Any, path: str = "") -> List[LeakHit]:
+        """
+        バイト列（bytes、mmap など）を走査して元の値を検出
+
+        Args:
+            data: 走査するデータ
+            path: 報告に使うファイルのパス
+
+        Returns:
+            List[LeakHit]: 検出した元の値（最大 MAX_HITS_PER_FILE 件）
+        """
+        hits: List[LeakHit] = []
+        if self.pattern is None:
+            return hits
+        for match in self.pattern.finditer(data):
+            term = match.group()
+            hits.append(
+                LeakHit(path, match.start(), term.decode("utf-8"), self.kinds[term])
+            )
+            if len(hits) >= MAX_HITS_PER_FILE:
+                break
+        return hits
+
+    def scan_file(self, path: str) -> List[LeakHit]:
+        """
+        ファイルを走査して元の値を検出
+
+        非圧縮のファイルは mmap で読み込み、圧縮ファイル（.gz / .zst）は
+        展開してから走査します。
+
+        Args:
+            path: ファイルのパス
+
+        Returns:
+            List[LeakHit]: 検出した元の値
+        """
+        if path.endswith(COMPRESSION_SUFFIXES["gzip"]):
+            with gzip.open(path, "rb") as f:
+                return self.scan(f.read(), path)
+        if path.endswith(COMPRESSION_SUFFIXES["zstd"]):
+            if zstandard is None:
+                raise ValueError(
+                    "zstd で圧縮されたファイルを検証するには zstandard をインストールしてください"
+                )
+            with open(path, "rb") as f:
+                data = zstandard.ZstdDecompressor().decompressobj().decompress(f.read())
+            return self.scan(data, path)
+        with open(path, "rb") as f:
+            # 空のファイルは mmap できない
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self.scan(data, path)
+
+    def verify(self, paths: Iterable[str]) -> List[LeakHit]:
+        """
+        複数のファイルを検証し、結果をログに出力
+
+        Args:
+            paths: 検証するファイルのパス
+
+        Returns:
+            List[LeakHit]: すべてのファイルで検出した元の値（空なら検証成功）
+        """
+        hits: List[LeakHit] = []
+        count = 0
+        for path in paths:
+            file_hits = self.scan_file(path)
+            count += 1
+            for hit in file_hits:
+                logger.error(
+                    f"元の値が残っています: {hit.path}:{hit.offset} "
+                    f"({hit.kind}) {hit.term!r}"
+                )
+            hits.extend(file_hits)
+        if hits:
+            logger.error(f"匿名化の検証に失敗しました: {len(hits)}件の元の値を検出")
+        else:
+            logger.info(
+                f"匿名化を検証しました: {count}個のファイルに元の値"
+                f"（{len(self)}件）は含まれていません"
+            )
+        return hits
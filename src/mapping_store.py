@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Mapping Store Module - 匿名化マッピングの保存（SQLite）を担当するモジュール
+
+匿名化のマッピング（元の値からダミーデータへの対応）は、複数のワークスペースで
+使い続けるうちに数万件まで蓄積されます。JSONファイル1つに保存すると、
+起動のたびにすべてを読み込み、ファイルを1つ匿名化するたびにすべてを書き直します。
+このモジュールは、マッピングを SQLite データベースに種類ごとのテーブルで保存します。
+
+- 元の値には UNIQUE インデックスを張り、参照は必要になった値だけをその都度検索します。
+- 新しく追加したマッピングは保存時（flush）にまとめて1つのトランザクションで追加します。
+- WALモードで開くため、別のプロセスが書き込み中でも読み込みは待たされません。
+  書き込みが同時に行われた場合は先に保存された値を採用し、以降はその値に置換します。
+- 従来の ``anonymizer_mappings.json`` がある場合は、初回に自動で取り込みます
+  （JSONファイルはそのまま残します）。
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterator, MutableMapping, Optional
+
+from .leak_verifier import MAPPING_KINDS
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# 別のプロセスの書き込みが終わるのを待つ時間（秒）
+BUSY_TIMEOUT = 30
+
+# 取り込み済みのJSONファイルを記録する meta テーブルのキー
+MIGRATED_KEY = "migrated_from"
+
+
+class StoredMapping(MutableMapping[str, str]):
+    """データベースの1つのテーブルを、元の値からダミーへの辞書として扱うクラス
+
+    参照した値はメモリにキャッシュし、追加した値は MappingStore.flush で
+    保存するまでメモリに保持します。マッピングは追加のみで、削除や
+    既存の値の変更はできません。
+    """
+
+    def __init__(self, conn: sqlite3.Connection, table: str):
+        """
+        StoredMappingの初期化
+
+        Args:
+            conn: データベースへの接続
+            table: テーブル名（MAPPING_KINDS のキー）
+        """
+        self._conn = conn
+        self.table = table
+        self._cache: Dict[str, str] = {}
+        self.pending: Dict[str, str] = {}
+        # 走査用に読み込んだ保存済みのマッピング（保存のたびに読み込み直す）
+        self._snapshot: Optional[Dict[str, str]] = None
+
+    def __getitem__(self, original: str) -> str:
+        dummy = self._cache.get(original)
+        if dummy is None:
+            row = self._conn.execute(
+                f"SELECT dummy FROM {self.table} WHERE original = ?", (original,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(original)
+            dummy = self._cache[original] = row[0]
+        return dummy
+
+    def __setitem__(self, original: str, dummy: str) -> None:
+        if original not in self.pending and original in self:
+            if self[original] == dummy:
+                return
+            raise ValueError(f"登録済みのマッピングは変更できません: {original}")
+        self._cache[original] = dummy
+        self.pending[original] = dummy
+
+    def __delitem__(self, original: str) -> None:
+        raise TypeError("マッピングは削除できません")
+
+    def _rows(self) -> Dict[str, str]:
+        """
+        保存済みのマッピングを追加した順に読み込む
+        """
+        if self._snapshot is None:
+            self._snapshot = dict(
+                self._conn.execute(
+                    f"SELECT original, dummy FROM {self.table} ORDER BY id"
+                )
+            )
+            self._cache.update(self._snapshot)
+        return self._snapshot
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._rows()
+        yield from rows
+        yield from (original for original in self.pending if original not in rows)
+
+    def __len__(self) -> int:
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        return count + len(self.pending)
+
+    def _saved(self, conflicts: Dict[str, str]) -> None:
+        """
+        保存後の状態に更新（別のプロセスが先に保存した値があれば、そちらに合わせる）
+        """
+        self._cache.update(conflicts)
+        self.pending.clear()
+        self._snapshot = None
+
+
+class MappingStore:
+    """匿名化マッピングを SQLite データベースに保存するクラス"""
+
+    def __init__(self, db_file: str, legacy_file: Optional[str] = None):
+        """
+        MappingStoreの初期化（データベースを開き、必要ならJSONファイルを取り込む）
+
+        Args:
+            db_file: データベースファイルのパス（存在しなければ作成する）
+            legacy_file: 取り込む従来のマッピングファイル（JSON）のパス
+
+        Raises:
+            sqlite3.Error: データベースを開けない場合
+        """
+        self.db_file = db_file
+        self._conn = sqlite3.connect(
+            db_file, isolation_level=None, timeout=BUSY_TIMEOUT
+        )
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # WALモードではコミットごとの fsync を省略してもデータベースは壊れない
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._transaction():
+                for table in MAPPING_KINDS:
+                    self._conn.execute(
+                        f"CREATE TABLE IF NOT EXISTS {table} ("
+                        "id INTEGER PRIMARY KEY, "
+                        "original TEXT NOT NULL UNIQUE, "
+                        "dummy TEXT NOT NULL)"
+                    )
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS meta "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+                )
+                if legacy_file and os.path.exists(legacy_file):
+                    self._migrate(legacy_file)
+        except BaseException:
+            self._conn.close()
+            raise
+        self.maps: Dict[str, StoredMapping] = {
+            table: StoredMapping(self._conn, table) for table in MAPPING_KINDS
+        }
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        書き込みロックを取ってトランザクションを開始し、ブロックが正常に終了したらコミット
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _migrate(self, legacy_file: str) -> None:
+        """
+        従来のマッピングファイルを取り込む（トランザクション内で呼び出す）
+        """
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (MIGRATED_KEY,)
+        ).fetchone()
+        if row is not None:
+            return
+        with open(legacy_file, "r", encoding="utf-8") as f:
+            mappings = json.load(f)
+        count = 0
+        for table in MAPPING_KINDS:
+            rows = list((mappings.get(table) or {}).items())
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO {table} (original, dummy) VALUES (?, ?)", rows
+            )
+            count += len(rows)
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            (MIGRATED_KEY, os.path.abspath(legacy_file)),
+        )
+        logger.info(
+            f"マッピングファイルを取り込みました: {legacy_file} -> {self.db_file}"
+            f"（{count}件）"
+        )
+
+    def flush(self) -> int:
+        """
+        追加したマッピングを1つのトランザクションでまとめて保存
+
+        Returns:
+            int: 保存したマッピングの件数
+        """
+        maps = [mapping for mapping in self.maps.values() if mapping.pending]
+        if not maps:
+            return 0
+        saved = 0
+        conflicts: Dict[str, Dict[str, str]] = {}
+        with self._transaction():
+            for mapping in maps:
+                rows = list(mapping.pending.items())
+                cursor = self._conn.executemany(
+                    f"INSERT OR IGNORE INTO {mapping.table} (original, dummy) "
+                    "VALUES (?, ?)",
+                    rows,
+                )
+                saved += cursor.rowcount
+                if cursor.rowcount == len(rows):
+                    continue
+                # 別のプロセスが先に保存した値を読み込む
+                table_conflicts = conflicts.setdefault(mapping.table, {})
+                for original, dummy in rows:
+                    (stored,) = self._conn.execute(
+                        f"SELECT dummy FROM {mapping.table} WHERE original = ?",
+                        (original,),
+                    ).fetchone()
+                    if stored != dummy:
+                        table_conflicts[original] = stored
+        for mapping in maps:
+            mapping._saved(conflicts.get(mapping.table, {}))
+        conflict_count = sum(len(c) for c in conflicts.values())
+        if conflict_count:
+            logger.warning(
+                "別のプロセスが同じ値のマッピングを先に保存していたため、"
+                f"{conflict_count}件はそちらを使用します"
+            )
+        return saved
+
+    def close(self) -> None:
+        """
+        データベースを閉じる（保存していないマッピングは破棄される）
+        """
+        self._conn.close()
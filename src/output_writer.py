@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Output Writer Module - すべての出力ファイルの書き込みを担当する共通の出力レイヤー
+
+ブックマークファイル、ガイドページ、検索ページ、差分レポート、マニフェストなどの
+出力はすべてこのモジュールを経由して書き込みます。
+
+- 書き込みは同じディレクトリの一時ファイルに行い、完了後に名前を変更して
+  置き換えます。途中で異常終了しても書きかけのファイルが残らず、
+  実行中に別のプロセスが読んでも、常に前回か今回の完全な内容が読めます。
+- 圧縮（gzip、または zstandard がインストールされている場合は zstd）を
+  指定すると、出力ファイルを圧縮して書き込みます（例: 'slack_user_dms.html.gz'）。
+- 出力先ディレクトリを指定すると、相対パスの出力はそのディレクトリに書き込みます。
+- ファイルの内容は名前を変更する前に fsync しますが、ディレクトリの fsync は
+  ファイルごとではなく sync() を呼んだとき（1回の実行につき1回）にまとめて行います。
+
+出力ファイルのパスは、プログラム内では出力先ディレクトリや圧縮の拡張子を
+含まない論理的な名前（例: 'slack_all_channels.html'）で扱い、実際のパスへの
+変換は path() で行います。設定は get_output_writer() で共有します。
+"""
+
+import gzip
+import io
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set, TextIO, Union
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard は任意の依存パッケージ
+    zstandard = None
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# 圧縮方式と出力ファイルに付ける拡張子
+COMPRESSION_SUFFIXES: Dict[str, str] = {"gzip": ".gz", "zstd": ".zst"}
+
+# gzip の圧縮レベル（9に比べて大差のないサイズで数倍速い）
+GZIP_LEVEL = 6
+
+# zstd の圧縮レベル
+ZSTD_LEVEL = 10
+
+# 逐次書き込み時のバッファのサイズ（バイト）
+BUFFER_SIZE = 1 << 16
+
+# 一時ファイルは所有者のみ読み書き可能で作成されるため、置き換え前に
+# 通常の open と同じ（umask を反映した）パーミッションに戻す
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+class OutputWriter:
+    """出力ファイルをアトミックに（必要に応じて圧縮して）書き込むクラス"""
+
+    def __init__(
+        self, output_dir: Optional[str] = None, compression: Optional[str] = None
+    ):
+        """
+        OutputWriterの初期化
+
+        Args:
+            output_dir: 出力先ディレクトリ（省略時はカレントディレクトリ）
+            compression: 圧縮方式（'gzip' または 'zstd'。省略時は圧縮しない）
+
+        Raises:
+            ValueError: 未対応の圧縮方式が指定された場合、または
+                zstd が指定されたが zstandard がインストールされていない場合
+        """
+        if compression is not None and compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(
+                f"未対応の圧縮方式です: {compression}"
+                f"（指定可能: {', '.join(COMPRESSION_SUFFIXES)}）"
+            )
+        if compression == "zstd" and zstandard is None:
+            raise ValueError(
+                "zstd で圧縮するには zstandard をインストールしてください"
+                "（pip install zstandard）"
+            )
+        self.output_dir = os.path.abspath(output_dir) if output_dir else None
+        self.compression = compression
+        self.pending_dirs: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def path(self, name: str, compress: bool = True) -> str:
+        """
+        出力ファイルの実際のパスを取得
+
+        Args:
+            name: 出力ファイル名（相対パスは出力先ディレクトリからのパスとみなす）
+            compress: Falseの場合、圧縮の拡張子を付けない（マニフェストなどの状態ファイル用）
+
+        Returns:
+            str: 出力先ディレクトリと圧縮の拡張子を反映したパス
+        """
+        if self.output_dir:
+            name = os.path.join(self.output_dir, name)
+        if compress and self.compression:
+            name += COMPRESSION_SUFFIXES[self.compression]
+        return name
+
+    def exists(self, name: str, compress: bool = True) -> bool:
+        """
+        出力ファイルが存在するかを判定
+        """
+        return os.path.exists(self.path(name, compress))
+
+    def _compress(
+        self, data: Union[bytes, memoryview], compress: bool
+    ) -> Union[bytes, memoryview]:
+        """
+        設定に応じてデータを圧縮
+        """
+        if not compress or self.compression is None:
+            return data
+        if self.compression == "gzip":
+            # mtime を固定し、内容が同じなら同じバイト列になるようにする
+            return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+    def _decompress(self, data: bytes, compress: bool) -> bytes:
+        """
+        設定に応じてデータを展開
+        """
+        if not compress or self.compression is None:
+            return data
+        if self.compression == "gzip":
+            return gzip.decompress(data)
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+    def write_bytes(
+        self, name: str, data: Union[bytes, memoryview], compress: bool = True
+    ) -> str:
+        """
+        出力ファイルをアトミックに書き込む（1回のopenと1回のwriteで書き込む）
+
+        Args:
+            name: 出力ファイル名
+            data: 書き込む内容
+            compress: Falseの場合、圧縮しない
+
+        Returns:
+            str: 書き込んだファイルの実際のパス
+
+        Raises:
+            IOError: ファイル書き込みに失敗した場合（書きかけの一時ファイルは削除される）
+        """
+        path = self.path(name, compress)
+        data = self._compress(data, compress)
+        with self._replace(path) as tmp_path:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        return path
+
+    def write_text(self, name: str, text: str, compress: bool = True) -> str:
+        """
+        テキストの出力ファイルをUTF-8でアトミックに書き込む
+
+        Args:
+            name: 出力ファイル名
+            text: 書き込む内容
+            compress: Falseの場合、圧縮しない
+
+        Returns:
+            str: 書き込んだファイルの実際のパス
+        """
+        return self.write_bytes(name, text.encode("utf-8"), compress)
+
+    def read_text(self, name: str, compress: bool = True) -> str:
+        """
+        出力ファイルを読み込む（圧縮されている場合は展開する）
+
+        Args:
+            name: 出力ファイル名
+            compress: Falseの場合、圧縮されていないファイルとして読み込む
+
+        Returns:
+            str: ファイルの内容
+        """
+        with open(self.path(name, compress), "rb") as f:
+            data = f.read()
+        return self._decompress(data, compress).decode("utf-8")
+
+    @contextmanager
+    def open(self, name: str, compress: bool = True) -> Iterator[TextIO]:
+        """
+        テキストの出力ファイルを逐次書き込み用に開く
+
+        with ブロックを正常に抜けたときにファイルを置き換え、例外で抜けた場合は
+        書きかけの一時ファイルを削除して元のファイルを残します。
+
+        Args:
+            name: 出力ファイル名
+            compress: Falseの場合、圧縮しない
+
+        Yields:
+            TextIO: 書き込み先（改行の変換なし、UTF-8）
+        """
+        path = self.path(name, compress)
+        with self._replace(path) as tmp_path:
+            with open(tmp_path, "wb", buffering=BUFFER_SIZE) as raw:
+                if compress and self.compression == "gzip":
+                    stream = gzip.GzipFile(
+                        fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL, mtime=0
+                    )
+                elif compress and self.compression == "zstd":
+                    stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(
+                        raw, closefd=False
+                    )
+                else:
+                    stream = raw
+                text = io.TextIOWrapper(
+                    stream, encoding="utf-8", newline="", write_through=False
+                )
+                try:
+                    yield text
+                    text.flush()
+                finally:
+                    # TextIOWrapper を閉じると下位のファイルも閉じるため、切り離してから閉じる
+                    text.detach()
+                    if stream is not raw:
+                        stream.close()
+                raw.flush()
+                os.fsync(raw.fileno())
+
+    @contextmanager
+    def _replace(self, path: str) -> Iterator[str]:
+        """
+        一時ファイルのパスを渡し、ブロックが正常に終了したら path に置き換える
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+        )
+        os.close(fd)
+        try:
+            os.chmod(tmp_path, FILE_MODE)
+            yield tmp_path
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            self.pending_dirs.add(directory)
+
+    def sync(self) -> None:
+        """
+        ファイルを置き換えたディレクトリをまとめて fsync し、名前の変更を永続化
+        """
+        with self._lock:
+            directories = sorted(self.pending_dirs)
+            self.pending_dirs.clear()
+        for directory in directories:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                # Windows ではディレクトリを開けないため省略する
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+        if directories:
+            logger.debug(f"出力ディレクトリを同期しました: {len(directories)}個")
+
+
+# 共有の出力レイヤー
+_writer: Optional[OutputWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_output_writer() -> OutputWriter:
+    """
+    共有の出力レイヤーを取得（未設定の場合はカレントディレクトリに非圧縮で書き込む）
+
+    Returns:
+        OutputWriter: 共有の出力レイヤー
+    """
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = OutputWriter()
+    return _writer
+
+
+def configure_output(
+    output_dir: Optional[str] = None, compression: Optional[str] = None
+) -> OutputWriter:
+    """
+    共有の出力レイヤーを設定し直す
+
+    Args:
+        output_dir: 出力先ディレクトリ（省略時はカレントディレクトリ）
+        compression: 圧縮方式（'gzip' または 'zstd'。省略時は圧縮しない）
+
+    Returns:
+        OutputWriter: 新しい出力レイヤー
+
+    Raises:
+        ValueError: 未対応の圧縮方式が指定された場合
+    """
+    global _writer
+    writer = OutputWriter(output_dir, compression)
+    with _writer_lock:
+        _writer = writer
+    return writer
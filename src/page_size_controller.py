@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Page Size Controller Module - 一覧系APIのページサイズの自動調整を担当するモジュール
+
+users.list や conversations.list を limit=1000 固定で呼び出すと、負荷の高い
+ワークスペースではタイムアウトやサーバーエラーが頻発します。一方で
+ページを小さくすると往復回数が増えます。このモジュールは、観測した
+レイテンシ・レスポンスサイズ・エラーから、設定された範囲内で次のページの
+limit を決めるコントローラーを提供します。
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# limit を増やすときの倍率
+GROWTH_FACTOR = 1.5
+# エラー発生時に limit を減らすときの倍率
+BACKOFF_FACTOR = 0.5
+# 1件あたりの所要時間・サイズの指数移動平均の重み
+SMOOTHING = 0.3
+# エラー後、上限を超える limit を再び試すまでに必要な連続成功ページ数
+PROBE_INTERVAL = 20
+
+
+class PageSizeController:
+    """ページサイズ（limit）を観測値から調整するコントローラー
+
+    - レスポンスが target_latency を超えた場合は、1件あたりの所要時間の
+      推定値から target_latency に収まる件数まで limit を下げます。
+    - レスポンスが target_latency の半分未満で返った場合は limit を増やします。
+    - エラー（タイムアウト、サーバーエラーなど）の場合は、直前に成功した
+      limit（なければ現在の半分）に戻し、それを一時的な上限とします。
+      上限は PROBE_INTERVAL ページ連続で成功した後に解除されます。
+    - max_payload_bytes を指定した場合は、1件あたりのサイズの推定値から
+      レスポンスがこのサイズを超えないよう limit を制限します。
+
+    limit は常に min_limit 以上 max_limit 以下に保たれます。
+    """
+
+    def __init__(
+        self,
+        min_limit: int = 100,
+        max_limit: int = 1000,
+        initial_limit: Optional[int] = None,
+        target_latency: float = 2.0,
+        max_payload_bytes: Optional[int] = None,
+    ):
+        """
+        PageSizeControllerの初期化
+
+        Args:
+            min_limit: limit の下限
+            max_limit: limit の上限
+            initial_limit: 最初のページの limit（省略時は max_limit）
+            target_latency: 1ページあたりの目標レイテンシ（秒）
+            max_payload_bytes: 1ページあたりのレスポンスサイズの上限（バイト、省略時は制限なし）
+
+        Raises:
+            ValueError: 範囲の指定が不正な場合
+        """
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError(
+                "ページサイズの範囲が不正です: 1 <= min_limit <= max_limit である必要があります"
+            )
+        if target_latency <= 0:
+            raise ValueError("target_latency は0より大きい必要があります")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.max_payload_bytes = max_payload_bytes
+        self.limit = self._clamp(initial_limit or max_limit)
+
+        # 1件あたりの所要時間（秒）とサイズ（バイト）の推定値
+        self.seconds_per_item: Optional[float] = None
+        self.bytes_per_item: Optional[float] = None
+
+        # エラー後の一時的な上限と、直前に成功した limit
+        self.ceiling: Optional[int] = None
+        self.last_good: Optional[int] = None
+        self.successes_since_error = 0
+
+        # 実行メトリクス
+        self.limits: List[int] = []
+        self.pages = 0
+        self.items = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    def _clamp(self, limit: float) -> int:
+        """
+        limit を設定範囲内に収める
+        """
+        return max(self.min_limit, min(self.max_limit, int(limit)))
+
+    @staticmethod
+    def _smooth(current: Optional[float], observed: float) -> float:
+        """
+        指数移動平均を更新
+        """
+        if current is None:
+            return observed
+        return current + SMOOTHING * (observed - current)
+
+    def next_limit(self) -> int:
+        """
+        次のページで使う limit を取得
+
+        Returns:
+            int: limit
+        """
+        self.limits.append(self.limit)
+        return self.limit
+
+    def record_success(
+        self, latency: float, items: int, payload_bytes: Optional[int] = None
+    ) -> None:
+        """
+        成功したページの観測値を記録し、次の limit を調整
+
+        Args:
+            latency: リクエストのレイテンシ（秒）
+            items: 取得した件数
+            payload_bytes: レスポンスのサイズ（バイト、不明な場合はNone）
+        """
+        self.pages += 1
+        self.items += items
+        self.seconds += latency
+        self.last_good = self.limit
+        self.successes_since_error += 1
+        if self.ceiling is not None and self.successes_since_error >= PROBE_INTERVAL:
+            # しばらく成功が続いたら、より大きな limit を再び試す
+            self.ceiling = None
+        if items <= 0:
+            return
+
+        self.seconds_per_item = self._smooth(self.seconds_per_item, latency / items)
+        if payload_bytes:
+            self.bytes_per_item = self._smooth(
+                self.bytes_per_item, payload_bytes / items
+            )
+
+        limit: float = self.limit
+        if latency > self.target_latency:
+            # 目標レイテンシに収まる件数まで下げる
+            limit = min(limit, self.target_latency / self.seconds_per_item)
+        elif latency < self.target_latency / 2:
+            limit = limit * GROWTH_FACTOR
+
+        if self.max_payload_bytes and self.bytes_per_item:
+            limit = min(limit, self.max_payload_bytes / self.bytes_per_item)
+        if self.ceiling is not None:
+            limit = min(limit, self.ceiling)
+
+        self._update(limit)
+
+    def record_error(self, latency: float = 0.0) -> None:
+        """
+        失敗したページを記録し、limit を下げる
+
+        Args:
+            latency: 失敗するまでにかかった時間（秒）
+        """
+        self.errors += 1
+        self.seconds += latency
+        self.successes_since_error = 0
+        if self.last_good is not None and self.last_good < self.limit:
+            limit = self.last_good
+        else:
+            limit = self._clamp(self.limit * BACKOFF_FACTOR)
+        self.last_good = None
+        self.ceiling = limit
+        self._update(limit)
+
+    def _update(self, limit: float) -> None:
+        """
+        limit を更新し、変化があればログに記録
+        """
+        new_limit = self._clamp(limit)
+        if new_limit != self.limit:
+            logger.debug(f"ページサイズを変更しました: {self.limit} -> {new_limit}")
+        self.limit = new_limit
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        実行メトリクスの概要を取得
+
+        Returns:
+            Dict[str, Any]: ページ数、件数、エラー数、所要時間、使用した limit の範囲
+        """
+        return {
+            "pages": self.pages,
+            "items": self.items,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "limits": {
+                "first": self.limits[0] if self.limits else None,
+                "min": min(self.limits) if self.limits else None,
+                "max": max(self.limits) if self.limits else None,
+                "last": self.limits[-1] if self.limits else None,
+            },
+        }
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Response Decoder Module - Slack APIレスポンスの高速なデコードを担当するモジュール
+
+limit=1000 の users.list のページはプロフィール全体を含む数MBのJSONになり、
+標準ライブラリの json によるデコードがクロール時間の大半を占めます。
+このモジュールは、orjson がインストールされていればそれを使い、
+なければ標準ライブラリの json にフォールバックしてレスポンスの生バイト列を
+デコードします。また、一覧系APIのレスポンスからブックマーク生成に
+使うフィールドだけを取り出し（射影し）、ページごとに保持する
+データ量を減らします。
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson は任意の依存パッケージ
+    orjson = None
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# orjson が利用できるかどうか
+HAS_ORJSON = orjson is not None
+
+# APIメソッドごとの (一覧のキー, 射影関数名)
+PROJECTED_METHODS: Dict[str, Tuple[str, str]] = {
+    "users.list": ("members", "_project_users"),
+    "conversations.list": ("channels", "_project_channels"),
+    "users.conversations": ("channels", "_project_channels"),
+}
+
+
+def loads(data: bytes) -> Any:
+    """
+    JSONのバイト列をデコード（orjson があれば orjson を使用）
+
+    Args:
+        data: UTF-8でエンコードされたJSON
+
+    Returns:
+        Any: デコードされた値
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ResponseDecoder:
+    """Slack APIレスポンスのデコーダー
+
+    レスポンスの生バイト列をデコードし、projection が有効な場合は
+    一覧系APIのレスポンスを BookmarkGenerator が使うフィールドだけに
+    絞り込みます。一覧以外のキー（ok, error, response_metadata など）は
+    そのまま残します。
+    """
+
+    def __init__(
+        self,
+        projection: bool = True,
+        loads_func: Optional[Callable[[bytes], Any]] = None,
+    ):
+        """
+        ResponseDecoderの初期化
+
+        Args:
+            projection: 一覧系APIのレスポンスを必要なフィールドだけに絞り込むかどうか
+            loads_func: JSONのデコード関数（省略時は orjson、なければ標準ライブラリの json）
+        """
+        self.projection = projection
+        self.loads = loads_func or loads
+
+    def decode(self, api_method: str, body: bytes) -> Dict[str, Any]:
+        """
+        レスポンスボディをデコード
+
+        Args:
+            api_method: APIメソッド名（例: 'users.list'）
+            body: レスポンスボディの生バイト列
+
+        Returns:
+            Dict[str, Any]: デコード（および射影）されたレスポンス
+        """
+        data = self.loads(body)
+        if not self.projection or not isinstance(data, dict):
+            return data
+        target = PROJECTED_METHODS.get(api_method)
+        if target is not None:
+            key, project_name = target
+            items = data.get(key)
+            if items:
+                data[key] = getattr(self, project_name)(items)
+        return data
+
+    @staticmethod
+    def _project_users(members):
+        """
+        ユーザー一覧を id, name, deleted, is_bot と
+        profile の real_name, display_name だけに絞り込む
+        """
+        projected = []
+        append = projected.append
+        for member in members:
+            get = member.get
+            user = {
+                "id": member["id"],
+                "name": get("name", ""),
+                "deleted": get("deleted", False),
+                "is_bot": get("is_bot", False),
+            }
+            profile = get("profile")
+            if profile is not None:
+                user["profile"] = {
+                    "real_name": profile.get("real_name", ""),
+                    "display_name": profile.get("display_name", ""),
+                }
+            append(user)
+        return projected
+
+    @staticmethod
+    def _project_channels(channels):
+        """
+        チャンネル一覧を id, name, is_private, is_archived, is_member だけに絞り込む
+        """
+        projected = []
+        append = projected.append
+        for channel in channels:
+            get = channel.get
+            append(
+                {
+                    "id": channel["id"],
+                    "name": channel["name"],
+                    "is_private": get("is_private", False),
+                    "is_archived": get("is_archived", False),
+                    "is_member": get("is_member", False),
+                }
+            )
+        return projected
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Search Page Module - チャンネル・ユーザーを検索する静的HTMLページの生成を担当するモジュール
+
+数万件のチャンネルやユーザーをインポートすると、ブラウザのブックマーク
+フォルダは一覧するだけで時間がかかります。このモジュールは、ブックマーク
+ファイルの生成と同じ処理の中で名前の検索インデックスを作成し、
+インデックスを埋め込んだ1つの静的HTMLページ（検索ページ）を生成します。
+
+インデックスは次の2つで構成されます。
+
+- 名前表: ブックマークと同じ並び順の表示名とURL
+- トライグラムのポスティング: 正規化した名前に含まれる3文字ごとの
+  エントリ番号の一覧（差分を36進数にしてカンマ区切りにしたもの）
+
+3文字以上の検索語は、検索語のトライグラムのポスティングの積集合を
+候補として部分一致を確認し、2文字以下の検索語は名前表を走査します。
+インデックスの作成はエントリ数（名前の文字数の合計）に比例する時間で終わります。
+"""
+
+import json
+import logging
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
+
+from .collation import KATAKANA_TO_HIRAGANA
+from .export_manifest import content_digest
+from .output_writer import get_output_writer
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# トライグラムの長さ
+GRAM_SIZE = 3
+
+# 検索結果の最大表示件数
+MAX_RESULTS = 200
+
+# 36進数の桁
+_BASE36_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def fold(text: str) -> str:
+    """
+    検索用に文字列を正規化（NFKC正規化、カタカナのひらがな化、casefold）
+
+    検索ページのJavaScriptも検索語に同じ正規化を行います。
+
+    Args:
+        text: 名前などの文字列
+
+    Returns:
+        str: 正規化した文字列
+    """
+    return (
+        unicodedata.normalize("NFKC", text).translate(KATAKANA_TO_HIRAGANA).casefold()
+    )
+
+
+def _base36(number: int) -> str:
+    """
+    0以上の整数を36進数の文字列に変換
+    """
+    if number < 36:
+        return _BASE36_DIGITS[number]
+    digits = []
+    while number:
+        number, remainder = divmod(number, 36)
+        digits.append(_BASE36_DIGITS[remainder])
+    return "".join(reversed(digits))
+
+
+class SearchIndex:
+    """検索ページに埋め込む名前の検索インデックス
+
+    add でブックマークのエントリを追加すると、エントリ番号を振りながら
+    トライグラムのポスティングを更新します。エントリ番号は追加順のため、
+    各ポスティングは常に昇順になり、並べ替えずに差分で圧縮できます。
+    """
+
+    def __init__(self):
+        """
+        SearchIndexの初期化
+        """
+        self.titles: List[str] = []
+        self.urls: List[str] = []
+        self.kinds: List[str] = []
+        self.postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def add(self, kind: str, entries: Iterable[Tuple[str, str]]) -> None:
+        """
+        ブックマークのエントリを追加
+
+        Args:
+            kind: エントリの種類（'channel' または 'user'）
+            entries: (表示名, URL) の並び
+        """
+        titles = self.titles
+        urls = self.urls
+        kinds = self.kinds
+        postings = self.postings
+        for title, url in entries:
+            number = len(titles)
+            titles.append(title)
+            urls.append(url)
+            kinds.append(kind)
+            key = fold(title)
+            for gram in {key[i : i + GRAM_SIZE] for i in range(len(key) - 2)}:
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = [number]
+                else:
+                    posting.append(number)
+
+    def digest(self) -> str:
+        """
+        インデックスの内容を表すハッシュを計算
+
+        Returns:
+            str: 16進数ハッシュ
+        """
+        return content_digest(zip(self.titles, self.urls))
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        検索ページに埋め込む形式に変換
+
+        URLは種類ごとの共通部分（例: 'slack://channel?team=T...&id='）と
+        残りの部分に分けて保持します。
+
+        Returns:
+            Dict[str, object]: 名前表とトライグラムのポスティング
+        """
+        prefixes: List[str] = []
+        prefix_numbers: Dict[str, int] = {}
+        refs: List[str] = []
+        links: List[str] = []
+        for url in self.urls:
+            prefix, separator, rest = url.rpartition("=")
+            prefix += separator
+            number = prefix_numbers.get(prefix)
+            if number is None:
+                number = prefix_numbers[prefix] = len(prefixes)
+                prefixes.append(prefix)
+            refs.append(_base36(number))
+            links.append(rest)
+
+        grams = {}
+        for gram, posting in self.postings.items():
+            previous = 0
+            deltas = []
+            for number in posting:
+                deltas.append(_base36(number - previous))
+                previous = number
+            grams[gram] = ",".join(deltas)
+
+        kinds = sorted(set(self.kinds))
+        kind_numbers = {kind: str(i) for i, kind in enumerate(kinds)}
+        return {
+            "titles": self.titles,
+            "prefixes": prefixes,
+            "refs": ",".join(refs),
+            "links": links,
+            "kinds": kinds,
+            "kindOf": "".join(kind_numbers[kind] for kind in self.kinds),
+            "grams": grams,
+        }
+
+
+class SearchPageGenerator:
+    """検索インデックスを埋め込んだ検索ページの生成を担当するクラス"""
+
+    def render(self, index: SearchIndex, workspace_name: str) -> str:
+        """
+        検索ページの内容（HTML）を作成
+
+        Args:
+            index: 検索インデックス
+            workspace_name: ワークスペース名（ページのタイトルに表示）
+
+        Returns:
+            str: 検索ページのHTML
+        """
+        data = json.dumps(index.to_dict(), ensure_ascii=False, separators=(",", ":"))
+        # 名前に含まれる </script> などでスクリプト要素が閉じないようにする
+        data = data.replace("<", "\\u003c")
+        title = f"Slack検索 - {workspace_name}".replace("&", "&amp;").replace(
+            "<", "&lt;"
+        )
+        return (
+            _PAGE_TEMPLATE.replace("{{title}}", title)
+            .replace("{{max_results}}", str(MAX_RESULTS))
+            .replace("{{count}}", str(len(index)))
+            .replace("{{index}}", data)
+        )
+
+    def create_page(
+        self, index: SearchIndex, output_file: str, workspace_name: str
+    ) -> str:
+        """
+        検索ページを生成
+
+        Args:
+            index: 検索インデックス
+            output_file: 出力ファイル名（例: 'slack_search.html'）
+            workspace_name: ワークスペース名
+
+        Returns:
+            str: 生成された検索ページのパス、エラー時は空文字列
+        """
+        try:
+            html = self.render(index, workspace_name)
+            get_output_writer().write_text(output_file, html)
+            logger.info(f"検索ページを生成しました: {output_file} ({len(index)}件)")
+            return output_file
+        except Exception as e:
+            logger.error(f"検索ページ生成エラー: {e}")
+            return ""
+
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>{{title}}</title>
+    <meta charset="UTF-8">
+    <style>
+        body { font-family: Arial, sans-serif; padding: 20px; }
+        h1 { color: #1264A3; }
+        input { width: 100%; max-width: 600px; font-size: 18px; padding: 8px; }
+        .status { color: #666; margin: 8px 0; }
+        ul { list-style: none; padding: 0; }
+        li { margin: 4px 0; }
+        .kind { display: inline-block; width: 4em; color: #888; font-size: 12px; }
+        a { color: #1264A3; text-decoration: none; }
+        a:hover { text-decoration: underline; }
+    </style>
+</head>
+<body>
+    <h1>{{title}}</h1>
+    <input id="q" type="search" placeholder="チャンネル名・ユーザー名で検索（{{count}}件）" autofocus>
+    <div class="status" id="status"></div>
+    <ul id="results"></ul>
+    <script type="application/json" id="index">{{index}}</script>
+    <script>
+    (function () {
+        var MAX_RESULTS = {{max_results}};
+        var data = JSON.parse(document.getElementById("index").textContent);
+        var titles = data.titles, grams = data.grams, refs = data.refs.split(",");
+        var kindLabels = { channel: "チャンネル", user: "DM" };
+
+        // Python側の fold と同じ正規化（NFKC、カタカナ→ひらがな、小文字化）
+        function fold(text) {
+            return text.normalize("NFKC").replace(/[\\u30a1-\\u30f6]/g, function (c) {
+                return String.fromCharCode(c.charCodeAt(0) - 0x60);
+            }).toLowerCase();
+        }
+        var keys = titles.map(fold);
+
+        var decoded = new Map();
+        function posting(gram) {
+            var list = decoded.get(gram);
+            if (list === undefined) {
+                var packed = grams[gram];
+                list = [];
+                if (packed !== undefined) {
+                    var parts = packed.split(","), number = 0;
+                    for (var i = 0; i < parts.length; i++) {
+                        number += parseInt(parts[i], 36);
+                        list.push(number);
+                    }
+                }
+                decoded.set(gram, list);
+            }
+            return list;
+        }
+
+        function intersect(a, b) {
+            var result = [], i = 0, j = 0;
+            while (i < a.length && j < b.length) {
+                if (a[i] === b[j]) { result.push(a[i]); i++; j++; }
+                else if (a[i] < b[j]) { i++; }
+                else { j++; }
+            }
+            return result;
+        }
+
+        function candidates(q) {
+            var seen = {}, lists = [];
+            for (var i = 0; i + 3 <= q.length; i++) {
+                var gram = q.substr(i, 3);
+                if (!seen[gram]) { seen[gram] = true; lists.push(posting(gram)); }
+            }
+            lists.sort(function (a, b) { return a.length - b.length; });
+            var result = lists[0];
+            for (var k = 1; k < lists.length && result.length; k++) {
+                result = intersect(result, lists[k]);
+            }
+            return result;
+        }
+
+        // 前方一致を先に、部分一致を後に、それぞれ名前表の順で返す
+        function search(q) {
+            var prefix = [], substring = [], total = 0;
+            function check(n) {
+                var key = keys[n], at = key.indexOf(q);
+                if (at === 0) { total++; if (prefix.length < MAX_RESULTS) prefix.push(n); }
+                else if (at > 0) { total++; if (substring.length < MAX_RESULTS) substring.push(n); }
+            }
+            if (q.length >= 3) {
+                var list = candidates(q);
+                for (var i = 0; i < list.length; i++) check(list[i]);
+            } else {
+                for (var n = 0; n < keys.length; n++) check(n);
+            }
+            return { items: prefix.concat(substring).slice(0, MAX_RESULTS), total: total };
+        }
+
+        var input = document.getElementById("q");
+        var status = document.getElementById("status");
+        var results = document.getElementById("results");
+        function update() {
+            var q = fold(input.value.trim());
+            results.textContent = "";
+            if (!q) { status.textContent = ""; return; }
+            var started = performance.now();
+            var found = search(q);
+            var fragment = document.createDocumentFragment();
+            found.items.forEach(function (n) {
+                var li = document.createElement("li");
+                var kind = document.createElement("span");
+                var kindName = data.kinds[+data.kindOf[n]];
+                kind.className = "kind";
+                kind.textContent = kindLabels[kindName] || kindName;
+                var a = document.createElement("a");
+                a.href = data.prefixes[parseInt(refs[n], 36)] + data.links[n];
+                a.textContent = titles[n];
+                li.appendChild(kind);
+                li.appendChild(a);
+                fragment.appendChild(li);
+            });
+            results.appendChild(fragment);
+            status.textContent = found.total + "件" +
+                (found.total > found.items.length ? "（先頭" + found.items.length + "件を表示）" : "") +
+                " - " + (performance.now() - started).toFixed(1) + "ms";
+        }
+        input.addEventListener("input", update);
+        update();
+    })();
+    </script>
+</body>
+</html>
+"""
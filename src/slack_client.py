@@ -8,13 +8,50 @@ Slack Client Module - Slack APIとの通信を担当するモジュール
 """
 
 import logging
-from typing import List, Dict, Any
+import socket
+import time
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
+from urllib.error import URLError
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
+from .external_sort import DEFAULT_MAX_ITEMS_IN_MEMORY, ExternalSorter, user_sort_key
+from .http_transport import PooledTransport, PooledWebClient
+from .page_size_controller import PageSizeController
+from .response_decoder import ResponseDecoder
+
 # ロギング設定
 logger = logging.getLogger("slack_to_bookmark")
 
+# 1ページあたりの再試行回数の上限（ページサイズを下げて再試行する）
+MAX_PAGE_RETRIES = 3
+# 再試行の対象とするSlack APIのエラーコード
+TRANSIENT_API_ERRORS = frozenset(["internal_error", "fatal_error", "request_timeout"])
+# 再試行の対象とする通信エラー
+TRANSIENT_NETWORK_ERRORS = (socket.timeout, TimeoutError, ConnectionError, URLError)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    ページサイズを下げて再試行すべき一時的なエラーかを判定
+
+    Args:
+        error: 発生した例外
+
+    Returns:
+        bool: タイムアウト、通信エラー、サーバーエラーの場合はTrue
+    """
+    if isinstance(error, SlackApiError):
+        response = error.response
+        status_code = getattr(response, "status_code", 200) or 200
+        if isinstance(status_code, int) and status_code >= 500:
+            return True
+        try:
+            return response.get("error") in TRANSIENT_API_ERRORS
+        except Exception:
+            return False
+    return isinstance(error, TRANSIENT_NETWORK_ERRORS)
+
 
 class SlackClient:
     """Slack APIとの通信を担当するクラス
@@ -24,7 +61,18 @@ class SlackClient:
     すべての情報を取得できます。
     """
 
-    def __init__(self, token: str, workspace_name: str, workspace_id: str):
+    def __init__(
+        self,
+        token: str,
+        workspace_name: str,
+        workspace_id: str,
+        transport: Optional[PooledTransport] = None,
+        decoder: Optional[ResponseDecoder] = None,
+        exclude_archived: bool = False,
+        member_only: bool = False,
+        page_size_range: Tuple[int, int] = (100, 1000),
+        target_page_latency: float = 2.0,
+    ):
         """
         SlackClientの初期化
 
@@ -32,17 +80,136 @@ class SlackClient:
             token: Slack API トークン (xoxp-で始まるユーザートークン)
             workspace_name: ワークスペース名 (例: 'mycompany')
             workspace_id: ワークスペースID (例: 'T00000000')
+            transport: API呼び出しで共有するHTTP接続プール
+                （省略時は slack_sdk 標準の urllib による通信）
+            decoder: transport 使用時のJSONレスポンスのデコーダー
+                （省略時は orjson による高速デコードと必要フィールドへの射影）
+            exclude_archived: Trueの場合、アーカイブ済みチャンネルをAPI側で除外する
+            member_only: Trueの場合、users.conversations でトークンのユーザーが
+                参加しているチャンネルだけを取得する
+            page_size_range: 一覧系APIのページサイズ（limit）の (下限, 上限)。
+                最初のページは上限で取得し、観測値に応じて範囲内で調整する
+            target_page_latency: 1ページあたりの目標レイテンシ（秒）
 
         Raises:
             ValueError: トークンが空の場合
         """
         if not token:
             raise ValueError("Slack APIトークンが指定されていません")
-        self.client = WebClient(token=token)
+        if transport is not None:
+            self.client = PooledWebClient(
+                token=token, transport=transport, decoder=decoder or ResponseDecoder()
+            )
+        else:
+            self.client = WebClient(token=token)
+        self.transport = transport
+        self.exclude_archived = exclude_archived
+        self.member_only = member_only
+        self.page_size_range = page_size_range
+        self.target_page_latency = target_page_latency
+        # APIメソッドごとのページサイズコントローラー（実行全体で状態を引き継ぐ）
+        self.page_controllers: Dict[str, PageSizeController] = {}
+        # ユーザーの並べ替えでメモリ上に保持する件数の上限（超えた分は一時ファイルへ）
+        self.sort_memory_budget = DEFAULT_MAX_ITEMS_IN_MEMORY
         self.workspace_name = workspace_name
         self.workspace_id = workspace_id
         logger.info(f"SlackClient initialized for workspace: {workspace_name}")
 
+    def _page_controller(self, api_method: str) -> PageSizeController:
+        """
+        APIメソッドに対応するページサイズコントローラーを取得（なければ作成）
+        """
+        controller = self.page_controllers.get(api_method)
+        if controller is None:
+            min_limit, max_limit = self.page_size_range
+            controller = self.page_controllers[api_method] = PageSizeController(
+                min_limit=min_limit,
+                max_limit=max_limit,
+                target_latency=self.target_page_latency,
+            )
+        return controller
+
+    def _paginate(
+        self,
+        api_method: str,
+        fetch_page: Callable[..., Any],
+        items_key: str,
+        **params: Any,
+    ) -> Iterator[Any]:
+        """
+        カーソルによるページネーションで全ページを順に取得
+
+        ページごとの limit は PageSizeController が決めます。タイムアウトや
+        サーバーエラーが発生した場合は limit を下げて同じカーソルから
+        再試行し、MAX_PAGE_RETRIES 回を超えた場合は例外をそのまま送出します。
+
+        Args:
+            api_method: メトリクスの記録に使うAPIメソッド名（例: 'users.list'）
+            fetch_page: 1ページを取得する WebClient のメソッド
+            items_key: レスポンス内の一覧のキー（例: 'members'）
+            **params: fetch_page に渡すその他の引数
+
+        Yields:
+            各ページのレスポンス
+        """
+        controller = self._page_controller(api_method)
+        cursor = None
+        retries = 0
+        while True:
+            limit = controller.next_limit()
+            started = time.perf_counter()
+            try:
+                result = fetch_page(limit=limit, cursor=cursor, **params)
+            except Exception as e:
+                if not is_transient_error(e) or retries >= MAX_PAGE_RETRIES:
+                    raise
+                retries += 1
+                controller.record_error(time.perf_counter() - started)
+                logger.warning(
+                    f"{api_method} の取得に失敗したため、ページサイズを"
+                    f"{controller.limit}に下げて再試行します ({retries}/{MAX_PAGE_RETRIES}): {e}"
+                )
+                continue
+
+            retries = 0
+            controller.record_success(
+                time.perf_counter() - started,
+                len(result.get(items_key) or []),
+                self._payload_size(result),
+            )
+            yield result
+
+            # 次のページがあるかチェック
+            cursor = result.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                break
+
+    @staticmethod
+    def _payload_size(result: Any) -> Optional[int]:
+        """
+        レスポンスのサイズ（Content-Length）を取得（不明な場合はNone）
+        """
+        headers = getattr(result, "headers", None)
+        if not isinstance(headers, dict):
+            return None
+        for name, value in headers.items():
+            if name.lower() == "content-length":
+                try:
+                    return int(value)
+                except (TypeError, ValueError):
+                    return None
+        return None
+
+    @property
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        APIメソッドごとのページ取得メトリクス（ページ数、件数、エラー数、使用した limit）
+        """
+        return {
+            api_method: controller.summary()
+            for api_method, controller in self.page_controllers.items()
+        }
+
     def get_all_users(self) -> List[Dict[str, Any]]:
         """
         ワークスペース内の全ユーザーを取得（ボットユーザーを除く、ページネーション対応）
@@ -58,14 +225,31 @@ class SlackClient:
         Raises:
             SlackApiError: Slack APIからエラーレスポンスが返された場合
         """
-        all_users = []
+        with self.get_sorted_users() as sorter:
+            return list(sorter)
+
+    def get_sorted_users(self) -> ExternalSorter:
+        """
+        ワークスペース内の全ユーザーを表示名順に並べ替えて取得（ボットユーザーを除く）
+
+        取得したページごとにソートキーを計算して並べ替え、保持件数が
+        sort_memory_budget を超えた分はソート済みのランとして一時ファイルに
+        書き出します。返されるソーターを反復すると、ランをマージしながら
+        表示名順にユーザーを返します。使い終わったら close を呼び出してください。
+
+        Returns:
+            ExternalSorter: 表示名順にユーザー情報を返すソーター
+
+        Raises:
+            SlackApiError: Slack APIからエラーレスポンスが返された場合
+        """
+        all_users = ExternalSorter(user_sort_key, self.sort_memory_budget)
         regular_user_count = 0
 
         try:
-            cursor = None
-            while True:
-                result = self.client.users_list(limit=1000, cursor=cursor)
-
+            for result in self._paginate(
+                "users.list", self.client.users_list, "members"
+            ):
                 # 通常ユーザーのみをフィルタリング (is_bot=False, deleted=False)
                 users = result["members"]
                 regular_users = [
@@ -74,14 +258,9 @@ class SlackClient:
                     if not user.get("is_bot", False) and not user.get("deleted", False)
                 ]
 
-                all_users.extend(regular_users)
+                all_users.add(regular_users)
                 regular_user_count += len(regular_users)
 
-                # 次のページがあるかチェック
-                cursor = result.get("response_metadata", {}).get("next_cursor")
-                if not cursor:
-                    break
-
             logger.info(f"Retrieved {regular_user_count} regular users")
         except SlackApiError as e:
             logger.error(f"ユーザーリスト取得エラー: {e}")
@@ -109,15 +288,10 @@ class SlackClient:
                     "\n- .envファイルの設定が正しいこと"
                 )
 
-        # ユーザーをアルファベット順にソート（表示名または実名を使用）
-        all_users.sort(
-            key=lambda x: (
-                x.get("profile", {}).get("display_name")
-                or x.get("profile", {}).get("real_name")
-                or ""
-            ).lower()
-        )
-
+        if all_users.run_files:
+            logger.info(
+                f"ユーザーの並べ替えで{len(all_users.run_files)}個のランを一時ファイルに書き出しました"
+            )
         return all_users
 
     def get_channels_by_type(self, channel_type: str) -> List[Dict[str, Any]]:
@@ -127,6 +301,9 @@ class SlackClient:
         Slack APIを使用して、指定されたタイプ（公開またはプライベート）の
         チャンネル情報をすべて取得します。大規模なワークスペースでも
         すべてのチャンネルを取得するため、ページネーション処理を実装しています。
+        exclude_archived が有効な場合はアーカイブ済みチャンネルをAPI側で除外し、
+        member_only が有効な場合は conversations.list の代わりに
+        users.conversations で参加中のチャンネルだけを取得します。
 
         Args:
             channel_type: チャンネルタイプ ("public_channel" または "private_channel")
@@ -147,22 +324,27 @@ class SlackClient:
         channel_count = 0
         type_display = "公開" if channel_type == "public_channel" else "プライベート"
 
-        try:
-            cursor = None
-            while True:
-                result = self.client.conversations_list(
-                    types=channel_type, limit=1000, cursor=cursor
-                )
+        # フィルタリングはできるだけAPI側で行う
+        params: Dict[str, Any] = {"types": channel_type}
+        if self.exclude_archived:
+            params["exclude_archived"] = True
+        if self.member_only:
+            api_method, fetch_page = (
+                "users.conversations",
+                self.client.users_conversations,
+            )
+        else:
+            api_method, fetch_page = (
+                "conversations.list",
+                self.client.conversations_list,
+            )
 
+        try:
+            for result in self._paginate(api_method, fetch_page, "channels", **params):
                 new_channels = result["channels"]
                 channels.extend(new_channels)
                 channel_count += len(new_channels)
 
-                # 次のページがあるかチェック
-                cursor = result.get("response_metadata", {}).get("next_cursor")
-                if not cursor:
-                    break
-
             logger.info(f"{type_display}チャンネル: {channel_count}個")
         except SlackApiError as e:
             error_msg = f"{type_display}チャンネル取得エラー: {e}"
@@ -11,6 +11,7 @@ Chromeのブックマークとして利用できるHTMLファイルを生成し
 - 特定のチャンネルのみのブックマークを生成（フィルタリング機能）
 - ユーザーとのダイレクトメッセージ用のブックマークを生成
 - ブックマークのインポート手順を記載したガイドページを自動生成
+- 一定間隔でブックマークを更新し続けるウォッチモード（--watch）
 """
 
 import os
@@ -19,17 +20,29 @@ import json
 import datetime
 import time
 import logging
-import webbrowser
 import argparse
-from typing import List, Dict, Any, Optional, Tuple, Set
+from typing import List, Dict, Any, Optional, Tuple, Set, Iterable, Sequence, Union
 from pathlib import Path
 from dotenv import load_dotenv
 
 # 独自モジュールをインポート
 from .slack_client import SlackClient
+from .http_transport import PooledTransport
+from .cassette import REPLAY_LATENCIES, RecordingTransport, ReplayTransport
+from .response_decoder import loads
+from .channel_filter import ChannelFilter
+from .collation import configure_collator
 from .bookmark_generator import BookmarkGenerator
 from .guide_generator import GuideGenerator
 from .data_anonymizer import DataAnonymizer
+from .chrome_bookmarks import ChromeBookmarkWriter, default_bookmarks_path
+from .firefox_bookmarks import FirefoxPlacesWriter, default_places_path
+from .watcher import Watcher, parse_interval
+from .bookmark_server import BookmarkServer
+from .search_page import SearchIndex, SearchPageGenerator
+from .bookmark_sinks import SINK_TYPES, parse_formats
+from .bookmark_renderer import open_in_browser
+from .output_writer import COMPRESSION_SUFFIXES, configure_output, get_output_writer
 
 # バージョン情報
 __version__ = "1.0.0"
@@ -42,6 +55,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("slack_to_bookmark")
 
+# トークンの有効性の確認に使うAPI
+AUTH_TEST_URL = "https://slack.com/api/auth.test"
+
+# カセットの再生時に使うトークン（Slack APIには送信されない）
+REPLAY_TOKEN = "xoxp-replay"
+
 
 class SlackToBookmark:
     """Slack to Bookmarkメインクラス
@@ -53,7 +72,13 @@ class SlackToBookmark:
     4. ブラウザでの結果表示
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool_size: int = 4,
+        record_file: Optional[str] = None,
+        replay_file: Optional[str] = None,
+        replay_latency: str = "original",
+    ):
         """
         SlackToBookmarkクラスの初期化
 
@@ -61,6 +86,14 @@ class SlackToBookmark:
         GuideGeneratorのインスタンスを初期化します。必要な環境変数（SLACK_TOKEN）が
         存在しない場合はエラーメッセージを表示してプログラムを終了します。
 
+        Args:
+            pool_size: Slack APIとの通信で再利用するHTTP接続の最大数
+            record_file: 指定した場合、Slack APIのレスポンスをこのカセットファイルに記録する
+            replay_file: 指定した場合、Slack APIに接続せずにこのカセットファイルの
+                レスポンスを再生する（SLACK_TOKENは不要）
+            replay_latency: 再生時の待ち時間（'original' は記録した応答時間どおり、
+                'zero' は待たない）
+
         Raises:
             SystemExit: SLACK_TOKENが見つからない場合
         """
@@ -77,14 +110,45 @@ class SlackToBookmark:
             f"設定値: WORKSPACE_NAME={self.workspace_name}, WORKSPACE_ID={self.workspace_id}"
         )
 
+        # 再生時はSlack APIに接続しないため、トークンは不要
+        if not self.token and replay_file:
+            self.token = REPLAY_TOKEN
+
+        # 設定チェック
+        if not self.token:
+            logger.error(
+                "SLACK_TOKEN環境変数が設定されていません。"
+                "\n解決策: "
+                "\n1. .envファイルが存在することを確認してください"
+                "\n2. .env.sampleを.envにコピーして編集:"
+                "\n   cp .env.sample .env"
+                "\n3. .envファイルを編集し、有効なSlack APIトークンを設定してください"
+                "\n   詳しくは docs/slack_api_setup.md を参照してください"
+            )
+            sys.exit(1)
+
+        # API呼び出しは実行全体で1つの接続プールを共有する（記録・再生もここで行う）
+        if replay_file:
+            self.transport: PooledTransport = ReplayTransport(
+                replay_file, latency=replay_latency, pool_size=pool_size
+            )
+        elif record_file:
+            self.transport = RecordingTransport(record_file, pool_size=pool_size)
+        else:
+            self.transport = PooledTransport(pool_size=pool_size)
+
         # トークンの有効性を直接テスト
         try:
-            import requests
-
-            url = "https://slack.com/api/auth.test"
-            headers = {"Authorization": f"Bearer {self.token}"}
-            response = requests.post(url, headers=headers)
-            result = response.json()
+            _, _, body = self.transport.request(
+                "POST",
+                AUTH_TEST_URL,
+                b"",
+                {
+                    "Authorization": f"Bearer {self.token}",
+                    "Content-Type": "application/x-www-form-urlencoded",
+                },
+            )
+            result = loads(body)
 
             if result.get("ok"):
                 logger.info(
@@ -112,27 +176,15 @@ class SlackToBookmark:
         except Exception as e:
             logger.error(f"API認証テスト実行中にエラー: {e}")
 
-        # 設定チェック
-        if not self.token:
-            logger.error(
-                "SLACK_TOKEN環境変数が設定されていません。"
-                "\n解決策: "
-                "\n1. .envファイルが存在することを確認してください"
-                "\n2. .env.sampleを.envにコピーして編集:"
-                "\n   cp .env.sample .env"
-                "\n3. .envファイルを編集し、有効なSlack APIトークンを設定してください"
-                "\n   詳しくは docs/slack_api_setup.md を参照してください"
-            )
-            sys.exit(1)
-
         # 各クラスの初期化
         self.slack_client = SlackClient(
-            self.token, self.workspace_name, self.workspace_id
+            self.token, self.workspace_name, self.workspace_id, self.transport
         )
         self.bookmark_generator = BookmarkGenerator(
             self.workspace_name, self.workspace_id
         )
         self.guide_generator = GuideGenerator()
+        self.search_page_generator = SearchPageGenerator()
 
         logger.info("SlackToBookmark initialized")
 
@@ -142,6 +194,24 @@ class SlackToBookmark:
         public_only: bool = False,
         include_dm: bool = True,
         anonymize: bool = False,
+        verify: bool = False,
+        chrome_bookmarks_file: Optional[str] = None,
+        firefox_places_file: Optional[str] = None,
+        incremental: bool = False,
+        group_by_prefix: bool = False,
+        max_folder_size: int = 50,
+        max_folder_depth: int = 3,
+        shard_size: Optional[int] = None,
+        shard_by: str = "count",
+        exclude_archived: bool = False,
+        mine: bool = False,
+        min_page_size: int = 100,
+        max_page_size: int = 1000,
+        sort_memory_budget: Optional[int] = None,
+        readings_file: Optional[str] = None,
+        open_browser: bool = True,
+        search_page: bool = True,
+        formats: Sequence[str] = ("html",),
     ) -> bool:
         """
         メイン処理を実行
@@ -153,20 +223,66 @@ class SlackToBookmark:
         4. ブラウザでガイドページを表示（任意）
 
         Args:
-            channel_filter: 特定のチャンネル名のリスト（指定した場合はこれらのみを含む）
+            channel_filter: 特定のチャンネル名のリスト（指定した場合はこれらのみを含む。
+                globパターンや 're:' で始まる正規表現も指定可能）
             public_only: Trueの場合、公開チャンネルのみを対象とする
             include_dm: Trueの場合、ユーザーDMブックマークも生成する
+            anonymize: Trueの場合、生成されたファイルを匿名化する
+            verify: Trueの場合、匿名化後のファイルにマッピングの元の値が
+                残っていないかを検証し、残っていれば失敗扱いにする
+            chrome_bookmarks_file: 指定した場合、ChromeプロファイルのBookmarksファイルへ直接同期する
+            firefox_places_file: 指定した場合、Firefoxプロファイルの places.sqlite へ直接同期する
+            incremental: Trueの場合、前回からの差分ファイルと変更レポートも生成し、
+                内容に変更のないブックマークファイルの再書き込みを省略する
+            group_by_prefix: Trueの場合、チャンネルを名前のプレフィックスごとのフォルダに分ける
+            max_folder_size: フォルダ分け時に1フォルダへ直接置くチャンネル数の目安
+            max_folder_depth: フォルダ分け時の最大の階層数
+            shard_size: 指定した場合、ブックマークをこの件数ごとの番号付きファイルに分割する
+            shard_by: シャードの分割方式（"count": 件数順、"letter": 先頭文字ごと）
+            exclude_archived: Trueの場合、アーカイブ済みチャンネルをAPI側で除外する
+            mine: Trueの場合、トークンのユーザーが参加しているチャンネルだけを取得する
+            min_page_size: 一覧系APIのページサイズ（limit）の下限
+            max_page_size: 一覧系APIのページサイズ（limit）の上限（最初のページで使用）
+            sort_memory_budget: ユーザーの並べ替えでメモリ上に保持する件数の上限
+                （超えた分は一時ファイルに書き出す。省略時は既定値）
+            readings_file: 並べ替えに使う読み仮名辞書（JSON）のパス
+            open_browser: Trueの場合、チャンネルガイドページをブラウザで開く
+            search_page: Trueの場合、チャンネル・ユーザーの検索ページも生成する
+            formats: 出力形式のリスト（'html' に加えて 'json'、'csv'、'md' を指定すると、
+                同じ走査でそれぞれの形式のファイルも出力する）
 
         Returns:
             bool: 処理が成功した場合はTrue、失敗した場合はFalse
         """
         success = True
         generated_files = []
+        users: Iterable[Dict[str, Any]] = []
         try:
             logger.info(
                 f"Processing with options: channel_filter={channel_filter}, public_only={public_only}, include_dm={include_dm}"
             )
 
+            # チャンネル取得時の絞り込みはAPI側で行う
+            self.slack_client.exclude_archived = exclude_archived
+            self.slack_client.member_only = mine
+            self.slack_client.page_size_range = (min_page_size, max_page_size)
+            if sort_memory_budget:
+                self.slack_client.sort_memory_budget = sort_memory_budget
+            if readings_file:
+                configure_collator(readings_file)
+
+            self.bookmark_generator.extra_files = []
+
+            # ブックマークの生成と同時に検索ページ用のインデックスを作成する
+            self.bookmark_generator.search_index = (
+                SearchIndex() if search_page else None
+            )
+
+            # 差分出力用のマニフェストを読み込む（オプション。ウォッチモードでは
+            # 読み込み済みのマニフェストをメモリ上で使い続ける）
+            if incremental and self.bookmark_generator.manifest is None:
+                self.bookmark_generator.use_manifest("slack_export_manifest.json")
+
             # チャンネルの取得と出力
             if public_only:
                 logger.info("公開チャンネルのみを処理します")
@@ -184,7 +300,7 @@ class SlackToBookmark:
             # フィルタリング（指定があれば）
             if channel_filter:
                 logger.info(f"チャンネルフィルター適用: {', '.join(channel_filter)}")
-                channels = [ch for ch in channels if ch["name"] in channel_filter]
+                channels = ChannelFilter(channel_filter).apply(channels)
                 if not channels:
                     logger.warning(
                         "フィルターに一致するチャンネルが見つかりませんでした"
@@ -192,29 +308,51 @@ class SlackToBookmark:
 
             # チャンネルブックマークの生成
             if channels:
-                html_file_path = self.bookmark_generator.generate_channel_bookmarks(
-                    channels, output_file
-                )
-                if html_file_path:
-                    generated_files.append(html_file_path)
-                    # ガイドページの生成
-                    guide_path = self.guide_generator.create_guide(
-                        html_file_path, guide_file, is_public_only=is_public_only
+                if shard_size:
+                    html_files = (
+                        self.bookmark_generator.generate_sharded_channel_bookmarks(
+                            channels,
+                            output_file,
+                            shard_size,
+                            shard_by,
+                            group_by_prefix=group_by_prefix,
+                            max_folder_size=max_folder_size,
+                            max_depth=max_folder_depth,
+                            formats=formats,
+                        )
+                    )
+                else:
+                    html_file_path = self.bookmark_generator.generate_channel_bookmarks(
+                        channels,
+                        output_file,
+                        group_by_prefix=group_by_prefix,
+                        max_folder_size=max_folder_size,
+                        max_depth=max_folder_depth,
+                        formats=formats,
+                    )
+                    html_files = [html_file_path] if html_file_path else []
+                if html_files:
+                    generated_files.extend(html_files)
+                    # ガイドページの生成（シャード出力の場合はすべてのファイルを記載）
+                    guide_path = self._create_guide(
+                        html_files if shard_size else html_files[0],
+                        guide_file,
+                        is_public_only=is_public_only,
                     )
                     if guide_path:
                         generated_files.append(guide_path)
+                    # 圧縮して出力した場合はブラウザで開けないため省略する
+                    if (
+                        guide_path
+                        and open_browser
+                        and not get_output_writer().compression
+                    ):
                         # ブラウザでガイドページを開く
-                        try:
-                            guide_abs_path = os.path.abspath(guide_path)
-                            webbrowser.open(f"file://{guide_abs_path}")
+                        if open_in_browser(get_output_writer().path(guide_path)):
                             logger.info(
                                 f"チャンネルガイドページを開きました: {guide_path}"
                             )
-                        except Exception as e:
-                            logger.error(
-                                f"ブラウザでファイルを開く際にエラーが発生しました: {e}"
-                            )
-                    else:
+                    elif not guide_path:
                         logger.error("チャンネルガイドページの生成に失敗しました")
                         success = False
                 else:
@@ -226,20 +364,37 @@ class SlackToBookmark:
             # ユーザーDM用ブックマークの生成（オプション）
             if include_dm:
                 logger.info("ユーザーDM用ブックマークを生成します")
-                users = self.slack_client.get_all_users()
+                # 並べ替え済みのユーザーを（必要に応じて一時ファイルからマージしながら）読み出す
+                users = self.slack_client.get_sorted_users()
                 if users:
                     user_dm_output_file = "slack_user_dms.html"
-                    user_dm_html_file_path = (
-                        self.bookmark_generator.generate_user_dm_bookmarks(
-                            users, user_dm_output_file
+                    if shard_size:
+                        user_dm_html_files = (
+                            self.bookmark_generator.generate_sharded_user_dm_bookmarks(
+                                users,
+                                user_dm_output_file,
+                                shard_size,
+                                shard_by,
+                                formats=formats,
+                            )
                         )
-                    )
-                    if user_dm_html_file_path:
-                        generated_files.append(user_dm_html_file_path)
+                    else:
+                        user_dm_html_file_path = (
+                            self.bookmark_generator.generate_user_dm_bookmarks(
+                                users, user_dm_output_file, formats=formats
+                            )
+                        )
+                        user_dm_html_files = (
+                            [user_dm_html_file_path] if user_dm_html_file_path else []
+                        )
+                    if user_dm_html_files:
+                        generated_files.extend(user_dm_html_files)
                         # ユーザーDM用ガイドページの生成
                         user_guide_file = "user_dm_guide.html"
-                        user_guide_path = self.guide_generator.create_guide(
-                            user_dm_html_file_path, user_guide_file, is_user_dm=True
+                        user_guide_path = self._create_guide(
+                            user_dm_html_files if shard_size else user_dm_html_files[0],
+                            user_guide_file,
+                            is_user_dm=True,
                         )
                         if user_guide_path:
                             generated_files.append(user_guide_path)
@@ -263,23 +418,77 @@ class SlackToBookmark:
                 else:
                     logger.warning("処理対象のユーザーが見つかりませんでした")
 
+            # HTML以外の形式で出力したファイル
+            generated_files.extend(self.bookmark_generator.extra_files)
+
+            # 検索ページの生成
+            if search_page and self.bookmark_generator.search_index:
+                search_path = self._create_search_page("slack_search.html")
+                if search_path:
+                    generated_files.append(search_path)
+                else:
+                    success = False
+
+            # 前回からの差分ファイルと変更レポートの生成（オプション）
+            if incremental:
+                delta_path = self.bookmark_generator.generate_delta_bookmarks(
+                    channels,
+                    users if include_dm else None,
+                    "slack_delta.html",
+                    "slack_changes.json",
+                )
+                if delta_path:
+                    generated_files.append(delta_path)
+                    self.bookmark_generator.save_manifest()
+                else:
+                    logger.error("差分ブックマークの生成に失敗しました")
+                    success = False
+
+            # ChromeのBookmarksファイルへの直接同期（オプション）
+            if chrome_bookmarks_file:
+                if not self._sync_chrome_bookmarks(
+                    chrome_bookmarks_file, channels, users if include_dm else None
+                ):
+                    success = False
+
+            # Firefoxの places.sqlite への直接同期（オプション）
+            if firefox_places_file:
+                if not self._sync_firefox_places(
+                    firefox_places_file, channels, users if include_dm else None
+                ):
+                    success = False
+
+            # ページ取得のメトリクス（自動調整したページサイズ）を表示
+            self._log_page_metrics()
+
             # 結果のサマリーを表示
             if generated_files:
                 logger.info("処理が完了しました。以下のファイルが生成されました:")
+                writer = get_output_writer()
                 for f in generated_files:
-                    logger.info(f"- {f}")
+                    logger.info(f"- {writer.path(f)}")
 
                 # 匿名化処理（オプション）
                 if anonymize and generated_files:
+                    anonymizer = DataAnonymizer()
                     try:
                         logger.info("生成されたファイルを匿名化しています...")
-                        anonymizer = DataAnonymizer()
                         for file_path in generated_files:
+                            # 書き込みを省略したファイルは前回匿名化済みのためスキップ
+                            if file_path in self.bookmark_generator.skipped_files:
+                                continue
                             anonymizer.anonymize_file(file_path)
                         logger.info("すべてのファイルの匿名化が完了しました")
                     except Exception as e:
                         logger.error(f"匿名化処理中にエラーが発生しました: {e}")
                         # 匿名化が失敗してもメインプロセスは成功扱い
+
+                    # 匿名化の検証（オプション。元の値が残っていれば失敗扱い）
+                    if verify and anonymizer.verify_files(
+                        [writer.path(f) for f in generated_files]
+                    ):
+                        success = False
+                    anonymizer.close()
             else:
                 logger.warning("生成されたファイルはありません")
                 success = False
@@ -287,9 +496,229 @@ class SlackToBookmark:
         except Exception as e:
             logger.error(f"実行中にエラーが発生しました: {e}")
             success = False
+        finally:
+            # 並べ替えの一時ファイルを削除
+            close_users = getattr(users, "close", None)
+            if close_users is not None:
+                close_users()
+            # 置き換えた出力ファイルの名前の変更をまとめて永続化
+            get_output_writer().sync()
 
         return success
 
+    def watch(self, interval: float, **run_options: Any) -> bool:
+        """
+        ブックマークを一定間隔で更新し続ける（ウォッチモード）
+
+        SlackClient とその接続プール、前回の出力内容のマニフェストを
+        メモリ上に保持したまま run を繰り返すため、2回目以降の更新では
+        接続の確立とマニフェストの読み込みを省略し、内容が変わった
+        ブックマークファイルとそのガイドページだけを書き直します。
+        ブラウザでガイドページを開く処理は行いません。
+        SIGTERM/SIGINT を受け取ると、実行中の更新の完了を待って終了します。
+
+        Args:
+            interval: 更新間隔（秒）
+            **run_options: run に渡すオプション
+
+        Returns:
+            bool: 最後の更新が成功した場合はTrue
+        """
+        if self.bookmark_generator.manifest is None:
+            self.bookmark_generator.use_manifest("slack_export_manifest.json")
+        # 読み仮名辞書は一度だけ読み込み、並べ替えキーのキャッシュを更新間で使い回す
+        readings_file = run_options.pop("readings_file", None)
+        if readings_file:
+            configure_collator(readings_file)
+        run_options["open_browser"] = False
+        watcher = Watcher(lambda: self.run(**run_options), interval)
+        try:
+            return watcher.run()
+        finally:
+            self.transport.close()
+
+    def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        refresh_interval: float = 600,
+        public_only: bool = False,
+        include_dm: bool = True,
+        exclude_archived: bool = False,
+        mine: bool = False,
+    ) -> bool:
+        """
+        ブックマークファイルをHTTPで配信する（serve サブコマンド）
+
+        ディレクトリを refresh_interval 秒ごとにSlack APIから取得し直し、
+        リクエストにはキャッシュしたブックマークファイルを返します。
+        SIGTERM/SIGINT を受け取ると終了します。
+
+        Args:
+            host: 待ち受けるホスト名
+            port: 待ち受けるポート番号
+            refresh_interval: ディレクトリを取得し直す間隔（秒）
+            public_only: Trueの場合、公開チャンネルのみを配信する
+            include_dm: Trueの場合、ユーザーDMのブックマークも配信する
+            exclude_archived: Trueの場合、アーカイブ済みチャンネルをAPI側で除外する
+            mine: Trueの場合、トークンのユーザーが参加しているチャンネルだけを配信する
+
+        Returns:
+            bool: 最後のディレクトリの取得が成功した場合はTrue
+        """
+        self.slack_client.exclude_archived = exclude_archived
+        self.slack_client.member_only = mine
+        server = BookmarkServer(
+            self.slack_client,
+            self.bookmark_generator,
+            self.guide_generator,
+            host,
+            port,
+            public_only=public_only,
+            include_dm=include_dm,
+        )
+        try:
+            with server:
+                return Watcher(server.refresh, refresh_interval).run()
+        finally:
+            self.transport.close()
+
+    def _create_guide(
+        self, html_file_path: Union[str, List[str]], guide_file: str, **options: Any
+    ) -> str:
+        """
+        ガイドページを生成（参照するブックマークファイルがすべて前回から
+        変わっていない場合は生成を省略）
+
+        Args:
+            html_file_path: 参照するHTMLファイルのパス（シャード出力の場合はパスのリスト）
+            guide_file: 出力ファイル名
+            **options: GuideGenerator.create_guide に渡すオプション
+
+        Returns:
+            str: ガイドファイルのパス、エラー時は空文字列
+        """
+        html_files = (
+            [html_file_path] if isinstance(html_file_path, str) else html_file_path
+        )
+        skipped_files = self.bookmark_generator.skipped_files
+        if get_output_writer().exists(guide_file) and all(
+            f in skipped_files for f in html_files
+        ):
+            logger.info(f"内容に変更がないため書き込みを省略しました: {guide_file}")
+            skipped_files.add(guide_file)
+            return guide_file
+        skipped_files.discard(guide_file)
+        return self.guide_generator.create_guide(html_file_path, guide_file, **options)
+
+    def _create_search_page(self, output_file: str) -> str:
+        """
+        検索ページを生成（インデックスの内容が前回から変わっていない場合は生成を省略）
+
+        Args:
+            output_file: 出力ファイル名
+
+        Returns:
+            str: 検索ページのパス、エラー時は空文字列
+        """
+        generator = self.bookmark_generator
+        index = generator.search_index
+        manifest = generator.manifest
+        if manifest is not None:
+            digest = index.digest()
+            if manifest.is_file_unchanged(output_file, digest):
+                logger.info(
+                    f"内容に変更がないため書き込みを省略しました: {output_file}"
+                )
+                generator.skipped_files.add(output_file)
+                return output_file
+        generator.skipped_files.discard(output_file)
+        path = self.search_page_generator.create_page(
+            index, output_file, self.workspace_name
+        )
+        if path and manifest is not None:
+            manifest.record_file(output_file, digest)
+        return path
+
+    def _log_page_metrics(self) -> None:
+        """
+        APIメソッドごとのページ数・エラー数と自動調整したページサイズをログに出力
+        """
+        for api_method, summary in self.slack_client.metrics.items():
+            limits = summary["limits"]
+            logger.info(
+                f"{api_method}: {summary['pages']}ページ, {summary['items']}件, "
+                f"エラー {summary['errors']}回, {summary['seconds']}秒, "
+                f"ページサイズ {limits['first']} -> {limits['last']} "
+                f"(最小 {limits['min']}, 最大 {limits['max']})"
+            )
+
+    def _sync_chrome_bookmarks(
+        self,
+        bookmarks_file: str,
+        channels: List[Dict[str, Any]],
+        users: Optional[Iterable[Dict[str, Any]]],
+    ) -> bool:
+        """
+        チャンネルとDMのブックマークをChromeのBookmarksファイルへ直接マージ
+
+        Args:
+            bookmarks_file: Bookmarksファイルのパス
+            channels: チャンネル情報のリスト
+            users: ユーザー情報のリスト（Noneの場合はDMフォルダを更新しない）
+
+        Returns:
+            bool: 同期に成功した場合はTrue
+        """
+        try:
+            writer = ChromeBookmarkWriter(bookmarks_file)
+            writer.sync(
+                self.bookmark_generator.build_channel_entries(channels),
+                (
+                    self.bookmark_generator.build_user_entries(users)
+                    if users is not None
+                    else None
+                ),
+            )
+            logger.info(f"Chromeのブックマークを更新しました: {bookmarks_file}")
+            return True
+        except Exception as e:
+            logger.error(f"Chromeブックマークの同期中にエラーが発生しました: {e}")
+            return False
+
+    def _sync_firefox_places(
+        self,
+        places_file: str,
+        channels: List[Dict[str, Any]],
+        users: Optional[Iterable[Dict[str, Any]]],
+    ) -> bool:
+        """
+        チャンネルとDMのブックマークをFirefoxの places.sqlite へ直接マージ
+
+        Args:
+            places_file: places.sqlite のパス
+            channels: チャンネル情報のリスト
+            users: ユーザー情報のリスト（Noneの場合はDMフォルダを更新しない）
+
+        Returns:
+            bool: 同期に成功した場合はTrue
+        """
+        try:
+            writer = FirefoxPlacesWriter(places_file)
+            writer.sync(
+                self.bookmark_generator.build_channel_entries(channels),
+                (
+                    self.bookmark_generator.build_user_entries(users)
+                    if users is not None
+                    else None
+                ),
+            )
+            logger.info(f"Firefoxのブックマークを更新しました: {places_file}")
+            return True
+        except Exception as e:
+            logger.error(f"Firefoxブックマークの同期中にエラーが発生しました: {e}")
+            return False
+
 
 def create_parser() -> argparse.ArgumentParser:
     """
@@ -321,7 +750,20 @@ def create_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--channels",
         type=str,
-        help="処理対象のチャンネル名（カンマ区切り、例: 'general,random'）",
+        help="処理対象のチャンネル名（カンマ区切り、例: 'general,random'）。"
+        "globパターン（例: 'proj-*'）や 're:' で始まる正規表現（例: 're:^team-(dev|ops)$'）も指定可能",
+    )
+
+    parser.add_argument(
+        "--exclude-archived",
+        action="store_true",
+        help="アーカイブ済みチャンネルを除外する（Slack API側で絞り込む）",
+    )
+
+    parser.add_argument(
+        "--mine",
+        action="store_true",
+        help="自分が参加しているチャンネルだけを取得する（users.conversations を使用）",
     )
 
     parser.add_argument(
@@ -330,6 +772,197 @@ def create_parser() -> argparse.ArgumentParser:
         help="生成されたファイル内の機密情報（企業名、個人名など）を匿名化する",
     )
 
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="匿名化後のファイルにマッピングの元の値（ID、名前、企業名）が残っていないかを"
+        "検証し、残っていれば位置を表示して失敗扱いにする（--anonymize と併用）",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="前回実行からの差分ブックマーク（slack_delta.html）と変更レポート"
+        "（slack_changes.json）を生成し、変更のないファイルの再書き込みを省略する",
+    )
+
+    parser.add_argument(
+        "--group-by-prefix",
+        action="store_true",
+        help="チャンネルを名前のプレフィックス（'-'/'_'区切り）ごとの階層フォルダに分ける",
+    )
+
+    parser.add_argument(
+        "--max-folder-size",
+        type=int,
+        default=50,
+        help="フォルダ分け時に1フォルダへ直接置くチャンネル数の目安（デフォルト: 50）",
+    )
+
+    parser.add_argument(
+        "--max-folder-depth",
+        type=int,
+        default=3,
+        help="フォルダ分け時の最大の階層数（デフォルト: 3）",
+    )
+
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        metavar="N",
+        help="ブックマークをN件ごとの番号付きファイルに分割する（大規模ワークスペース向け）",
+    )
+
+    parser.add_argument(
+        "--shard-by",
+        choices=["count", "letter"],
+        default="count",
+        help="シャードの分割方式（count: 件数順、letter: 先頭文字ごと。デフォルト: count）",
+    )
+
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Slack APIとの通信で再利用するkeep-alive接続の最大数（デフォルト: 4）",
+    )
+
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record-cassette",
+        metavar="FILE",
+        help="Slack APIのレスポンス（auth.test、users.list、conversations.list など）を"
+        "応答時間とともにカセットファイル（gzip圧縮のJSON Lines）に記録する",
+    )
+    cassette_group.add_argument(
+        "--replay-cassette",
+        metavar="FILE",
+        help="Slack APIに接続せずに、カセットファイルに記録したレスポンスを再生する"
+        "（性能の調査やベンチマークを同じデータで繰り返し実行する用途。SLACK_TOKENは不要）",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        choices=list(REPLAY_LATENCIES),
+        default="original",
+        help="再生時の待ち時間（original: 記録した応答時間どおりに待つ、"
+        "zero: 待たずに返す。デフォルト: original）",
+    )
+
+    parser.add_argument(
+        "--min-page-size",
+        type=int,
+        default=100,
+        metavar="N",
+        help="一覧系APIのページサイズを自動調整する際の下限（デフォルト: 100）",
+    )
+
+    parser.add_argument(
+        "--max-page-size",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="一覧系APIのページサイズの上限。最初のページはこの件数で取得する（デフォルト: 1000）",
+    )
+
+    parser.add_argument(
+        "--sort-memory-budget",
+        type=int,
+        metavar="N",
+        help="ユーザーの並べ替えでメモリ上に保持する件数の上限。超えた分は一時ファイルに書き出して"
+        "マージする（デフォルト: 100000）",
+    )
+
+    parser.add_argument(
+        "--readings",
+        metavar="FILE",
+        help='名前を読みで並べ替えるための読み仮名辞書（{"表記": "読み"} 形式のJSON）',
+    )
+
+    parser.add_argument(
+        "--chrome-bookmarks",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="ChromeプロファイルのBookmarksファイルへ直接同期する"
+        "（PATH省略時は既定プロファイル。同期中はChromeを終了してください）",
+    )
+
+    parser.add_argument(
+        "--firefox-places",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Firefoxプロファイルの places.sqlite へ直接同期する"
+        "（PATH省略時は既定プロファイル。同期中はFirefoxを終了してください）",
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        metavar="DIR",
+        help="出力先ディレクトリ（デフォルト: カレントディレクトリ。存在しない場合は作成する）",
+    )
+
+    parser.add_argument(
+        "--compress",
+        choices=list(COMPRESSION_SUFFIXES),
+        help="出力ファイルを圧縮する（例: slack_user_dms.html.gz。"
+        "zstd を使うには zstandard をインストールしてください）",
+    )
+
+    parser.add_argument(
+        "--formats",
+        default="html",
+        metavar="FORMATS",
+        help=f"出力形式（カンマ区切り、html は必須。指定可能: {', '.join(SINK_TYPES)}）。"
+        "例: 'html,json,csv' でランチャー用のJSONと監査用のCSVも同時に出力する（デフォルト: html）",
+    )
+
+    parser.add_argument(
+        "--no-search-page",
+        action="store_true",
+        help="チャンネル・ユーザーの検索ページ（slack_search.html）を生成しない",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="ブックマークファイルをHTTPで配信する（オプションは serve の前に指定）",
+        description="チャンネル・ユーザーDMのブックマークとガイドページをHTTPで配信する",
+    )
+    serve_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="待ち受けるホスト名（デフォルト: 127.0.0.1。イントラネットに公開する場合は 0.0.0.0）",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="待ち受けるポート番号（デフォルト: 8000）",
+    )
+    serve_parser.add_argument(
+        "--refresh",
+        default="10m",
+        metavar="INTERVAL",
+        help="チャンネル・ユーザー一覧をSlackから取得し直す間隔（例: 30s, 10m, 1h。デフォルト: 10m）",
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="終了せずに一定間隔でブックマークを更新し続ける（SIGTERMで終了）",
+    )
+
+    parser.add_argument(
+        "--interval",
+        default="10m",
+        metavar="INTERVAL",
+        help="--watch の更新間隔（例: 30s, 10m, 1h。デフォルト: 10m）",
+    )
+
     return parser
 
 
@@ -342,6 +975,37 @@ def main():
     """
     parser = create_parser()
     args = parser.parse_args()
+    if not 1 <= args.min_page_size <= args.max_page_size:
+        parser.error(
+            "--min-page-size と --max-page-size は 1 <= 下限 <= 上限 である必要があります"
+        )
+    if args.sort_memory_budget is not None and args.sort_memory_budget < 1:
+        parser.error("--sort-memory-budget は1以上である必要があります")
+    try:
+        interval = parse_interval(args.interval)
+    except ValueError as e:
+        parser.error(f"--interval: {e}")
+    try:
+        formats = parse_formats(args.formats)
+    except ValueError as e:
+        parser.error(f"--formats: {e}")
+    if "html" not in formats:
+        parser.error("--formats には html を含める必要があります")
+    if args.verify and not args.anonymize:
+        parser.error("--verify は --anonymize と併用してください")
+    if args.replay_cassette and not os.path.exists(args.replay_cassette):
+        parser.error(
+            f"--replay-cassette: ファイルが見つかりません: {args.replay_cassette}"
+        )
+    try:
+        configure_output(args.output_dir, args.compress)
+    except ValueError as e:
+        parser.error(f"--compress: {e}")
+    if args.command == "serve":
+        try:
+            interval = parse_interval(args.refresh)
+        except ValueError as e:
+            parser.error(f"--refresh: {e}")
 
     # 開始メッセージ
     logger.info(f"Slack to Bookmark v{__version__} を開始します")
@@ -351,14 +1015,65 @@ def main():
     if args.channels:
         channel_filter = [ch.strip() for ch in args.channels.split(",") if ch.strip()]
 
+    # Chromeブックマークの同期先（パス省略時は既定プロファイル）
+    chrome_bookmarks_file = args.chrome_bookmarks
+    if chrome_bookmarks_file == "":
+        chrome_bookmarks_file = default_bookmarks_path()
+
+    # Firefoxブックマークの同期先（パス省略時は既定プロファイル）
+    firefox_places_file = args.firefox_places
+    if firefox_places_file == "":
+        firefox_places_file = default_places_path()
+
     # メインクラスのインスタンス化と実行
-    app = SlackToBookmark()
-    success = app.run(
+    app = SlackToBookmark(
+        pool_size=args.pool_size,
+        record_file=args.record_cassette,
+        replay_file=args.replay_cassette,
+        replay_latency=args.replay_latency,
+    )
+    if args.command == "serve":
+        success = app.serve(
+            host=args.host,
+            port=args.port,
+            refresh_interval=interval,
+            public_only=args.public_only,
+            include_dm=not args.no_dm,
+            exclude_archived=args.exclude_archived,
+            mine=args.mine,
+        )
+        sys.exit(0 if success else 1)
+
+    run_options = dict(
         channel_filter=channel_filter,
         public_only=args.public_only,
         include_dm=not args.no_dm,
         anonymize=args.anonymize,
+        verify=args.verify,
+        chrome_bookmarks_file=chrome_bookmarks_file,
+        firefox_places_file=firefox_places_file,
+        incremental=args.incremental,
+        group_by_prefix=args.group_by_prefix,
+        max_folder_size=args.max_folder_size,
+        max_folder_depth=args.max_folder_depth,
+        shard_size=args.shard_size,
+        shard_by=args.shard_by,
+        exclude_archived=args.exclude_archived,
+        mine=args.mine,
+        min_page_size=args.min_page_size,
+        max_page_size=args.max_page_size,
+        sort_memory_budget=args.sort_memory_budget,
+        readings_file=args.readings,
+        search_page=not args.no_search_page,
+        formats=formats,
     )
+    if args.watch:
+        success = app.watch(interval, **run_options)
+    else:
+        try:
+            success = app.run(**run_options)
+        finally:
+            app.transport.close()
 
     # 終了メッセージ
     if success:
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Term Matcher Module - 多数の語句の一括検索・置換（Aho-Corasick法）を担当するモジュール
+
+匿名化のマッピングファイルには数千件の企業名・個人名が蓄積されます。
+語句ごとに `in` や str.replace で文字列を走査すると、処理時間は
+「文字列の長さ × 語句の数」に比例して増えます。
+このモジュールは、語句の一覧から一度だけ Aho-Corasick オートマトンを作成し、
+文字列を1回走査するだけで、含まれるすべての語句を検索・置換します。
+走査にかかる時間は語句の数によらず、文字列の長さ（と見つかった語句の数）に比例します。
+
+同じ位置から複数の語句が一致する場合は、最も左から始まる最も長い語句を採用し
+（leftmost-longest）、置換した範囲は重ならないようにします。
+"""
+
+from collections import deque
+from typing import Dict, List, Mapping, Tuple
+
+
+class TermMatcher:
+    """語句の一覧から作成した Aho-Corasick オートマトン
+
+    状態はトライの節点の番号で表し、節点ごとに次の情報を持ちます。
+
+    - goto: 文字から次の節点への遷移
+    - fail: 遷移できない場合に戻る節点（現在の文字列の最長の真の接尾辞に対応する節点）
+    - length: その節点が表す語句の長さ（語句の終わりでなければ0）
+    - output: 接尾辞をたどって最初に見つかる語句の終わりの節点（なければ0）
+    """
+
+    def __init__(self, terms: Mapping[str, str]):
+        """
+        TermMatcherの初期化（オートマトンを作成）
+
+        Args:
+            terms: 検索する語句と置換後の文字列（空文字列の語句は無視する）
+        """
+        self.terms: Dict[str, str] = {term: terms[term] for term in terms if term}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._length: List[int] = [0]
+        self._output: List[int] = [0]
+
+        # トライを作成
+        for term in self.terms:
+            node = 0
+            for char in term:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._length.append(0)
+                    self._output.append(0)
+                node = next_node
+            self._length[node] = len(term)
+
+        # 幅優先で失敗遷移と、接尾辞で終わる語句への出力リンクを設定
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail
+                self._output[child] = fail if self._length[fail] else self._output[fail]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def find(self, text: str) -> List[Tuple[int, int]]:
+        """
+        文字列に含まれる語句の位置を検索
+
+        Args:
+            text: 検索する文字列
+
+        Returns:
+            List[Tuple[int, int]]: 重ならない一致範囲 (開始位置, 終了位置) のリスト（昇順）
+        """
+        goto = self._goto
+        fail = self._fail
+        length = self._length
+        output = self._output
+        matches: List[Tuple[int, int]] = []
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            # この位置で終わる語句を長い順（= 左から始まる順）に調べる
+            found = node if length[node] else output[node]
+            while found:
+                start = end - length[found]
+                # 先に採用した語句のうち、この語句に含まれるものは置き換える
+                keep = len(matches)
+                while keep and matches[keep - 1][0] >= start:
+                    keep -= 1
+                if not keep or matches[keep - 1][1] <= start:
+                    del matches[keep:]
+                    matches.append((start, end))
+                    break
+                # より左から始まる語句と重なる場合は、短い語句を調べる
+                found = output[found]
+        return matches
+
+    def replace(self, text: str) -> str:
+        """
+        文字列に含まれる語句を、1回の走査で対応する置換後の文字列に置き換える
+
+        Args:
+            text: 処理対象の文字列
+
+        Returns:
+            str: 置換後の文字列
+        """
+        matches = self.find(text)
+        if not matches:
+            return text
+        terms = self.terms
+        parts = []
+        previous = 0
+        for start, end in matches:
+            parts.append(text[previous:start])
+            parts.append(terms[text[start:end]])
+            previous = end
+        parts.append(text[previous:])
+        return "".join(parts)
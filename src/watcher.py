@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Watcher Module - ブックマークを一定間隔で更新し続ける常駐実行を担当するモジュール
+
+cron でCLIを定期実行すると、実行のたびにプロセスの起動、Slack APIへの
+接続の確立、前回の出力内容の読み込みをやり直すことになります。
+このモジュールは、1回分の更新処理を指定した間隔で繰り返し呼び出し、
+SIGTERM/SIGINT を受け取ったら実行中の更新の完了を待って終了する
+ウォッチャーを提供します。待機中は threading.Event で停止を待つだけのため、
+CPUをほとんど使用しません。
+"""
+
+import gc
+import logging
+import re
+import signal
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# ロギング設定
+logger = logging.getLogger("slack_to_bookmark")
+
+# 間隔の単位と秒数
+INTERVAL_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+# ウォッチャーが停止要求として扱うシグナル
+STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+def parse_interval(text: str) -> float:
+    """
+    更新間隔の文字列を秒数に変換
+
+    Args:
+        text: 間隔（例: '90', '30s', '10m', '1.5h'）
+
+    Returns:
+        float: 秒数
+
+    Raises:
+        ValueError: 形式が不正な場合、または0以下の場合
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", text.lower())
+    if not match:
+        raise ValueError(f"更新間隔の形式が不正です: {text}（例: 30s, 10m, 1h）")
+    seconds = float(match.group(1)) * INTERVAL_UNITS[match.group(2)]
+    if seconds <= 0:
+        raise ValueError("更新間隔は0より大きい必要があります")
+    return seconds
+
+
+class Watcher:
+    """更新処理を一定間隔で繰り返し実行するウォッチャー
+
+    更新処理は前回の開始時刻から interval 秒ごとに呼び出されます
+    （更新処理が interval より長くかかった場合は、終了後すぐに次を開始します）。
+    stop が呼ばれるか、停止シグナルを受け取ると、実行中の更新処理の完了を
+    待ってから終了します。2回目のシグナルでは KeyboardInterrupt を発生させ、
+    更新処理の完了を待たずに終了します。
+    """
+
+    def __init__(self, run_cycle: Callable[[], bool], interval: float):
+        """
+        Watcherの初期化
+
+        Args:
+            run_cycle: 1回分の更新処理（成功した場合はTrueを返す）
+            interval: 更新間隔（秒）
+
+        Raises:
+            ValueError: intervalが0以下の場合
+        """
+        if interval <= 0:
+            raise ValueError("更新間隔は0より大きい必要があります")
+        self.run_cycle = run_cycle
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.cycles = 0
+        self.failures = 0
+
+    def stop(self) -> None:
+        """
+        ウォッチャーに停止を要求（実行中の更新処理は完了まで続く）
+        """
+        self.stop_event.set()
+
+    def _handle_signal(self, signum: int, frame) -> None:
+        """
+        停止シグナルのハンドラー
+        """
+        if self.stop_event.is_set():
+            raise KeyboardInterrupt
+        logger.info(
+            f"シグナル {signal.Signals(signum).name} を受け取りました。"
+            "実行中の更新が完了したら終了します"
+        )
+        self.stop()
+
+    def _install_signal_handlers(self) -> Dict[int, object]:
+        """
+        停止シグナルのハンドラーを設定し、元のハンドラーを返す
+
+        シグナルハンドラーはメインスレッドでのみ設定できるため、
+        それ以外のスレッドから実行した場合は設定しません（stop で停止します）。
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+        return {
+            signum: signal.signal(signum, self._handle_signal)
+            for signum in STOP_SIGNALS
+        }
+
+    def run(self, max_cycles: Optional[int] = None) -> bool:
+        """
+        停止が要求されるまで更新処理を繰り返す
+
+        Args:
+            max_cycles: 更新処理の最大回数（省略時は停止が要求されるまで）
+
+        Returns:
+            bool: 最後の更新処理が成功した場合はTrue
+        """
+        previous_handlers = self._install_signal_handlers()
+        success = True
+        logger.info(f"ウォッチモードを開始します（更新間隔: {self.interval:g}秒）")
+        try:
+            while not self.stop_event.is_set():
+                started = time.monotonic()
+                try:
+                    success = bool(self.run_cycle())
+                except Exception as e:
+                    logger.error(f"更新処理中にエラーが発生しました: {e}")
+                    success = False
+                self.cycles += 1
+                if not success:
+                    self.failures += 1
+                elapsed = time.monotonic() - started
+                logger.info(
+                    f"更新 {self.cycles}回目が完了しました（{elapsed:.1f}秒, "
+                    f"{'成功' if success else '失敗'}）"
+                )
+                if max_cycles is not None and self.cycles >= max_cycles:
+                    break
+
+                # 待機中のメモリ使用量を抑えるため、更新で生じた循環参照を回収する
+                gc.collect()
+                self.stop_event.wait(max(0.0, self.interval - elapsed))
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+        logger.info(
+            f"ウォッチモードを終了します（更新 {self.cycles}回, 失敗 {self.failures}回）"
+        )
+        return success
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+ブックマークのライブラリAPIのテストモジュール
+
+BookmarkRendererによるメモリ上でのブックマーク一式の作成をテストします。
+"""
+
+import os
+import sys
+import io
+import json
+from unittest.mock import patch
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bookmark_renderer import BookmarkRenderer
+
+
+class TestBookmarkRenderer:
+    """BookmarkRendererクラスのテスト"""
+
+    def test_render_returns_artifacts_without_disk_io(self):
+        """ファイルを開かずにブックマーク・ガイド・検索ページの内容が返されることをテスト"""
+        # テストデータ
+        channels = [
+            {"id": "C2", "name": "random"},
+            {"id": "C1", "name": "general"},
+            {"id": "C3", "name": "secret", "is_private": True},
+        ]
+        users = [
+            {"id": "U1", "profile": {"real_name": "Taro"}},
+            {"id": "B1", "is_bot": True, "profile": {"real_name": "bot"}},
+        ]
+        renderer = BookmarkRenderer("test-workspace", "T12345678")
+
+        # テスト実行
+        with patch("builtins.open") as mock_open:
+            artifacts = renderer.render(
+                channels, users, public_only=True, formats=("html", "json")
+            )
+
+        # 検証
+        mock_open.assert_not_called()
+        assert list(artifacts) == [
+            "slack_public_channels.html",
+            "slack_public_channels.json",
+            "public_channel_guide.html",
+            "slack_user_dms.html",
+            "slack_user_dms.json",
+            "user_dm_guide.html",
+            "slack_search.html",
+        ]
+        items = json.loads(bytes(artifacts["slack_public_channels.json"].data))["items"]
+        assert [item["id"] for item in items] == ["C1", "C2"]
+        users_json = json.loads(bytes(artifacts["slack_user_dms.json"].data))
+        assert [item["id"] for item in users_json["items"]] == ["U1"]
+        assert artifacts["slack_public_channels.json"].content_type.startswith(
+            "application/json"
+        )
+
+    def test_write_to_stream(self):
+        """作成した内容を呼び出し元のストリームに書き込めることをテスト"""
+        # テストデータ
+        renderer = BookmarkRenderer("test-workspace", "T12345678")
+        artifacts = renderer.render(
+            [{"id": "C1", "name": "general"}], guides=False, search_page=False
+        )
+        stream = io.BytesIO()
+
+        # テスト実行
+        size = artifacts["slack_all_channels.html"].write_to(stream)
+
+        # 検証
+        assert list(artifacts) == ["slack_all_channels.html"]
+        assert size == len(stream.getvalue())
+        assert "#general" in stream.getvalue().decode("utf-8")
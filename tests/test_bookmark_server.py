@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+ブックマーク配信サーバーのテストモジュール
+"""
+
+import gzip
+import http.client
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from urllib.parse import urlsplit
+
+import pytest
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bookmark_generator import BookmarkGenerator
+from src.bookmark_server import BookmarkServer
+from src.guide_generator import GuideGenerator
+
+
+def fetch(server, path, headers=None):
+    """サーバーにGETリクエストを送り (ステータス, ヘッダー, 本文) を返す"""
+    url = urlsplit(server.url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=10)
+    try:
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, response.headers, response.read()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def server():
+    """ディレクトリ取得前のサーバー"""
+    slack_client = MagicMock()
+    slack_client.get_all_channels.return_value = [
+        {"id": f"C{i:03d}", "name": f"proj-{i}", "is_private": False}
+        for i in range(200)
+    ] + [{"id": "C999", "name": "general", "is_private": False}]
+    slack_client.get_all_users.return_value = [
+        {"id": "U001", "profile": {"real_name": "山田 太郎", "display_name": "yamada"}}
+    ]
+    with BookmarkServer(
+        slack_client,
+        BookmarkGenerator("test-workspace", "T12345678"),
+        GuideGenerator(),
+        port=0,
+    ) as bookmark_server:
+        yield bookmark_server
+
+
+class TestBookmarkServer:
+    """BookmarkServerクラスのテスト"""
+
+    def test_etag_gzip_and_not_modified(self, server):
+        """gzip圧縮したレスポンスにETagが付き、If-None-Matchで304が返ることをテスト"""
+        # ディレクトリ取得前は503
+        assert fetch(server, "/channels.html")[0] == 503
+        assert server.refresh()
+
+        # テスト実行
+        status, headers, body = fetch(
+            server, "/channels.html", {"Accept-Encoding": "gzip"}
+        )
+        etag = headers["ETag"]
+        not_modified = fetch(server, "/channels.html", {"If-None-Match": etag})
+
+        # 検証
+        assert status == 200
+        assert headers["Content-Encoding"] == "gzip"
+        html = gzip.decompress(body).decode("utf-8")
+        assert "slack://channel?team=T12345678&id=C999" in html
+        assert not_modified[0] == 304
+        assert not_modified[1]["ETag"] == etag
+        assert not_modified[2] == b""
+        assert fetch(server, "/missing.html")[0] == 404
+
+    def test_concurrent_requests_render_once(self, server):
+        """同時リクエストでも (フィルター, 形式) ごとに1回だけ作成されることをテスト"""
+        # セットアップ
+        server.refresh()
+        paths = ["/channels.json?filter=general", "/dms.html"] * 20
+
+        # テスト実行
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda path: fetch(server, path), paths))
+        server.refresh()
+        after_refresh = fetch(server, "/dms.html")
+
+        # 検証
+        assert all(status == 200 for status, _, _ in results)
+        assert b'"title": "#general"' in results[0][2]
+        assert server.renders == 2
+        # ディレクトリの内容が変わらなければキャッシュとETagを使い続ける
+        assert after_refresh[1]["ETag"] == results[1][1]["ETag"]
+        assert server.renders == 2
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+複数形式の出力（シンク）機能のテストモジュール
+"""
+
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bookmark_generator import BookmarkGenerator
+from src.bookmark_sinks import SINK_TYPES, BookmarkSink, parse_formats, register_sink
+
+
+class TestBookmarkSinks:
+    """BookmarkGeneratorの複数形式出力のテスト"""
+
+    def test_users_are_read_once_for_all_formats(self, tmp_path):
+        """1回しか読めないユーザーの並びからすべての形式のファイルが出力されることをテスト"""
+        # セットアップ
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        users = iter(
+            [
+                {"id": "U1", "profile": {"real_name": "A [x]", "display_name": ""}},
+                {
+                    "id": "U2",
+                    "profile": {"real_name": "山田, 太郎", "display_name": ""},
+                },
+            ]
+        )
+        output_file = str(tmp_path / "slack_user_dms.html")
+
+        # テスト実行
+        result = generator.generate_user_dm_bookmarks(
+            users, output_file, formats=["html", "json", "csv", "md"]
+        )
+
+        # 検証
+        assert result == output_file
+        assert generator.extra_files == [
+            str(tmp_path / "slack_user_dms.json"),
+            str(tmp_path / "slack_user_dms.csv"),
+            str(tmp_path / "slack_user_dms.md"),
+        ]
+        with open(generator.extra_files[0], encoding="utf-8") as f:
+            feed = json.load(f)
+        assert feed["folder"] == "Slack Users"
+        assert [item["id"] for item in feed["items"]] == ["U1", "U2"]
+        assert feed["items"][1]["url"] == "slack://user?team=T12345678&id=U2"
+        with open(generator.extra_files[1], encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["folder", "id", "title", "url"]
+        assert rows[2][:3] == ["Slack Users", "U2", "山田, 太郎"]
+        with open(generator.extra_files[2], encoding="utf-8") as f:
+            assert "- [A \\[x\\]](<slack://user?team=T12345678&id=U1>)" in f.read()
+
+    def test_register_and_parse_formats(self, tmp_path):
+        """独自の形式を登録して出力でき、未対応の形式はエラーになることをテスト"""
+
+        # セットアップ
+        class TsvSink(BookmarkSink):
+            extension = ".tsv"
+
+            def write_entry(self, record_id, title, url):
+                self.file.write(f"{record_id}\t{title}\t{url}\n")
+
+        register_sink("tsv", TsvSink)
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        channels = [
+            {"id": "C2", "name": "random", "is_private": False},
+            {"id": "C1", "name": "general", "is_private": False},
+        ]
+
+        try:
+            # テスト実行
+            formats = parse_formats("html, TSV,html")
+            generator.generate_channel_bookmarks(
+                channels, str(tmp_path / "c.html"), formats=formats
+            )
+
+            # 検証
+            assert formats == ["html", "tsv"]
+            with open(tmp_path / "c.tsv", encoding="utf-8") as f:
+                assert f.read().splitlines()[0].startswith("C1\t#general\t")
+            with pytest.raises(ValueError, match="未対応の出力形式です: xml"):
+                parse_formats("html,xml")
+        finally:
+            del SINK_TYPES["tsv"]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Slack APIレスポンスの記録・再生機能のテストモジュール
+
+RecordingTransportによる記録と、ReplayTransportによる通信なしの再生をテストします。
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+
+import pytest
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.mock_slack_server import MockSlackServer
+from src.cassette import CASSETTE_VERSION, RecordingTransport, ReplayTransport
+from src.slack_client import SlackClient
+
+
+class TestCassette:
+    """RecordingTransport・ReplayTransportクラスのテスト"""
+
+    def test_recorded_crawl_replays_offline(self, tmp_path):
+        """記録したクロールが、サーバーを停止した後に同じ結果で再生されることをテスト"""
+        # セットアップ
+        cassette_file = str(tmp_path / "crawl.jsonl.gz")
+        recorder = RecordingTransport(cassette_file)
+        with MockSlackServer(users=120, channels=90, page_limit=50) as server:
+            base_url = server.base_url
+            client = SlackClient("xoxp-test", "test", "T00000000", recorder)
+            client.client.base_url = base_url
+            recorder.request("POST", base_url + "auth.test", b"")
+            users = client.get_all_users()
+            channels = client.get_all_channels()
+            requests = server.requests
+        recorder.close()
+
+        # テスト実行
+        player = ReplayTransport(cassette_file, latency="zero")
+        client = SlackClient("xoxp-other", "test", "T00000000", player)
+        client.client.base_url = base_url
+        _, _, auth_body = player.request("POST", base_url + "auth.test", b"")
+        # ページサイズが記録時と異なっても、カーソルで対応するページを返す
+        client.page_size_range = (10, 20)
+        replayed_users = client.get_all_users()
+        replayed_channels = client.get_all_channels()
+
+        # 検証
+        assert recorder.recorded == requests == player.replayed
+        assert json.loads(auth_body)["team_id"] == "T00000000"
+        assert replayed_users == users
+        assert replayed_channels == channels
+        with gzip.open(cassette_file, "rt", encoding="utf-8") as f:
+            assert "xoxp-test" not in f.read()
+
+    def test_replay_honors_original_latency(self, tmp_path):
+        """記録した応答時間どおりに待ち、記録のないリクエストはエラーになることをテスト"""
+        # テストデータ
+        cassette_file = tmp_path / "slow.jsonl.gz"
+        record = {
+            "method": "POST",
+            "path": "/api/users.list",
+            "params": [],
+            "status": 200,
+            "headers": [["Content-Type", "application/json; charset=utf-8"]],
+            "body": '{"ok": true, "members": []}',
+            "elapsed": 0.2,
+        }
+        with gzip.open(cassette_file, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"cassette": CASSETTE_VERSION}) + "\n")
+            f.write(json.dumps(record) + "\n")
+        url = "https://slack.com/api/users.list"
+
+        # テスト実行
+        original = ReplayTransport(str(cassette_file))
+        started = time.perf_counter()
+        status, headers, body = original.request("POST", url, b"limit=1000")
+        original_elapsed = time.perf_counter() - started
+        zero = ReplayTransport(str(cassette_file), latency="zero")
+        started = time.perf_counter()
+        zero.request("POST", url, b"limit=200")
+        zero_elapsed = time.perf_counter() - started
+
+        # 検証
+        assert status == 200
+        assert headers.get_content_type() == "application/json"
+        assert body == b'{"ok": true, "members": []}'
+        assert original_elapsed >= 0.2
+        assert zero_elapsed < 0.1
+        with pytest.raises(LookupError):
+            zero.request("POST", url, b"cursor=abc")
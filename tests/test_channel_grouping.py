@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+チャンネルのプレフィックスによるフォルダ分け機能のテストモジュール
+"""
+
+import os
+import sys
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.channel_grouping import ChannelTrie
+from src.bookmark_generator import BookmarkGenerator
+
+
+class TestChannelTrie:
+    """ChannelTrieクラスのテスト"""
+
+    def test_build_folders_splits_large_prefixes(self):
+        """上限を超えるプレフィックスだけがフォルダに分割されることをテスト"""
+        # テストデータ
+        names = ["proj-a", "proj-b", "proj-c", "team_x", "team_y", "general"]
+        trie = ChannelTrie()
+        for name in names:
+            trie.insert(name, (f"#{name}", f"slack://{name}"))
+
+        # テスト実行
+        folders = trie.build_folders(max_folder_size=2, max_depth=2)
+
+        # 検証
+        assert folders[0] == ("#general", "slack://general")
+        assert folders[1][0] == "proj"
+        assert [title for title, _ in folders[1][1]] == [
+            "#proj-a",
+            "#proj-b",
+            "#proj-c",
+        ]
+        assert folders[2][0] == "team"
+        assert [title for title, _ in folders[2][1]] == ["#team_x", "#team_y"]
+
+    def test_small_trie_stays_flat(self):
+        """エントリ数が上限以下の場合はフォルダを作らないことをテスト"""
+        # テストデータ
+        trie = ChannelTrie()
+        trie.insert("proj-a", ("#proj-a", "slack://a"))
+        trie.insert("proj-b", ("#proj-b", "slack://b"))
+
+        # テスト実行と検証
+        assert trie.build_folders(max_folder_size=10) == [
+            ("#proj-a", "slack://a"),
+            ("#proj-b", "slack://b"),
+        ]
+
+
+class TestGroupedChannelBookmarks:
+    """プレフィックスによるフォルダ分けを有効にしたブックマーク生成のテスト"""
+
+    def test_generate_channel_bookmarks_with_nested_folders(self, tmp_path):
+        """入れ子の<DL>フォルダが出力されることをテスト"""
+        # テストデータ
+        output_file = str(tmp_path / "channels.html")
+        channels = [{"id": f"C{i}", "name": f"proj-{i}"} for i in range(3)]
+        channels.append({"id": "C9", "name": "general"})
+
+        # テスト実行
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        generator.generate_channel_bookmarks(
+            channels, output_file, group_by_prefix=True, max_folder_size=2
+        )
+
+        # 検証
+        with open(output_file, encoding="utf-8") as f:
+            html = f.read()
+        assert html.count("<DL><p>") == 3
+        assert html.count("</DL><p>") == 3
+        assert ">proj</H3>" in html
+        assert "#proj-0" in html
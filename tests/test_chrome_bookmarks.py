@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Chrome Bookmarks書き込み機能のテストモジュール
+
+ChromeBookmarkWriterによる Bookmarks ファイルへの差分マージをテストします。
+"""
+
+import os
+import sys
+import json
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.chrome_bookmarks import ChromeBookmarkWriter, compute_checksum
+
+
+class TestChromeBookmarkWriter:
+    """ChromeBookmarkWriterクラスのテスト"""
+
+    def test_sync_creates_file_with_valid_checksum(self, tmp_path):
+        """Bookmarksファイルが新規作成され、チェックサムが設定されることをテスト"""
+        # テストデータ
+        bookmarks_file = str(tmp_path / "Bookmarks")
+        entries = [("#general", "slack://channel?team=T1&id=C1")]
+
+        # テスト実行
+        writer = ChromeBookmarkWriter(bookmarks_file)
+        stats = writer.sync(entries, [("Taro", "slack://user?team=T1&id=U1")])
+
+        # 検証
+        with open(bookmarks_file, encoding="utf-8") as f:
+            data = json.load(f)
+        folders = data["roots"]["bookmark_bar"]["children"]
+        assert [folder["name"] for folder in folders] == ["Slack", "Slack Users"]
+        assert folders[0]["children"][0]["url"] == entries[0][1]
+        assert data["checksum"] == compute_checksum(data["roots"])
+        assert stats == {"added": 2, "renamed": 0, "removed": 0}
+
+    def test_resync_only_applies_changes(self, tmp_path):
+        """再同期では追加・名前変更・削除の差分だけが反映されることをテスト"""
+        # テストデータ
+        bookmarks_file = str(tmp_path / "Bookmarks")
+        writer = ChromeBookmarkWriter(bookmarks_file)
+        writer.sync(
+            [
+                ("#general", "slack://channel?team=T1&id=C1"),
+                ("#random", "slack://channel?team=T1&id=C2"),
+            ]
+        )
+        with open(bookmarks_file, encoding="utf-8") as f:
+            before = json.load(f)
+        general_id = before["roots"]["bookmark_bar"]["children"][0]["children"][0]["id"]
+
+        # テスト実行
+        stats = writer.sync(
+            [
+                ("#general-renamed", "slack://channel?team=T1&id=C1"),
+                ("#new", "slack://channel?team=T1&id=C3"),
+            ]
+        )
+
+        # 検証
+        with open(bookmarks_file, encoding="utf-8") as f:
+            after = json.load(f)
+        folders = after["roots"]["bookmark_bar"]["children"]
+        assert len(folders) == 1
+        children = folders[0]["children"]
+        assert [child["name"] for child in children] == ["#general-renamed", "#new"]
+        assert children[0]["id"] == general_id
+        assert stats == {"added": 1, "renamed": 1, "removed": 1}
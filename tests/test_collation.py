@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+並べ替えキー（照合）機能のテストモジュール
+"""
+
+import os
+import sys
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.collation import Collator
+
+
+class TestCollator:
+    """Collatorクラスのテスト"""
+
+    def test_key_orders_width_kana_and_accents(self):
+        """全角・半角、ひらがな・カタカナ、アクセント付き文字が近くに並ぶことをテスト"""
+        # テストデータ
+        names = [
+            "Zoe",
+            "émile",
+            "Emma",
+            "ｅｍｉ",
+            "カトウ",
+            "いとう",
+            "Éclair",
+            "eclair",
+        ]
+
+        # テスト実行
+        result = sorted(names, key=Collator().key)
+
+        # 検証
+        assert result == [
+            "eclair",
+            "Éclair",
+            "ｅｍｉ",
+            "émile",
+            "Emma",
+            "Zoe",
+            "いとう",
+            "カトウ",
+        ]
+
+    def test_readings_and_cache(self):
+        """読み仮名辞書で漢字の名前が読みの位置に並び、キーがキャッシュされることをテスト"""
+        # セットアップ
+        collator = Collator({"山田": "やまだ", "伊藤": "イトウ"})
+
+        # テスト実行
+        result = sorted(["やまもと", "山田 太郎", "伊藤", "かとう"], key=collator.key)
+
+        # 検証
+        assert result == ["伊藤", "かとう", "山田 太郎", "やまもと"]
+        assert collator.key("伊藤") is collator.key("伊藤")
+        assert len(collator._cache) == 4
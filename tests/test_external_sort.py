@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+外部マージソートによる並べ替え機能のテストモジュール
+"""
+
+import os
+import random
+import sys
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bookmark_generator import BookmarkGenerator
+from src.external_sort import ExternalSorter, user_sort_key
+
+
+class TestExternalSorter:
+    """ExternalSorterクラスのテスト"""
+
+    def test_spilled_runs_merge_in_order(self, tmp_path):
+        """ランを一時ファイルに書き出した場合もメモリ上と同じ順序になることをテスト"""
+        # テストデータ
+        rng = random.Random(0)
+        users = [
+            {
+                "id": f"U{i}",
+                "profile": {"display_name": rng.choice(["", f"u{rng.randint(0, 50)}"])},
+            }
+            for i in range(500)
+        ]
+        for user in users:
+            user["profile"]["real_name"] = f"Name {user['id']}"
+
+        # テスト実行
+        sorter = ExternalSorter(
+            user_sort_key, max_items_in_memory=64, temp_dir=str(tmp_path)
+        )
+        for start in range(0, len(users), 100):
+            sorter.add(users[start : start + 100])
+
+        # 検証（安定ソートの結果と一致し、何度でも反復できる）
+        expected = sorted(users, key=user_sort_key)
+        assert len(sorter.run_files) == 5
+        assert list(sorter) == expected
+        assert list(sorter) == expected
+        assert len(sorter) == 500
+
+        sorter.close()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_generate_channel_bookmarks_does_not_mutate_input(self, tmp_path):
+        """チャンネルブックマークの生成で呼び出し元のリストが変更されないことをテスト"""
+        # テストデータ
+        channels = [{"id": "C2", "name": "random"}, {"id": "C1", "name": "General"}]
+        original = list(channels)
+
+        # テスト実行
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        generator.generate_channel_bookmarks(channels, str(tmp_path / "channels.html"))
+
+        # 検証
+        assert channels == original
+        html = (tmp_path / "channels.html").read_text(encoding="utf-8")
+        assert html.index("#General") < html.index("#random")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Firefox places.sqlite 書き込み機能のテストモジュール
+
+FirefoxPlacesWriterによる places.sqlite への差分マージをテストします。
+"""
+
+import os
+import sys
+import sqlite3
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.firefox_bookmarks import FirefoxPlacesWriter, url_hash
+
+
+def create_places(path):
+    """テスト用に places.sqlite の必要な部分だけを作成"""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE moz_places (
+            id INTEGER PRIMARY KEY, url LONGVARCHAR, title LONGVARCHAR,
+            rev_host LONGVARCHAR, visit_count INTEGER DEFAULT 0,
+            hidden INTEGER DEFAULT 0 NOT NULL, frecency INTEGER DEFAULT -1 NOT NULL,
+            guid TEXT, foreign_count INTEGER DEFAULT 0 NOT NULL,
+            url_hash INTEGER DEFAULT 0 NOT NULL);
+        CREATE INDEX moz_places_url_hashindex ON moz_places (url_hash);
+        CREATE TABLE moz_bookmarks (
+            id INTEGER PRIMARY KEY, type INTEGER, fk INTEGER DEFAULT NULL,
+            parent INTEGER, position INTEGER, title LONGVARCHAR,
+            dateAdded INTEGER, lastModified INTEGER, guid TEXT,
+            syncStatus INTEGER NOT NULL DEFAULT 0,
+            syncChangeCounter INTEGER NOT NULL DEFAULT 1);
+        CREATE TABLE moz_bookmarks_deleted (guid TEXT PRIMARY KEY, dateRemoved INTEGER);
+        INSERT INTO moz_bookmarks (id, type, parent, position, guid)
+            VALUES (1, 2, 0, 0, 'root________'), (2, 2, 1, 0, 'toolbar_____');
+    """)
+    conn.commit()
+    conn.close()
+
+
+class TestFirefoxPlacesWriter:
+    """FirefoxPlacesWriterクラスのテスト"""
+
+    def test_sync_reuses_existing_places(self, tmp_path):
+        """ツールバーにフォルダが作成され、既存の履歴のURLが再利用されることをテスト"""
+        # テストデータ
+        places_file = str(tmp_path / "places.sqlite")
+        create_places(places_file)
+        url = "slack://channel?team=T1&id=C1"
+        conn = sqlite3.connect(places_file)
+        conn.execute(
+            "INSERT INTO moz_places (id, url, url_hash) VALUES (10, ?, ?)",
+            (url, url_hash(url)),
+        )
+        conn.commit()
+        conn.close()
+
+        # テスト実行
+        writer = FirefoxPlacesWriter(places_file)
+        stats = writer.sync(
+            [("#general", url)], [("Taro", "slack://user?team=T1&id=U1")]
+        )
+
+        # 検証
+        conn = sqlite3.connect(places_file)
+        folders = conn.execute(
+            "SELECT title FROM moz_bookmarks WHERE parent = 2 ORDER BY position"
+        ).fetchall()
+        bookmark = conn.execute(
+            "SELECT b.fk, b.title, p.foreign_count FROM moz_bookmarks b "
+            "JOIN moz_places p ON p.id = b.fk WHERE p.url = ?",
+            (url,),
+        ).fetchone()
+        place_count = conn.execute("SELECT COUNT(*) FROM moz_places").fetchone()[0]
+        conn.close()
+        assert folders == [("Slack",), ("Slack Users",)]
+        assert bookmark == (10, "#general", 1)
+        assert place_count == 2
+        assert url_hash(url) >> 32 == url_hash("slack") & 0xFFFF
+        assert stats == {"added": 2, "renamed": 0, "removed": 0}
+
+    def test_resync_only_applies_changes(self, tmp_path):
+        """再同期では追加・名前変更・削除の差分だけが反映されることをテスト"""
+        # テストデータ
+        places_file = str(tmp_path / "places.sqlite")
+        create_places(places_file)
+        writer = FirefoxPlacesWriter(places_file)
+        writer.sync(
+            [
+                ("#general", "slack://channel?team=T1&id=C1"),
+                ("#random", "slack://channel?team=T1&id=C2"),
+            ]
+        )
+
+        # テスト実行
+        stats = writer.sync(
+            [
+                ("#new", "slack://channel?team=T1&id=C3"),
+                ("#general-renamed", "slack://channel?team=T1&id=C1"),
+            ]
+        )
+
+        # 検証
+        conn = sqlite3.connect(places_file)
+        titles = conn.execute(
+            "SELECT b.title, p.foreign_count FROM moz_bookmarks b "
+            "JOIN moz_places p ON p.id = b.fk ORDER BY b.position"
+        ).fetchall()
+        deleted = conn.execute("SELECT COUNT(*) FROM moz_bookmarks_deleted").fetchone()
+        conn.close()
+        assert titles == [("#new", 1), ("#general-renamed", 1)]
+        assert deleted == (1,)
+        assert stats == {"added": 1, "renamed": 1, "removed": 1}
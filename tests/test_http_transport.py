@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+HTTP接続プール（PooledTransport）とレスポンスデコーダーのテストモジュール
+"""
+
+import json
+import os
+import sys
+
+import pytest
+from slack_sdk.errors import SlackApiError
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.mock_slack_server import MockSlackServer
+from src.http_transport import PooledTransport
+from src.response_decoder import ResponseDecoder
+from src.slack_client import SlackClient
+
+
+class TestPooledTransport:
+    """PooledTransportクラスのテスト"""
+
+    def test_crawl_reuses_single_connection(self):
+        """ページネーションの全ページで1つの接続が再利用されることをテスト"""
+        # セットアップ
+        transport = PooledTransport(pool_size=2)
+        with MockSlackServer(users=250, channels=300, page_limit=50) as server:
+            client = SlackClient("xoxp-test", "test", "T00000000", transport)
+            client.client.base_url = server.base_url
+
+            # テスト実行
+            users = client.get_all_users()
+            channels = client.get_all_channels()
+
+            # 検証
+            assert server.requests == 5 + 4 + 2
+            assert server.connections == 1
+        assert transport.stats["reused"] == server.requests - 1
+        assert len(channels) == 300
+        assert len(users) == len(
+            [u for u in server.members if not u["is_bot"] and not u["deleted"]]
+        )
+        # 射影により、ブックマーク生成に使わないフィールドは含まれない
+        assert set(users[0]["profile"]) == {"real_name", "display_name"}
+        assert "topic" not in channels[0]
+        transport.close()
+
+    def test_gzip_response_is_decoded(self):
+        """gzip圧縮されたレスポンスが展開されることをテスト"""
+        # セットアップ
+        transport = PooledTransport()
+        with MockSlackServer(users=10, channels=0) as server:
+            # テスト実行
+            status, headers, body = transport.request(
+                "POST", server.base_url + "users.list", b"limit=5"
+            )
+
+        # 検証
+        assert status == 200
+        assert headers["Content-Encoding"] == "gzip"
+        assert body.startswith(b'{"ok": true')
+        transport.close()
+
+
+class TestResponseDecoder:
+    """ResponseDecoderクラスのテスト"""
+
+    def test_decode_projects_list_fields(self):
+        """一覧系APIのレスポンスが必要なフィールドだけに絞り込まれることをテスト"""
+        # テストデータ
+        body = json.dumps(
+            {
+                "ok": True,
+                "members": [
+                    {
+                        "id": "U1",
+                        "name": "taro",
+                        "tz": "Asia/Tokyo",
+                        "profile": {"real_name": "山田 太郎", "email": "t@example.com"},
+                    }
+                ],
+                "response_metadata": {"next_cursor": "abc"},
+            }
+        ).encode("utf-8")
+
+        # テスト実行（標準ライブラリの json を使用）
+        data = ResponseDecoder(loads_func=json.loads).decode("users.list", body)
+
+        # 検証
+        assert data["response_metadata"] == {"next_cursor": "abc"}
+        assert data["members"] == [
+            {
+                "id": "U1",
+                "name": "taro",
+                "deleted": False,
+                "is_bot": False,
+                "profile": {"real_name": "山田 太郎", "display_name": ""},
+            }
+        ]
+
+    def test_error_response_raises_slack_api_error(self):
+        """ok=false のレスポンスで SlackApiError が発生することをテスト"""
+        # セットアップ
+        transport = PooledTransport()
+        with MockSlackServer(users=0, channels=0) as server:
+            client = SlackClient("xoxp-test", "test", "T00000000", transport)
+            client.client.base_url = server.base_url
+
+            # テスト実行と検証
+            with pytest.raises(SlackApiError):
+                client.client.api_call("unknown.method")
+        transport.close()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+匿名化の検証機能のテストモジュール
+
+LeakVerifierによる元の値の検出と、DataAnonymizerのマッピングからの検証をテストします。
+"""
+
+import gzip
+import os
+import sys
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.leak_verifier import LeakHit, LeakVerifier
+from src.data_anonymizer import DataAnonymizer
+
+
+class TestLeakVerifier:
+    """LeakVerifierクラスのテスト"""
+
+    def test_scan_file_reports_offset_and_kind(self, tmp_path):
+        """残っている元の値の位置と種類が、非圧縮・gzipのどちらでも報告されることをテスト"""
+        # テストデータ
+        verifier = LeakVerifier(
+            {"U12345678": "user_id", "ABC商事": "company", "ABC": "company", "": "name"}
+        )
+        content = "<A>ok</A> ABC商事 id=U12345678\n".encode("utf-8")
+        plain_file = tmp_path / "slack_user_dms.html"
+        plain_file.write_bytes(content)
+        gzip_file = tmp_path / "slack_user_dms.html.gz"
+        gzip_file.write_bytes(gzip.compress(content))
+        empty_file = tmp_path / "empty.html"
+        empty_file.write_bytes(b"")
+
+        # テスト実行
+        hits = verifier.verify([str(plain_file), str(gzip_file), str(empty_file)])
+
+        # 検証
+        assert len(verifier) == 3
+        offset = content.index("ABC商事".encode("utf-8"))
+        assert hits[:2] == [
+            LeakHit(str(plain_file), offset, "ABC商事", "company"),
+            LeakHit(
+                str(plain_file), content.index(b"U12345678"), "U12345678", "user_id"
+            ),
+        ]
+        assert [hit.path for hit in hits[2:]] == [str(gzip_file)] * 2
+
+    def test_anonymized_file_passes_verification(self, tmp_path, monkeypatch):
+        """匿名化したファイルの検証では元の値が検出されないことをテスト"""
+        # テストデータ
+        monkeypatch.chdir(tmp_path)
+        html_file = tmp_path / "slack_user_dms.html"
+        html_file.write_text(
+            '<DT><A HREF="slack://user?team=T12345678&id=U12345678">山田 花子</A>\n',
+            encoding="utf-8",
+        )
+        anonymizer = DataAnonymizer()
+        anonymizer.name_map["山田 花子"] = "佐藤 太郎"
+
+        # テスト実行
+        before = anonymizer.verify_files([str(html_file)])
+        anonymizer.anonymize_file(str(html_file))
+        after = anonymizer.verify_files([str(html_file)])
+
+        # 検証
+        assert {hit.kind for hit in before} == {"name"}
+        assert after == []
+        assert (
+            LeakVerifier.from_mappings(anonymizer.mappings()).scan(
+                html_file.read_bytes()
+            )
+            == []
+        )
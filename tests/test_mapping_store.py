@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+匿名化マッピングの保存機能のテストモジュール
+
+MappingStoreによるJSONファイルの取り込み、まとめての保存、
+複数のプロセスからの同時書き込みをテストします。
+"""
+
+import json
+import os
+import sys
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.mapping_store import MappingStore
+from src.data_anonymizer import DataAnonymizer
+
+
+class TestMappingStore:
+    """MappingStoreクラスのテスト"""
+
+    def test_migrates_legacy_json_once(self, tmp_path, monkeypatch):
+        """従来のマッピングファイルが初回だけ取り込まれ、DataAnonymizerから参照できることをテスト"""
+        # テストデータ
+        monkeypatch.chdir(tmp_path)
+        legacy = {
+            "workspace_id_map": {"T12345678": "TABCDEFGHI"},
+            "name_map": {"山田 花子": "佐藤 太郎", "Jane Doe": "John Smith"},
+            "company_map": {"ABC商事": "テスト産業"},
+        }
+        (tmp_path / "anonymizer_mappings.json").write_text(
+            json.dumps(legacy, ensure_ascii=False), encoding="utf-8"
+        )
+
+        # テスト実行
+        anonymizer = DataAnonymizer()
+        anonymizer.close()
+        legacy["name_map"]["鈴木 一郎"] = "田中 健太"
+        (tmp_path / "anonymizer_mappings.json").write_text(
+            json.dumps(legacy, ensure_ascii=False), encoding="utf-8"
+        )
+        anonymizer = DataAnonymizer()
+
+        # 検証
+        assert anonymizer.name_map["山田 花子"] == "佐藤 太郎"
+        assert "鈴木 一郎" not in anonymizer.name_map
+        assert list(anonymizer.name_map) == ["山田 花子", "Jane Doe"]
+        assert len(anonymizer.company_map) == 1
+        assert dict(anonymizer.user_id_map) == {}
+        assert anonymizer._sensitive_terms().replace("ABC商事") == "テスト産業"
+        anonymizer.close()
+
+    def test_flush_keeps_value_saved_first_by_another_store(self, tmp_path):
+        """同じ値を2つの接続で追加した場合、先に保存した値に揃うことをテスト"""
+        # テストデータ
+        db_file = str(tmp_path / "mappings.db")
+        first = MappingStore(db_file)
+        second = MappingStore(db_file)
+        first.maps["name_map"]["山田 花子"] = "佐藤 太郎"
+        first.maps["name_map"]["鈴木 一郎"] = "田中 健太"
+        second.maps["name_map"]["山田 花子"] = "小林 裕子"
+        second.maps["company_map"]["ABC商事"] = "テスト産業"
+
+        # テスト実行
+        first_saved = first.flush()
+        second_saved = second.flush()
+        reopened = MappingStore(db_file)
+
+        # 検証
+        assert (first_saved, second_saved) == (2, 1)
+        assert second.maps["name_map"]["山田 花子"] == "佐藤 太郎"
+        assert second.flush() == 0
+        assert dict(reopened.maps["name_map"]) == {
+            "山田 花子": "佐藤 太郎",
+            "鈴木 一郎": "田中 健太",
+        }
+        assert len(reopened.maps["company_map"]) == 1
+        for store in (first, second, reopened):
+            store.close()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+メモリ使用量の上限（メモリバジェット）の回帰テストモジュール
+
+小さなコンテナで実行するジョブでは、実行時間よりもピークメモリの増加のほうが
+問題になります。このテストは、10万ユーザー・5万チャンネルの合成ディレクトリを返す
+トランスポートに対して SlackToBookmark.run を最後まで実行し、
+tracemalloc で計測した段階ごと（取得・並べ替え・出力・匿名化）の
+ピークメモリが上限を超えていないことを検証します。
+上限を超えた場合は、その段階の終了時点で確保されているメモリの多い箇所を表示します。
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.mock_slack_server import make_channels, make_members
+from src.data_anonymizer import DataAnonymizer
+from src.external_sort import ExternalSorter
+from src.guide_generator import GuideGenerator
+from src.http_transport import PooledTransport
+from src.bookmark_generator import BookmarkGenerator
+from src.output_writer import configure_output
+from src.slack_client import SlackClient
+from src.slack_to_bookmark import SlackToBookmark
+
+# 合成ディレクトリの規模
+USER_COUNT = 100_000
+CHANNEL_COUNT = 50_000
+
+MB = 1 << 20
+
+# 段階ごとのピークメモリの上限（段階の開始時点からの増加量）
+STAGE_BUDGETS: Dict[str, int] = {
+    "crawl": 160 * MB,
+    "sort": 40 * MB,
+    "render": 120 * MB,
+    "anonymize": 120 * MB,
+}
+
+# 計測の対象とするメソッドと段階
+STAGE_METHODS: List[Tuple[Any, str, str]] = [
+    (SlackClient, "get_all_channels", "crawl"),
+    (SlackClient, "get_public_channels", "crawl"),
+    (SlackClient, "get_sorted_users", "crawl"),
+    (ExternalSorter, "_sort_buffer", "sort"),
+    (BookmarkGenerator, "sort_channels", "sort"),
+    (BookmarkGenerator, "generate_channel_bookmarks", "render"),
+    (BookmarkGenerator, "generate_user_dm_bookmarks", "render"),
+    (GuideGenerator, "create_guide", "render"),
+    (SlackToBookmark, "_create_search_page", "render"),
+    (DataAnonymizer, "anonymize_file", "anonymize"),
+]
+
+# 上限を超えた場合に表示する箇所の数
+TOP_SITES = 15
+
+
+class SyntheticTransport(PooledTransport):
+    """合成したユーザー・チャンネルの一覧をページ単位で返すトランスポート（通信しない）"""
+
+    def __init__(self, users: int, channels: int):
+        super().__init__()
+        self.members = make_members(users)
+        self.channels = make_channels(channels)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        api_method = urlsplit(url).path.rsplit("/", 1)[-1]
+        params = dict(parse_qsl((body or b"").decode("utf-8")))
+        if api_method == "users.list":
+            key, items = "members", self.members
+        elif api_method == "conversations.list":
+            key = "channels"
+            private = params.get("types") == "private_channel"
+            items = [c for c in self.channels if c["is_private"] == private]
+        else:
+            page = {"ok": True, "team_id": "T00000000", "user": "test", "team": "test"}
+            return 200, _json_headers(), json.dumps(page).encode("utf-8")
+
+        start = int(params.get("cursor") or 0)
+        end = start + int(params.get("limit") or 100)
+        page = {
+            "ok": True,
+            key: items[start:end],
+            "response_metadata": {"next_cursor": str(end) if end < len(items) else ""},
+        }
+        return 200, _json_headers(), json.dumps(page).encode("utf-8")
+
+
+def _json_headers():
+    """JSONレスポンスのヘッダーを作成"""
+    from http.client import HTTPMessage
+
+    headers = HTTPMessage()
+    headers["Content-Type"] = "application/json; charset=utf-8"
+    return headers
+
+
+class StageMeter:
+    """メソッドの呼び出しを段階として、段階ごとのピークメモリを記録する
+
+    段階の中で別の段階が呼ばれた場合（取得中の並べ替えなど）は、
+    内側の段階のピークは外側の段階のピークにも含めます。
+    """
+
+    def __init__(self, budgets: Dict[str, int]):
+        self.budgets = budgets
+        self.peaks: Dict[str, int] = {stage: 0 for stage in budgets}
+        # 上限を超えた段階の、終了時点で確保されているメモリの多い箇所
+        self.top_sites: Dict[str, List[tracemalloc.Statistic]] = {}
+        # 実行中の段階の (名前, 開始時のメモリ, それまでのピーク)
+        self._stack: List[List[Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][2] = max(self._stack[-1][2], peak)
+        tracemalloc.reset_peak()
+        self._stack.append([name, current, current])
+        try:
+            yield
+        finally:
+            _, start, stage_peak = self._stack.pop()
+            stage_peak = max(stage_peak, tracemalloc.get_traced_memory()[1])
+            used = stage_peak - start
+            self.peaks[name] = max(self.peaks[name], used)
+            if used > self.budgets[name] and name not in self.top_sites:
+                snapshot = tracemalloc.take_snapshot()
+                self.top_sites[name] = snapshot.statistics("lineno")[:TOP_SITES]
+            if self._stack:
+                self._stack[-1][2] = max(self._stack[-1][2], stage_peak)
+
+    def wrap(self, owner: Any, method_name: str, name: str, monkeypatch) -> None:
+        """owner のメソッドを、呼び出しを段階として計測するものに置き換える"""
+        method = owner.__dict__[method_name]
+        is_static = isinstance(method, staticmethod)
+        function = method.__func__ if is_static else method
+        meter = self
+
+        def measured(*args, **kwargs):
+            with meter.stage(name):
+                return function(*args, **kwargs)
+
+        monkeypatch.setattr(
+            owner, method_name, staticmethod(measured) if is_static else measured
+        )
+
+    def report(self) -> str:
+        """上限を超えた段階と、メモリの多い箇所を表示用の文字列にする"""
+        lines = []
+        for name, peak in self.peaks.items():
+            budget = self.budgets[name]
+            mark = "NG" if peak > budget else "ok"
+            lines.append(
+                f"[{mark}] {name}: {peak / MB:.1f}MB / 上限 {budget / MB:.0f}MB"
+            )
+        for name, statistics in self.top_sites.items():
+            lines.append(f"--- {name} の終了時点でメモリの多い箇所 ---")
+            lines.extend(str(statistic) for statistic in statistics)
+        return "\n".join(lines)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """合成ディレクトリを返すトランスポートを使う SlackToBookmark"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SLACK_TOKEN", "xoxp-test")
+    monkeypatch.setenv("WORKSPACE_NAME", "test")
+    monkeypatch.setenv("WORKSPACE_ID", "T00000000")
+    monkeypatch.setattr("src.slack_to_bookmark.load_dotenv", lambda **kwargs: None)
+    transport = SyntheticTransport(USER_COUNT, CHANNEL_COUNT)
+    monkeypatch.setattr(
+        "src.slack_to_bookmark.PooledTransport", lambda pool_size: transport
+    )
+    configure_output(str(tmp_path / "out"))
+    try:
+        yield SlackToBookmark()
+    finally:
+        configure_output()
+
+
+class TestMemoryBudget:
+    """段階ごとのピークメモリのテスト"""
+
+    def test_run_stays_within_stage_budgets(self, app, monkeypatch):
+        """10万ユーザー・5万チャンネルの実行で、各段階のピークメモリが上限以内であることをテスト"""
+        # セットアップ
+        meter = StageMeter(STAGE_BUDGETS)
+        for owner, method_name, name in STAGE_METHODS:
+            meter.wrap(owner, method_name, name, monkeypatch)
+
+        # テスト実行
+        tracemalloc.start()
+        try:
+            success = app.run(anonymize=True, open_browser=False)
+        finally:
+            tracemalloc.stop()
+
+        # 検証
+        assert success
+        report = meter.report()
+        print(report)
+        assert all(peak > 0 for peak in meter.peaks.values()), report
+        assert not meter.top_sites, report
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+出力レイヤーのテストモジュール
+
+OutputWriterによるアトミックな書き込みと圧縮出力をテストします。
+"""
+
+import os
+import sys
+import gzip
+
+import pytest
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.output_writer import OutputWriter
+
+
+class TestOutputWriter:
+    """OutputWriterクラスのテスト"""
+
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        """書き込みが途中で失敗しても元のファイルが残り、一時ファイルも残らないことをテスト"""
+        # テストデータ
+        writer = OutputWriter(str(tmp_path))
+        writer.write_text("bookmarks.html", "old")
+
+        # テスト実行
+        with pytest.raises(RuntimeError):
+            with writer.open("bookmarks.html") as f:
+                f.write("half-written")
+                raise RuntimeError("crash")
+
+        # 検証
+        assert writer.read_text("bookmarks.html") == "old"
+        assert os.listdir(tmp_path) == ["bookmarks.html"]
+
+    def test_gzip_output_in_output_dir(self, tmp_path):
+        """出力先ディレクトリに圧縮して書き込まれ、状態ファイルは圧縮されないことをテスト"""
+        # テストデータ
+        output_dir = tmp_path / "exports"
+        writer = OutputWriter(str(output_dir), "gzip")
+
+        # テスト実行
+        path = writer.write_text("slack_user_dms.html", "<DL>" * 1000)
+        with writer.open("slack_user_dms.csv") as f:
+            f.write("folder,id\n")
+        writer.write_text("manifest.json", "{}", compress=False)
+        writer.sync()
+
+        # 検証
+        assert path == str(output_dir / "slack_user_dms.html.gz")
+        assert os.path.getsize(path) < 100
+        with gzip.open(output_dir / "slack_user_dms.csv.gz", "rt") as f:
+            assert f.read() == "folder,id\n"
+        assert (output_dir / "manifest.json").read_text() == "{}"
+        assert writer.pending_dirs == set()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+ページサイズの自動調整機能のテストモジュール
+"""
+
+import os
+import sys
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.mock_slack_server import MockSlackServer
+from src.http_transport import PooledTransport
+from src.page_size_controller import PageSizeController
+from src.slack_client import SlackClient
+
+
+class TestPageSizeController:
+    """PageSizeControllerクラスのテスト"""
+
+    def test_shrinks_slow_pages_within_bounds(self):
+        """目標レイテンシを超えるページで limit が下がり、下限を下回らないことをテスト"""
+        # セットアップ
+        controller = PageSizeController(
+            min_limit=100, max_limit=1000, target_latency=1.0
+        )
+
+        # テスト実行と検証
+        assert controller.next_limit() == 1000
+        controller.record_success(latency=4.0, items=1000)
+        assert controller.next_limit() == 250
+        controller.record_success(latency=100.0, items=250)
+        assert controller.next_limit() == 100
+
+    def test_error_falls_back_to_last_good_limit(self):
+        """エラー後は直前に成功した limit に戻り、それを超えないことをテスト"""
+        # セットアップ
+        controller = PageSizeController(
+            min_limit=100, max_limit=1000, initial_limit=400, target_latency=1.0
+        )
+
+        # テスト実行
+        controller.next_limit()
+        controller.record_success(latency=0.1, items=400)
+        assert controller.next_limit() == 600
+        controller.record_error()
+        controller.next_limit()
+        controller.record_success(latency=0.1, items=400)
+
+        # 検証
+        assert controller.next_limit() == 400
+        summary = controller.summary()
+        assert summary["errors"] == 1
+        assert summary["limits"] == {"first": 400, "min": 400, "max": 600, "last": 400}
+
+
+class TestAdaptivePagination:
+    """SlackClientのページサイズ自動調整のテスト"""
+
+    def test_crawl_recovers_from_server_errors(self):
+        """大きなページでサーバーエラーが発生してもページサイズを下げて取得できることをテスト"""
+        # セットアップ
+        with MockSlackServer(users=0, channels=1200, fail_above=300) as server:
+            client = SlackClient(
+                "xoxp-test",
+                "test",
+                "T00000000",
+                PooledTransport(),
+                page_size_range=(100, 1000),
+            )
+            client.client.base_url = server.base_url
+
+            # テスト実行
+            channels = client.get_channels_by_type("public_channel")
+
+        # 検証
+        assert len(channels) == 800
+        summary = client.metrics["conversations.list"]
+        assert summary["errors"] == 2
+        assert summary["limits"]["last"] == 250
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+検索ページ生成機能のテストモジュール
+"""
+
+import json
+import os
+import re
+import sys
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bookmark_generator import BookmarkGenerator
+from src.search_page import SearchIndex, SearchPageGenerator
+
+
+def decode_posting(packed):
+    """差分を36進数にしたポスティングをエントリ番号のリストに戻す"""
+    numbers, number = [], 0
+    for delta in packed.split(","):
+        number += int(delta, 36)
+        numbers.append(number)
+    return numbers
+
+
+class TestSearchIndex:
+    """SearchIndexクラスのテスト"""
+
+    def test_index_is_built_while_generating_bookmarks(self, tmp_path):
+        """ブックマーク生成と同時に、正規化した名前のトライグラムで索引化されることをテスト"""
+        # セットアップ
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        generator.search_index = SearchIndex()
+        channels = [
+            {"id": "C2", "name": "random", "is_private": False},
+            {"id": "C1", "name": "ＰＲＯＪ-alpha", "is_private": True},
+        ]
+        users = [{"id": "U1", "profile": {"real_name": "ヤマダ", "display_name": ""}}]
+
+        # テスト実行
+        generator.generate_channel_bookmarks(channels, str(tmp_path / "c.html"))
+        generator.generate_user_dm_bookmarks(users, str(tmp_path / "u.html"))
+        data = generator.search_index.to_dict()
+
+        # 検証
+        assert data["titles"] == ["🔒 #ＰＲＯＪ-alpha", "#random", "ヤマダ"]
+        assert data["prefixes"] == [
+            "slack://channel?team=T12345678&id=",
+            "slack://user?team=T12345678&id=",
+        ]
+        assert data["links"] == ["C1", "C2", "U1"]
+        assert data["refs"] == "0,0,1"
+        assert data["kinds"][int(data["kindOf"][2])] == "user"
+        assert decode_posting(data["grams"]["roj"]) == [0]
+        assert decode_posting(data["grams"]["やまだ"]) == [2]
+
+    def test_render_escapes_script_end_tag(self):
+        """名前に </script> が含まれても埋め込んだインデックスが壊れないことをテスト"""
+        # セットアップ
+        index = SearchIndex()
+        index.add("channel", [("#a</script><b>", "slack://channel?team=T1&id=C1")])
+        index.add(
+            "channel",
+            [(f"#ch-{i}", f"slack://channel?team=T1&id=C{i}") for i in range(40)],
+        )
+
+        # テスト実行
+        html = SearchPageGenerator().render(index, "test-workspace")
+
+        # 検証
+        embedded = re.search(
+            r'<script type="application/json" id="index">(.*?)</script>', html, re.S
+        ).group(1)
+        data = json.loads(embedded)
+        assert data["titles"][0] == "#a</script><b>"
+        assert decode_posting(data["grams"]["ch-"]) == list(range(1, 41))
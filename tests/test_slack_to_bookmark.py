@@ -8,6 +8,7 @@ Slack to Bookmarkのテストモジュール
 
 import os
 import sys
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -116,8 +117,8 @@ class TestBookmarkGenerator:
         assert generator.workspace_id == workspace_id
         assert generator.timestamp is not None
 
-    @patch("builtins.open", new_callable=MagicMock)
-    def test_generate_channel_bookmarks(self, mock_open):
+    @patch("src.output_writer.OutputWriter.write_text")
+    def test_generate_channel_bookmarks(self, mock_write_text):
         """チャンネルブックマーク生成が正しく動作することをテスト"""
         # テストデータ
         workspace_name = "test-workspace"
@@ -129,22 +130,142 @@ class TestBookmarkGenerator:
         ]
         output_file = "test_bookmarks.html"
 
-        # テストファイルハンドラの設定
-        mock_file_handle = MagicMock()
-        mock_open.return_value.__enter__.return_value = mock_file_handle
-
         # テスト実行
         generator = BookmarkGenerator(workspace_name, workspace_id)
         result = generator.generate_channel_bookmarks(channels, output_file)
 
         # 検証
-        mock_open.assert_called_once_with(output_file, "w", encoding="utf-8")
-        assert mock_file_handle.write.call_count == 1
-        assert "#general" in str(mock_file_handle.write.call_args[0][0])
-        assert "#random" in str(mock_file_handle.write.call_args[0][0])
-        assert "🔒 #private-channel" in str(mock_file_handle.write.call_args[0][0])
+        mock_write_text.assert_called_once()
+        written_file, html = mock_write_text.call_args[0]
+        assert written_file == output_file
+        assert "#general" in html
+        assert "#random" in html
+        assert "🔒 #private-channel" in html
         assert result == output_file
 
+    def test_generate_user_dm_bookmarks_escapes_names(self, tmp_path):
+        """表示名に含まれるHTMLの特殊文字がエスケープされることをテスト"""
+        # テストデータ
+        output_file = str(tmp_path / "users.html")
+        users = [
+            {"id": "U1", "profile": {"real_name": "R&D <Team>", "display_name": ""}},
+            {"id": "U2", "profile": {"real_name": "山田 太郎", "display_name": ""}},
+        ]
+
+        # テスト実行
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        generator.generate_user_dm_bookmarks(users, output_file)
+
+        # 検証
+        with open(output_file, encoding="utf-8") as f:
+            html = f.read()
+        assert ">R&amp;D &lt;Team&gt;</A>" in html
+        assert ">山田 太郎</A>" in html
+        assert 'HREF="slack://user?team=T12345678&id=U1"' in html
+
+    def test_generate_delta_bookmarks(self, tmp_path):
+        """前回のマニフェストとの差分だけが出力されることをテスト"""
+        # テストデータ
+        manifest_file = str(tmp_path / "manifest.json")
+        delta_file = str(tmp_path / "delta.html")
+        report_file = str(tmp_path / "changes.json")
+        first = [
+            {"id": "C1", "name": "general"},
+            {"id": "C2", "name": "random"},
+        ]
+        second = [
+            {"id": "C1", "name": "general-renamed"},
+            {"id": "C3", "name": "new-channel"},
+        ]
+
+        # 1回目の実行でマニフェストを作成
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        generator.use_manifest(manifest_file)
+        generator.generate_delta_bookmarks(first, None, delta_file, report_file)
+        generator.save_manifest()
+
+        # テスト実行
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        generator.use_manifest(manifest_file)
+        result = generator.generate_delta_bookmarks(
+            second, None, delta_file, report_file
+        )
+
+        # 検証
+        with open(delta_file, encoding="utf-8") as f:
+            delta = f.read()
+        with open(report_file, encoding="utf-8") as f:
+            report = json.load(f)
+        assert result == delta_file
+        assert "#general-renamed" in delta
+        assert "#new-channel" in delta
+        assert "#random" not in delta
+        assert [c["id"] for c in report["channels"]["added"]] == ["C3"]
+        assert [c["id"] for c in report["channels"]["renamed"]] == ["C1"]
+        assert [c["id"] for c in report["channels"]["archived"]] == ["C2"]
+
+    def test_unchanged_file_is_not_rewritten(self, tmp_path):
+        """内容に変更がないブックマークファイルは再書き込みされないことをテスト"""
+        # テストデータ
+        output_file = str(tmp_path / "channels.html")
+        channels = [{"id": "C1", "name": "general"}]
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        generator.use_manifest(str(tmp_path / "manifest.json"))
+        generator.generate_channel_bookmarks(channels, output_file)
+
+        # テスト実行
+        with patch("builtins.open", new_callable=MagicMock) as mock_open:
+            result = generator.generate_channel_bookmarks(channels, output_file)
+
+        # 検証
+        mock_open.assert_not_called()
+        assert result == output_file
+        assert output_file in generator.skipped_files
+
+    def test_generate_sharded_channel_bookmarks(self, tmp_path):
+        """チャンネルが指定件数ごとのファイルに分割されることをテスト"""
+        # テストデータ
+        output_file = str(tmp_path / "channels.html")
+        channels = [{"id": f"C{i}", "name": f"channel-{i:02d}"} for i in range(5)]
+
+        # テスト実行
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        files = generator.generate_sharded_channel_bookmarks(
+            channels, output_file, shard_size=2
+        )
+
+        # 検証
+        assert [os.path.basename(f) for f in files] == [
+            "channels_001.html",
+            "channels_002.html",
+            "channels_003.html",
+        ]
+        with open(files[2], encoding="utf-8") as f:
+            assert "#channel-04" in f.read()
+
+    def test_generate_sharded_bookmarks_by_letter(self, tmp_path):
+        """先頭文字ごとのシャードに分割されることをテスト"""
+        # テストデータ
+        output_file = str(tmp_path / "channels.html")
+        channels = [
+            {"id": "C1", "name": "alpha"},
+            {"id": "C2", "name": "beta", "is_private": True},
+            {"id": "C3", "name": "アナウンス"},
+        ]
+
+        # テスト実行
+        generator = BookmarkGenerator("test-workspace", "T12345678")
+        files = generator.generate_sharded_channel_bookmarks(
+            channels, output_file, shard_size=10, shard_by="letter"
+        )
+
+        # 検証
+        assert [os.path.basename(f) for f in files] == [
+            "channels_a.html",
+            "channels_b.html",
+            "channels_other.html",
+        ]
+
 
 class TestGuideGenerator:
     """GuideGeneratorクラスのテスト"""
@@ -158,27 +279,40 @@ class TestGuideGenerator:
         assert hasattr(generator, "is_mac")
         assert hasattr(generator, "is_windows")
 
-    @patch("builtins.open", new_callable=MagicMock)
-    def test_create_guide(self, mock_open):
+    @patch("src.output_writer.OutputWriter.write_text")
+    def test_create_guide(self, mock_write_text):
         """ガイドページ生成が正しく動作することをテスト"""
         # テストデータ
         html_file_path = "test_bookmarks.html"
         output_file = "test_guide.html"
 
-        # テストファイルハンドラの設定
-        mock_file_handle = MagicMock()
-        mock_open.return_value.__enter__.return_value = mock_file_handle
-
         # テスト実行
         generator = GuideGenerator()
         result = generator.create_guide(html_file_path, output_file)
 
         # 検証
-        mock_open.assert_called_once_with(output_file, "w", encoding="utf-8")
-        assert mock_file_handle.write.call_count == 1
-        assert html_file_path in str(mock_file_handle.write.call_args[0][0])
+        mock_write_text.assert_called_once()
+        written_file, html = mock_write_text.call_args[0]
+        assert written_file == output_file
+        assert html_file_path in html
         assert result == output_file
 
+    @patch("src.output_writer.OutputWriter.write_text")
+    def test_create_guide_lists_all_shards(self, mock_write_text):
+        """シャード出力のガイドページにすべてのファイルが記載されることをテスト"""
+        # テストデータ
+        shard_files = ["bookmarks_001.html", "bookmarks_002.html"]
+
+        # テスト実行
+        generator = GuideGenerator()
+        generator.create_guide(shard_files, "test_guide.html")
+
+        # 検証
+        html = mock_write_text.call_args[0][1]
+        for shard_file in shard_files:
+            assert shard_file in html
+        assert "2個のファイル" in html
+
 
 class TestSlackToBookmark:
     """SlackToBookmarkクラスのテスト"""
@@ -217,7 +351,9 @@ class TestSlackToBookmark:
         assert app.token == token
         assert app.workspace_name == workspace_name
         assert app.workspace_id == workspace_id
-        mock_slack_client.assert_called_once_with(token, workspace_name, workspace_id)
+        mock_slack_client.assert_called_once_with(
+            token, workspace_name, workspace_id, app.transport
+        )
         mock_bookmark_gen.assert_called_once_with(workspace_name, workspace_id)
         mock_guide_gen.assert_called_once()
 
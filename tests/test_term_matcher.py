@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+語句の一括置換機能のテストモジュール
+
+TermMatcherによる置換と、DataAnonymizerでのオートマトンの再利用をテストします。
+"""
+
+import os
+import sys
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.term_matcher import TermMatcher
+from src.data_anonymizer import DataAnonymizer
+
+
+class TestTermMatcher:
+    """TermMatcherクラスのテスト"""
+
+    def test_replace_prefers_leftmost_longest(self):
+        """重なる語句は左から始まる最も長いものが1回だけ置換されることをテスト"""
+        # テストデータ
+        matcher = TermMatcher(
+            {"ABC商事": "X", "ABC": "Y", "商事部": "Z", "he": "1", "she": "2", "": "!"}
+        )
+
+        # テスト実行
+        result = matcher.replace("ABC商事部 ushers ABC")
+
+        # 検証
+        assert result == "X部 u2rs Y"
+        assert len(matcher) == 5
+
+    def test_anonymizer_rebuilds_only_when_mapping_changes(self, tmp_path, monkeypatch):
+        """マッピングが変わらない間はオートマトンを使い回し、追加されたら作り直すことをテスト"""
+        # テストデータ
+        monkeypatch.chdir(tmp_path)
+        anonymizer = DataAnonymizer()
+        anonymizer.company_map["ABC商事"] = "サンプル株式会社"
+        first = anonymizer._sensitive_terms()
+
+        # テスト実行
+        second = anonymizer._sensitive_terms()
+        anonymizer.name_map["山田"] = "佐藤 太郎"
+        third = anonymizer._sensitive_terms()
+
+        # 検証
+        assert first is second
+        assert third is not first
+        assert third.replace("ABC商事-山田") == "サンプル株式会社-佐藤 太郎"
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+ウォッチモードのテストモジュール
+"""
+
+import os
+import signal
+import sys
+
+import pytest
+
+# 親ディレクトリをパスに追加してインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.watcher import Watcher, parse_interval
+
+
+def test_parse_interval():
+    """更新間隔の文字列が秒数に変換されることをテスト"""
+    # テスト実行と検証
+    assert parse_interval("90") == 90
+    assert parse_interval("30s") == 30
+    assert parse_interval("10m") == 600
+    assert parse_interval("1.5h") == 5400
+    with pytest.raises(ValueError, match="更新間隔の形式が不正です"):
+        parse_interval("10 minutes")
+    with pytest.raises(ValueError, match="0より大きい"):
+        parse_interval("0m")
+
+
+class TestWatcher:
+    """Watcherクラスのテスト"""
+
+    def test_sigterm_stops_after_current_cycle(self):
+        """SIGTERMを受け取ると実行中の更新を終えてから終了し、ハンドラーが元に戻ることをテスト"""
+        # セットアップ
+        previous_handler = signal.getsignal(signal.SIGTERM)
+        calls = []
+
+        def run_cycle():
+            calls.append(len(calls))
+            if len(calls) == 2:
+                os.kill(os.getpid(), signal.SIGTERM)
+            return True
+
+        watcher = Watcher(run_cycle, interval=0.01)
+
+        # テスト実行
+        success = watcher.run()
+
+        # 検証
+        assert success is True
+        assert calls == [0, 1]
+        assert signal.getsignal(signal.SIGTERM) is previous_handler
+
+    def test_failed_cycle_does_not_stop_watching(self):
+        """更新処理が例外で失敗しても次の更新が行われることをテスト"""
+        # セットアップ
+        results = iter([RuntimeError("network down"), False, True])
+
+        def run_cycle():
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        watcher = Watcher(run_cycle, interval=0.01)
+
+        # テスト実行
+        success = watcher.run(max_cycles=3)
+
+        # 検証
+        assert success is True
+        assert watcher.cycles == 3
+        assert watcher.failures == 2